@@ -5,11 +5,18 @@ Version 2.1 - Fixed and Enhanced
 """
 
 import streamlit as st
+import json
 from datetime import datetime, timedelta
-import pandas as pd
-import mysql.connector
 from mysql.connector import Error
 
+from comparison_charts import ChartService, ComparisonSet
+from confirmation_ids import new_confirmation_number
+from db_pool import ConnectionPool, connection_settings
+from hotel_queries import build_summary_search_query
+from location_index import LocationIndex
+from search_engine import ColumnarHotelIndex
+from search_summary import SearchSummaryRefresher
+
 # ============================================================
 # PAGE CONFIGURATION
 # ============================================================
@@ -26,20 +33,31 @@ st.set_page_config(
 # ============================================================
 
 @st.cache_resource
-def get_db_connection():
-    """Establish and cache MySQL database connection"""
-    try:
-        connection = mysql.connector.connect(
-            host=st.secrets.get("mysql_host", "localhost"),
-            user=st.secrets.get("mysql_user", "root"),
-            password=st.secrets.get("mysql_password", ""),
-            database=st.secrets.get("mysql_database", "5033_ali"),
-            port=st.secrets.get("mysql_port", 3306)
-        )
-        return connection
-    except Error as e:
-        st.error(f"Error connecting to MySQL database: {e}")
-        return None
+def get_db_pool():
+    """Create the process-wide MySQL connection pool shared by all sessions"""
+    return ConnectionPool(
+        connection_settings(st.secrets),
+        size=st.secrets.get("mysql_pool_size", 8),
+        checkout_timeout=st.secrets.get("mysql_pool_timeout", 5.0)
+    )
+
+@st.cache_resource
+def get_search_summary_refresher():
+    """Start the process-wide HOTEL_SEARCH_SUMMARY refresher thread"""
+    refresher = SearchSummaryRefresher(get_db_pool())
+    refresher.start()
+    return refresher
+
+@st.cache_resource
+def get_chart_service():
+    """Process-wide cache of comparison chart figures"""
+    return ChartService()
+
+@st.cache_resource(ttl=3600)
+def get_location_index():
+    """City/State prefix index over the distinct HOTEL locations"""
+    with get_db_pool().connection() as connection:
+        return LocationIndex.from_connection(connection)
 
 @st.cache_data(ttl=3600)
 def fetch_hotels_from_db(location_filter=None, budget_filter=None):
@@ -47,63 +65,39 @@ def fetch_hotels_from_db(location_filter=None, budget_filter=None):
     Fetch hotels from MySQL database with optional filtering
     
     Args:
-        location_filter: Filter by city or state (partial match)
+        location_filter: Filter by city or state (name, code or prefix)
         budget_filter: Filter by max price per night
     
     Returns:
         List of hotel dictionaries or empty list if connection fails
+    
+    Reads the HOTEL_SEARCH_SUMMARY table (one pre-aggregated row per hotel,
+    refreshed every 30 s) instead of aggregating ROOM and amenities per call.
     """
-    connection = get_db_connection()
-    if connection is None:
+    get_search_summary_refresher()
+    pool = get_db_pool()
+    try:
+        # Resolve the location first: building the index checks out its
+        # own connection, so never do it while holding one
+        location = None
+        if location_filter and location_filter.strip():
+            location = get_location_index().resolve(location_filter)
+            if location.is_empty():
+                return []
+        connection = pool.acquire()
+    except Error as e:
+        st.error(f"Error connecting to MySQL database: {e}")
         return []
     
     try:
         cursor = connection.cursor(dictionary=True)
         
-        # Query using actual database structure
-        query = """
-        SELECT 
-            h.HotelID,
-            h.HotelName as name,
-            h.City,
-            h.State,
-            CONCAT(h.City, ', ', h.State) as location,
-            h.AverageRating as rating,
-            h.PhoneNumber as phone,
-            h.Email as email,
-            h.Website as website,
-            h.StreetAddress as address,
-            COALESCE(AVG(r.BasePrice), 300) as price_per_night,
-            COALESCE(COUNT(DISTINCT r.RoomID), 0) as rooms,
-            GROUP_CONCAT(DISTINCT a.AmenityName SEPARATOR ', ') as amenities,
-            h.StarRating
-        FROM HOTEL h
-        LEFT JOIN ROOM r ON h.HotelID = r.HotelID AND r.RoomStatus = 'Available'
-        LEFT JOIN HOTELAMENITIES ha ON h.HotelID = ha.HotelID
-        LEFT JOIN AMENITIES a ON ha.AmenityID = a.AmenityID
-        WHERE 1=1
-        """
-        
-        params = []
-        
-        # Add location filter
-        if location_filter and location_filter.strip():
-            location_filter_lower = location_filter.lower().strip()
-            query += " AND (LOWER(h.City) LIKE %s OR LOWER(h.State) = %s)"
-            params.extend([f"%{location_filter_lower}%", location_filter_lower])
-        
-        # Group by hotel
-        query += """ GROUP BY h.HotelID, h.HotelName, h.City, h.State, 
-                     h.PhoneNumber, h.Email, h.Website, h.StreetAddress, 
-                     h.AverageRating, h.StarRating"""
-        
-        # Add budget filter to HAVING clause
-        if budget_filter:
-            query += " HAVING COALESCE(AVG(r.BasePrice), 300) <= %s"
-            params.append(budget_filter)
-        
-        query += " ORDER BY h.AverageRating DESC LIMIT 100"
-        
+        query, params = build_summary_search_query(
+            location=location,
+            budget_filter=budget_filter,
+            sort_by="Highest Rated",
+            limit=100
+        )
         cursor.execute(query, params)
         results = cursor.fetchall()
         
@@ -132,8 +126,7 @@ def fetch_hotels_from_db(location_filter=None, budget_filter=None):
         st.error(f"Error fetching hotels from database: {e}")
         return []
     finally:
-        if connection and connection.is_connected():
-            connection.close()
+        pool.release(connection, discard=not connection.is_connected())
 
 # ============================================================
 # FALLBACK SAMPLE DATA
@@ -154,6 +147,36 @@ SAMPLE_HOTELS = [
     {"name": "The Peninsula New York", "location": "New York, NY", "state": "NY", "rating": 4.9, "price_per_night": 750, "rooms": 150, "amenities": "Luxury, Spa, Fine Dining", "category": "Urban Luxury"},
 ]
 
+
+@st.cache_resource
+def get_sample_index():
+    """Columnar index + location index over SAMPLE_HOTELS (positions = list indexes)"""
+    records = [
+        {
+            "hotel_id": i,
+            "city": h["location"].split(",")[0],
+            "state": h["state"],
+            "price": h["price_per_night"],
+            "rating": h["rating"],
+            "star_rating": 0,
+            "total_rooms": h["rooms"],
+            "capacity": 0,
+            "amenity_ids": (),
+        }
+        for i, h in enumerate(SAMPLE_HOTELS)
+    ]
+    locations = LocationIndex((r["city"], r["state"]) for r in records)
+    return ColumnarHotelIndex(records), locations
+
+
+def search_sample_hotels(location_filter=None, budget_filter=None):
+    """Filter and rank SAMPLE_HOTELS with the columnar engine"""
+    index, locations = get_sample_index()
+    location = locations.resolve(location_filter) if location_filter else None
+    mask = index.filter_mask(location=location, max_price=budget_filter)
+    positions, _ = index.search("Best Match", mask=mask, limit=len(SAMPLE_HOTELS))
+    return [SAMPLE_HOTELS[i] for i in positions.tolist()]
+
 # ============================================================
 # INITIALIZE SESSION STATE
 # ============================================================
@@ -341,14 +364,10 @@ elif st.session_state.page == "Hotel Search":
                     results = db_results
                     data_source = "database"
                 else:
-                    results = [
-                        h for h in SAMPLE_HOTELS 
-                        if h["price_per_night"] <= search_budget and 
-                        (not search_location or 
-                         search_location.lower() in h["location"].lower() or 
-                         search_location.lower() in h["state"].lower() or
-                         h["state"].lower() == search_location.lower())
-                    ]
+                    results = search_sample_hotels(
+                        location_filter=search_location if search_location else None,
+                        budget_filter=search_budget
+                    )
                     data_source = "sample"
 
                 if results:
@@ -404,36 +423,31 @@ elif st.session_state.page == "Comparison":
             })
 
         if comparison_data:
-            df = pd.DataFrame(comparison_data)
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(comparison_data, use_container_width=True)
 
             st.write("---")
             
-            # Charts
+            # Charts (cached figures; the hotel chosen below is highlighted)
+            comparison = ComparisonSet.from_rows([
+                (idx, h["name"], h["price_per_night"], h["rating"])
+                for idx, h in enumerate(st.session_state.search_results[:10])
+            ])
+            figures = get_chart_service().figures(comparison, st.session_state.get("compare_choice", 0))
             col1, col2 = st.columns(2)
             
             with col1:
-                st.subheader("Price Comparison")
-                price_df = pd.DataFrame({
-                    "Hotel": [h["name"][:20] for h in st.session_state.search_results[:10]],
-                    "Price": [h["price_per_night"] for h in st.session_state.search_results[:10]]
-                })
-                st.bar_chart(price_df.set_index("Hotel"))
+                st.plotly_chart(json.loads(figures["price"]), use_container_width=True)
 
             with col2:
-                st.subheader("Rating Comparison")
-                rating_df = pd.DataFrame({
-                    "Hotel": [h["name"][:20] for h in st.session_state.search_results[:10]],
-                    "Rating": [h["rating"] for h in st.session_state.search_results[:10]]
-                })
-                st.bar_chart(rating_df.set_index("Hotel"))
+                st.plotly_chart(json.loads(figures["rating"]), use_container_width=True)
 
             st.write("---")
 
             # Selection
             st.subheader("Select Your Hotel")
             hotel_names = [f"{h['name']} - ${h['price_per_night']}/night" for h in st.session_state.search_results[:10]]
-            selected_idx = st.selectbox("Choose a hotel:", range(len(hotel_names)), format_func=lambda x: hotel_names[x])
+            selected_idx = st.selectbox("Choose a hotel:", range(len(hotel_names)), format_func=lambda x: hotel_names[x],
+                                        key="compare_choice")
 
             if st.button("✓ Confirm Selection & Proceed to Booking", use_container_width=True, key="confirm_hotel"):
                 st.session_state.selected_hotel = st.session_state.search_results[selected_idx]
@@ -503,7 +517,7 @@ elif st.session_state.page == "Booking Confirmation":
         
         with col1:
             if st.button("✓ Confirm Booking", use_container_width=True, key="confirm_booking"):
-                confirmation_number = f"WED-{st.session_state.user_name[:3].upper()}-{hash(st.session_state.selected_hotel['name']) % 10000:04d}"
+                confirmation_number = new_confirmation_number()
                 st.success(f"🎉 **Booking Confirmed!** Confirmation #: {confirmation_number}")
                 st.balloons()
                 st.session_state.booking_confirmed = True
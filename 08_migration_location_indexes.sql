@@ -0,0 +1,15 @@
+-- Wedding BnB Database Migration
+-- Database: 5033_ali
+-- Description: Index HOTEL by (State, City) for sargable location search
+
+USE 5033_ali;
+
+-- ============================================================
+-- HOTEL: location search index
+-- ============================================================
+-- The search page resolves free-text destinations to canonical State /
+-- (State, City) keys and filters with equality / IN predicates instead of
+-- LOWER(City) LIKE '%x%'. idx_state_city serves both shapes with a range
+-- scan and covers SELECT DISTINCT City, State used to build the location
+-- index. Already included in WBNB_combined_mysql.sql for fresh installs.
+ALTER TABLE HOTEL ADD INDEX idx_state_city (State, City);
@@ -0,0 +1,17 @@
+-- Wedding BnB Database Migration
+-- Database: 5033_ali
+-- Description: Index change-tracking columns for incremental catalog refresh
+
+USE 5033_ali;
+
+-- ============================================================
+-- CHANGE-TRACKING INDEXES
+-- ============================================================
+-- The in-process hotel catalog re-reads rows changed since its last
+-- watermark (WHERE UpdatedAt >= ?) every refresh interval. Without these
+-- indexes each refresh would scan the full tables. Already included in
+-- WBNB_combined_mysql.sql for fresh installs.
+ALTER TABLE HOTEL ADD INDEX idx_updatedAt (UpdatedAt);
+ALTER TABLE ROOM ADD INDEX idx_updatedAt (UpdatedAt);
+ALTER TABLE AVAILABILITY ADD INDEX idx_updatedAt (UpdatedAt);
+ALTER TABLE HOTELAMENITIES ADD INDEX idx_createdAt (CreatedAt);
@@ -0,0 +1,42 @@
+-- Wedding BnB Database Migration
+-- Database: 5033_ali
+-- Description: Idempotency keys and confirmation numbers for the booking write path
+
+USE 5033_ali;
+
+-- ============================================================
+-- BOOKINGREQUEST: one row per confirmed booking request
+-- ============================================================
+-- booking_service inserts the request's idempotency key first, inside the
+-- booking transaction. A second submit with the same key (double click,
+-- browser retry) blocks on uk_idempotencyKey until the first transaction
+-- ends, then reads back the committed confirmation instead of booking
+-- again. A failed booking rolls back its key, so it can be retried.
+-- Already included in WBNB_combined_mysql.sql for fresh installs.
+CREATE TABLE IF NOT EXISTS BOOKINGREQUEST (
+  BookingRequestID INT AUTO_INCREMENT PRIMARY KEY,
+  IdempotencyKey VARCHAR(64) NOT NULL,
+  UserID INT NOT NULL,
+  HotelID INT NOT NULL,
+  CheckInDate DATE NOT NULL,
+  CheckOutDate DATE NOT NULL,
+  NumberOfRooms INT NOT NULL,
+  TotalPrice DECIMAL(10,2) NOT NULL DEFAULT 0,
+  ConfirmationNumber VARCHAR(32),
+  CreatedAt DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+  FOREIGN KEY (UserID) REFERENCES `USER`(UserID) ON DELETE RESTRICT ON UPDATE CASCADE,
+  FOREIGN KEY (HotelID) REFERENCES HOTEL(HotelID) ON DELETE RESTRICT ON UPDATE CASCADE,
+  UNIQUE KEY uk_idempotencyKey (IdempotencyKey),
+  UNIQUE KEY uk_confirmationNumber (ConfirmationNumber),
+  INDEX idx_userID (UserID),
+  INDEX idx_hotelID (HotelID)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- BOOKING: group the per-room rows of one request
+-- ============================================================
+-- A request for several rooms may span several ROOM rows; each gets its
+-- own BOOKING row carrying the shared confirmation number.
+ALTER TABLE BOOKING ADD COLUMN ConfirmationNumber VARCHAR(32) AFTER BookingID;
+ALTER TABLE BOOKING ADD INDEX idx_confirmationNumber (ConfirmationNumber);
@@ -0,0 +1,125 @@
+-- Wedding BnB Database Migration
+-- Database: 5033_ali
+-- Description: Materialized hotel search summary and per-state statistics
+
+USE 5033_ali;
+
+-- ============================================================
+-- HOTEL_SEARCH_SUMMARY: one pre-aggregated row per hotel
+-- ============================================================
+-- Holds the HOTEL display columns plus room price/count, amenity bitmask
+-- and names, review aggregates and free room-nights over the next 30
+-- days, so a date-less search is a range scan of one table instead of
+-- re-aggregating ROOM / HOTELAMENITIES / AMENITIES per request.
+-- Maintained by search_summary.SearchSummaryRefresher; rows are at most
+-- one refresh interval (default 30 s) behind the source tables.
+-- AmenityMask has bit (AmenityID - 1) set for AmenityIDs 1-64.
+-- Already included in WBNB_combined_mysql.sql for fresh installs.
+CREATE TABLE IF NOT EXISTS HOTEL_SEARCH_SUMMARY (
+  HotelID INT PRIMARY KEY,
+  HotelName VARCHAR(255) NOT NULL,
+  StreetAddress VARCHAR(255),
+  City VARCHAR(100),
+  State VARCHAR(100),
+  PhoneNumber VARCHAR(20),
+  Email VARCHAR(255),
+  Website VARCHAR(255),
+  Description TEXT,
+  AverageRating DECIMAL(3,2),
+  StarRating INT,
+  TotalRooms INT,
+  MinPrice DECIMAL(10,2),
+  AvgPrice DECIMAL(10,2) NOT NULL,
+  RoomCount INT NOT NULL DEFAULT 0,
+  FreeRoomNights30 INT NOT NULL DEFAULT 0,
+  AmenityMask BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  Amenities TEXT,
+  ReviewCount INT NOT NULL DEFAULT 0,
+  ReviewRatingSum DECIMAL(10,1) NOT NULL DEFAULT 0,
+  ReviewAvgRating DECIMAL(3,2),
+  RefreshedAt DATETIME(6) NOT NULL,
+
+  INDEX idx_state_city (State, City),
+  INDEX idx_averageRating (AverageRating),
+  INDEX idx_avgPrice (AvgPrice)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- STATE_STATS: per-state hotel and room counts, rating range
+-- ============================================================
+CREATE TABLE IF NOT EXISTS STATE_STATS (
+  State VARCHAR(100) PRIMARY KEY,
+  HotelCount INT NOT NULL,
+  RoomCount INT NOT NULL DEFAULT 0,
+  AvgRating DECIMAL(3,2),
+  MinRating DECIMAL(3,2),
+  MaxRating DECIMAL(3,2),
+  AvgPrice DECIMAL(10,2),
+  RefreshedAt DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- Change tracking
+-- ============================================================
+-- Triggers queue the affected HotelID; the refresher recomputes queued
+-- hotels and removes each entry only if it was not re-queued meanwhile
+-- (MarkedAt unchanged). AVAILABILITY has no trigger: it is written on the
+-- booking hot path, so the refresher reads its idx_updatedAt watermark
+-- (kept in SUMMARY_REFRESH_STATE) instead.
+CREATE TABLE IF NOT EXISTS HOTEL_SUMMARY_DIRTY (
+  HotelID INT PRIMARY KEY,
+  MarkedAt DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+
+  INDEX idx_markedAt (MarkedAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS SUMMARY_REFRESH_STATE (
+  Source VARCHAR(32) PRIMARY KEY,
+  Watermark DATETIME(6),
+  RefreshedAt DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TRIGGER trg_hotel_summary_ai AFTER INSERT ON HOTEL FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotel_summary_au AFTER UPDATE ON HOTEL FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotel_summary_ad AFTER DELETE ON HOTEL FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+CREATE TRIGGER trg_room_summary_ai AFTER INSERT ON ROOM FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_room_summary_au AFTER UPDATE ON ROOM FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_room_summary_ad AFTER DELETE ON ROOM FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+CREATE TRIGGER trg_hotelamenities_summary_ai AFTER INSERT ON HOTELAMENITIES FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotelamenities_summary_au AFTER UPDATE ON HOTELAMENITIES FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotelamenities_summary_ad AFTER DELETE ON HOTELAMENITIES FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+CREATE TRIGGER trg_review_summary_ai AFTER INSERT ON REVIEW FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_review_summary_au AFTER UPDATE ON REVIEW FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_review_summary_ad AFTER DELETE ON REVIEW FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+-- Queue every existing hotel; the first refresh builds the summary
+INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID)
+SELECT HotelID FROM HOTEL
+ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
@@ -0,0 +1,95 @@
+-- Wedding BnB Database Migration
+-- Database: 5033_ali
+-- Description: Running review aggregates and review-driven AverageRating on HOTEL
+
+USE 5033_ali;
+
+-- ============================================================
+-- HOTEL: running rating aggregates
+-- ============================================================
+-- ReviewCount / RatingSum (and their IsVerifiedPurchase-only twins) are
+-- kept by the REVIEW triggers below in O(1) per insert, edit or delete:
+-- one UPDATE of the affected HOTEL row(s), no GROUP BY over REVIEW.
+--
+-- AverageRating becomes the Bayesian-smoothed mean of REVIEW.NumericRating
+-- with the hotel's editorial rating (BaseRating, the previous static
+-- AverageRating) as the prior, weighted as 5 reviews:
+--     (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+-- so a hotel with no reviews keeps its editorial rating and one review
+-- cannot swing it to 1 or 5. Search ordering and idx_averageRating use it
+-- unchanged. review_ratings.py checks and repairs drift.
+-- Already included in WBNB_combined_mysql.sql for fresh installs.
+ALTER TABLE HOTEL
+  ADD COLUMN BaseRating DECIMAL(3,2) AFTER AverageRating,
+  ADD COLUMN ReviewCount INT NOT NULL DEFAULT 0 AFTER BaseRating,
+  ADD COLUMN RatingSum INT NOT NULL DEFAULT 0 AFTER ReviewCount,
+  ADD COLUMN VerifiedReviewCount INT NOT NULL DEFAULT 0 AFTER RatingSum,
+  ADD COLUMN VerifiedRatingSum INT NOT NULL DEFAULT 0 AFTER VerifiedReviewCount,
+  ADD COLUMN VerifiedAverageRating DECIMAL(3,2)
+    AS (IF(VerifiedReviewCount > 0, VerifiedRatingSum / VerifiedReviewCount, NULL)) VIRTUAL
+    AFTER VerifiedRatingSum;
+
+ALTER TABLE HOTEL_SEARCH_SUMMARY ADD COLUMN VerifiedAvgRating DECIMAL(3,2) AFTER ReviewAvgRating;
+
+-- ============================================================
+-- Backfill from the reviews written so far
+-- ============================================================
+UPDATE HOTEL SET BaseRating = AverageRating WHERE BaseRating IS NULL;
+
+UPDATE HOTEL h
+JOIN (
+  SELECT HotelID,
+         COUNT(*) AS review_count,
+         SUM(NumericRating) AS rating_sum,
+         SUM(IsVerifiedPurchase <> 0) AS verified_count,
+         SUM(IF(IsVerifiedPurchase, NumericRating, 0)) AS verified_sum
+  FROM REVIEW
+  GROUP BY HotelID
+) r ON r.HotelID = h.HotelID
+SET h.ReviewCount = r.review_count,
+    h.RatingSum = r.rating_sum,
+    h.VerifiedReviewCount = r.verified_count,
+    h.VerifiedRatingSum = r.verified_sum;
+
+UPDATE HOTEL SET AverageRating = ROUND(CASE WHEN BaseRating IS NOT NULL THEN (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+                                            WHEN ReviewCount > 0 THEN RatingSum / ReviewCount END, 2);
+
+-- ============================================================
+-- Triggers
+-- ============================================================
+-- Single-statement bodies (no DELIMITER needed). MySQL applies single-table
+-- UPDATE assignments left to right, so AverageRating sees the new sums.
+-- A review moved to another hotel updates both rows in one statement.
+CREATE TRIGGER trg_hotel_rating_bi BEFORE INSERT ON HOTEL FOR EACH ROW
+  SET NEW.BaseRating = COALESCE(NEW.BaseRating, NEW.AverageRating);
+
+CREATE TRIGGER trg_review_rating_ai AFTER INSERT ON REVIEW FOR EACH ROW
+  UPDATE HOTEL SET
+    ReviewCount = ReviewCount + 1,
+    RatingSum = RatingSum + NEW.NumericRating,
+    VerifiedReviewCount = VerifiedReviewCount + (NEW.IsVerifiedPurchase <> 0),
+    VerifiedRatingSum = VerifiedRatingSum + IF(NEW.IsVerifiedPurchase, NEW.NumericRating, 0),
+    AverageRating = ROUND(CASE WHEN BaseRating IS NOT NULL THEN (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+                               WHEN ReviewCount > 0 THEN RatingSum / ReviewCount END, 2)
+  WHERE HotelID = NEW.HotelID;
+CREATE TRIGGER trg_review_rating_au AFTER UPDATE ON REVIEW FOR EACH ROW
+  UPDATE HOTEL SET
+    ReviewCount = ReviewCount + (HotelID = NEW.HotelID) - (HotelID = OLD.HotelID),
+    RatingSum = RatingSum + IF(HotelID = NEW.HotelID, NEW.NumericRating, 0)
+                          - IF(HotelID = OLD.HotelID, OLD.NumericRating, 0),
+    VerifiedReviewCount = VerifiedReviewCount + (HotelID = NEW.HotelID AND NEW.IsVerifiedPurchase <> 0)
+                                              - (HotelID = OLD.HotelID AND OLD.IsVerifiedPurchase <> 0),
+    VerifiedRatingSum = VerifiedRatingSum + IF(HotelID = NEW.HotelID AND NEW.IsVerifiedPurchase, NEW.NumericRating, 0)
+                                          - IF(HotelID = OLD.HotelID AND OLD.IsVerifiedPurchase, OLD.NumericRating, 0),
+    AverageRating = ROUND(CASE WHEN BaseRating IS NOT NULL THEN (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+                               WHEN ReviewCount > 0 THEN RatingSum / ReviewCount END, 2)
+  WHERE HotelID IN (OLD.HotelID, NEW.HotelID);
+CREATE TRIGGER trg_review_rating_ad AFTER DELETE ON REVIEW FOR EACH ROW
+  UPDATE HOTEL SET
+    ReviewCount = ReviewCount - 1,
+    RatingSum = RatingSum - OLD.NumericRating,
+    VerifiedReviewCount = VerifiedReviewCount - (OLD.IsVerifiedPurchase <> 0),
+    VerifiedRatingSum = VerifiedRatingSum - IF(OLD.IsVerifiedPurchase, OLD.NumericRating, 0),
+    AverageRating = ROUND(CASE WHEN BaseRating IS NOT NULL THEN (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+                               WHEN ReviewCount > 0 THEN RatingSum / ReviewCount END, 2)
+  WHERE HotelID = OLD.HotelID;
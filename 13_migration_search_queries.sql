@@ -0,0 +1,36 @@
+-- Wedding BnB Database Migration
+-- Database: 5033_ali
+-- Description: Search analytics table fed by search_analytics.SearchEventLogger
+
+USE 5033_ali;
+
+-- ============================================================
+-- SEARCHQUERIES: one row per search (MySQL counterpart of v1 SearchQueries)
+-- ============================================================
+-- Written only by a background thread in multi-row INSERTs, never by the
+-- request path. SearchKey is generated in the app when the search runs,
+-- so the click on a result and a booking that follows can be folded into
+-- the same row with INSERT ... ON DUPLICATE KEY UPDATE in a later batch.
+-- No foreign keys: analytics rows must not fail or lock against HOTEL.
+-- Already included in WBNB_combined_mysql.sql for fresh installs.
+CREATE TABLE IF NOT EXISTS SEARCHQUERIES (
+  SearchQueryID BIGINT AUTO_INCREMENT PRIMARY KEY,
+  SearchKey CHAR(32) NOT NULL,
+  SearchLocation VARCHAR(255),
+  CheckInDate DATE,
+  CheckOutDate DATE,
+  GuestCount INT,
+  RoomsNeeded INT,
+  MaxBudget DECIMAL(10,2),
+  MinRating DECIMAL(3,2),
+  AmenitiesFilter TEXT,
+  ResultsCount INT,
+  LatencyMs DECIMAL(10,1),
+  ClickedHotelID INT,
+  LeadToBooking BOOLEAN NOT NULL DEFAULT FALSE,
+  CreatedAt DATETIME(6) NOT NULL,
+
+  UNIQUE KEY uk_searchKey (SearchKey),
+  INDEX idx_createdAt (CreatedAt),
+  INDEX idx_clickedHotelID (ClickedHotelID)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -15,8 +15,14 @@ USE 5033_ali;
 -- ============================================================
 -- DROP EXISTING TABLES (if any) - Uncomment to reset schema
 -- ============================================================
+DROP TABLE IF EXISTS SEARCHQUERIES;
+DROP TABLE IF EXISTS SUMMARY_REFRESH_STATE;
+DROP TABLE IF EXISTS HOTEL_SUMMARY_DIRTY;
+DROP TABLE IF EXISTS STATE_STATS;
+DROP TABLE IF EXISTS HOTEL_SEARCH_SUMMARY;
 DROP TABLE IF EXISTS ROOMAMENITIES;
 DROP TABLE IF EXISTS HOTELAMENITIES;
+DROP TABLE IF EXISTS BOOKINGREQUEST;
 DROP TABLE IF EXISTS PAYMENT;
 DROP TABLE IF EXISTS REVIEW;
 DROP TABLE IF EXISTS GUESTINFO;
@@ -70,6 +76,13 @@ CREATE TABLE IF NOT EXISTS HOTEL (
   Website VARCHAR(255),
   Description TEXT,
   AverageRating DECIMAL(3,2),
+  BaseRating DECIMAL(3,2),
+  ReviewCount INT NOT NULL DEFAULT 0,
+  RatingSum INT NOT NULL DEFAULT 0,
+  VerifiedReviewCount INT NOT NULL DEFAULT 0,
+  VerifiedRatingSum INT NOT NULL DEFAULT 0,
+  VerifiedAverageRating DECIMAL(3,2)
+    AS (IF(VerifiedReviewCount > 0, VerifiedRatingSum / VerifiedReviewCount, NULL)) VIRTUAL,
   StarRating INT,
   TotalRooms INT,
   CheckInTime TIME,
@@ -79,10 +92,12 @@ CREATE TABLE IF NOT EXISTS HOTEL (
   UpdatedAt DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   
   INDEX idx_city (City),
+  INDEX idx_state_city (State, City),
   INDEX idx_country (Country),
   INDEX idx_starRating (StarRating),
   INDEX idx_averageRating (AverageRating),
-  INDEX idx_createdAt (CreatedAt)
+  INDEX idx_createdAt (CreatedAt),
+  INDEX idx_updatedAt (UpdatedAt)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================
@@ -122,7 +137,8 @@ CREATE TABLE IF NOT EXISTS ROOM (
   INDEX idx_roomType (RoomType),
   INDEX idx_guestCapacity (GuestCapacity),
   INDEX idx_basePrice (BasePrice),
-  INDEX idx_roomStatus (RoomStatus)
+  INDEX idx_roomStatus (RoomStatus),
+  INDEX idx_updatedAt (UpdatedAt)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================
@@ -138,7 +154,8 @@ CREATE TABLE IF NOT EXISTS HOTELAMENITIES (
   FOREIGN KEY (AmenityID) REFERENCES AMENITIES(AmenityID) ON DELETE CASCADE ON UPDATE CASCADE,
   UNIQUE KEY uk_hotel_amenity (HotelID, AmenityID),
   INDEX idx_hotelID (HotelID),
-  INDEX idx_amenityID (AmenityID)
+  INDEX idx_amenityID (AmenityID),
+  INDEX idx_createdAt (CreatedAt)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================
@@ -174,7 +191,8 @@ CREATE TABLE IF NOT EXISTS AVAILABILITY (
   UNIQUE KEY uk_room_date (RoomID, AvailableDate),
   INDEX idx_roomID (RoomID),
   INDEX idx_availableDate (AvailableDate),
-  INDEX idx_isBooked (IsBooked)
+  INDEX idx_isBooked (IsBooked),
+  INDEX idx_updatedAt (UpdatedAt)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================
@@ -182,6 +200,7 @@ CREATE TABLE IF NOT EXISTS AVAILABILITY (
 -- ============================================================
 CREATE TABLE IF NOT EXISTS BOOKING (
   BookingID INT AUTO_INCREMENT PRIMARY KEY,
+  ConfirmationNumber VARCHAR(32),
   UserID INT NOT NULL,
   RoomID INT NOT NULL,
   CheckInDate DATE NOT NULL,
@@ -204,6 +223,7 @@ CREATE TABLE IF NOT EXISTS BOOKING (
   INDEX idx_paymentStatus (PaymentStatus),
   INDEX idx_checkInDate (CheckInDate),
   INDEX idx_checkOutDate (CheckOutDate),
+  INDEX idx_confirmationNumber (ConfirmationNumber),
   INDEX idx_createdAt (CreatedAt)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -285,6 +305,200 @@ CREATE TABLE IF NOT EXISTS PAYMENT (
   INDEX idx_createdAt (CreatedAt)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ============================================================
+-- TABLE 12: BOOKINGREQUEST (Idempotency keys for the booking write path)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS BOOKINGREQUEST (
+  BookingRequestID INT AUTO_INCREMENT PRIMARY KEY,
+  IdempotencyKey VARCHAR(64) NOT NULL,
+  UserID INT NOT NULL,
+  HotelID INT NOT NULL,
+  CheckInDate DATE NOT NULL,
+  CheckOutDate DATE NOT NULL,
+  NumberOfRooms INT NOT NULL,
+  TotalPrice DECIMAL(10,2) NOT NULL DEFAULT 0,
+  ConfirmationNumber VARCHAR(32),
+  CreatedAt DATETIME DEFAULT CURRENT_TIMESTAMP,
+  
+  FOREIGN KEY (UserID) REFERENCES `USER`(UserID) ON DELETE RESTRICT ON UPDATE CASCADE,
+  FOREIGN KEY (HotelID) REFERENCES HOTEL(HotelID) ON DELETE RESTRICT ON UPDATE CASCADE,
+  UNIQUE KEY uk_idempotencyKey (IdempotencyKey),
+  UNIQUE KEY uk_confirmationNumber (ConfirmationNumber),
+  INDEX idx_userID (UserID),
+  INDEX idx_hotelID (HotelID)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- TABLE 13: HOTEL_SEARCH_SUMMARY (Materialized search rows, see search_summary.py)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS HOTEL_SEARCH_SUMMARY (
+  HotelID INT PRIMARY KEY,
+  HotelName VARCHAR(255) NOT NULL,
+  StreetAddress VARCHAR(255),
+  City VARCHAR(100),
+  State VARCHAR(100),
+  PhoneNumber VARCHAR(20),
+  Email VARCHAR(255),
+  Website VARCHAR(255),
+  Description TEXT,
+  AverageRating DECIMAL(3,2),
+  StarRating INT,
+  TotalRooms INT,
+  MinPrice DECIMAL(10,2),
+  AvgPrice DECIMAL(10,2) NOT NULL,
+  RoomCount INT NOT NULL DEFAULT 0,
+  FreeRoomNights30 INT NOT NULL DEFAULT 0,
+  AmenityMask BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  Amenities TEXT,
+  ReviewCount INT NOT NULL DEFAULT 0,
+  ReviewRatingSum DECIMAL(10,1) NOT NULL DEFAULT 0,
+  ReviewAvgRating DECIMAL(3,2),
+  VerifiedAvgRating DECIMAL(3,2),
+  RefreshedAt DATETIME(6) NOT NULL,
+
+  INDEX idx_state_city (State, City),
+  INDEX idx_averageRating (AverageRating),
+  INDEX idx_avgPrice (AvgPrice)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- TABLE 14: STATE_STATS (Per-state hotel counts and ratings)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS STATE_STATS (
+  State VARCHAR(100) PRIMARY KEY,
+  HotelCount INT NOT NULL,
+  RoomCount INT NOT NULL DEFAULT 0,
+  AvgRating DECIMAL(3,2),
+  MinRating DECIMAL(3,2),
+  MaxRating DECIMAL(3,2),
+  AvgPrice DECIMAL(10,2),
+  RefreshedAt DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- TABLE 15: HOTEL_SUMMARY_DIRTY (Hotels queued for a summary refresh)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS HOTEL_SUMMARY_DIRTY (
+  HotelID INT PRIMARY KEY,
+  MarkedAt DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+
+  INDEX idx_markedAt (MarkedAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- TABLE 16: SUMMARY_REFRESH_STATE (Refresher watermarks)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS SUMMARY_REFRESH_STATE (
+  Source VARCHAR(32) PRIMARY KEY,
+  Watermark DATETIME(6),
+  RefreshedAt DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- TABLE 17: SEARCHQUERIES (Search analytics, see search_analytics.py)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS SEARCHQUERIES (
+  SearchQueryID BIGINT AUTO_INCREMENT PRIMARY KEY,
+  SearchKey CHAR(32) NOT NULL,
+  SearchLocation VARCHAR(255),
+  CheckInDate DATE,
+  CheckOutDate DATE,
+  GuestCount INT,
+  RoomsNeeded INT,
+  MaxBudget DECIMAL(10,2),
+  MinRating DECIMAL(3,2),
+  AmenitiesFilter TEXT,
+  ResultsCount INT,
+  LatencyMs DECIMAL(10,1),
+  ClickedHotelID INT,
+  LeadToBooking BOOLEAN NOT NULL DEFAULT FALSE,
+  CreatedAt DATETIME(6) NOT NULL,
+
+  UNIQUE KEY uk_searchKey (SearchKey),
+  INDEX idx_createdAt (CreatedAt),
+  INDEX idx_clickedHotelID (ClickedHotelID)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================
+-- SEARCH SUMMARY TRIGGERS (queue changed hotels in HOTEL_SUMMARY_DIRTY)
+-- ============================================================
+CREATE TRIGGER trg_hotel_summary_ai AFTER INSERT ON HOTEL FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotel_summary_au AFTER UPDATE ON HOTEL FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotel_summary_ad AFTER DELETE ON HOTEL FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+CREATE TRIGGER trg_room_summary_ai AFTER INSERT ON ROOM FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_room_summary_au AFTER UPDATE ON ROOM FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_room_summary_ad AFTER DELETE ON ROOM FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+CREATE TRIGGER trg_hotelamenities_summary_ai AFTER INSERT ON HOTELAMENITIES FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotelamenities_summary_au AFTER UPDATE ON HOTELAMENITIES FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_hotelamenities_summary_ad AFTER DELETE ON HOTELAMENITIES FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+CREATE TRIGGER trg_review_summary_ai AFTER INSERT ON REVIEW FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_review_summary_au AFTER UPDATE ON REVIEW FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID), (NEW.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_review_summary_ad AFTER DELETE ON REVIEW FOR EACH ROW
+  INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) VALUES (OLD.HotelID)
+  ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6);
+
+-- ============================================================
+-- REVIEW RATING TRIGGERS (running rating aggregates on HOTEL, see review_ratings.py)
+-- ============================================================
+CREATE TRIGGER trg_hotel_rating_bi BEFORE INSERT ON HOTEL FOR EACH ROW
+  SET NEW.BaseRating = COALESCE(NEW.BaseRating, NEW.AverageRating);
+
+CREATE TRIGGER trg_review_rating_ai AFTER INSERT ON REVIEW FOR EACH ROW
+  UPDATE HOTEL SET
+    ReviewCount = ReviewCount + 1,
+    RatingSum = RatingSum + NEW.NumericRating,
+    VerifiedReviewCount = VerifiedReviewCount + (NEW.IsVerifiedPurchase <> 0),
+    VerifiedRatingSum = VerifiedRatingSum + IF(NEW.IsVerifiedPurchase, NEW.NumericRating, 0),
+    AverageRating = ROUND(CASE WHEN BaseRating IS NOT NULL THEN (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+                               WHEN ReviewCount > 0 THEN RatingSum / ReviewCount END, 2)
+  WHERE HotelID = NEW.HotelID;
+CREATE TRIGGER trg_review_rating_au AFTER UPDATE ON REVIEW FOR EACH ROW
+  UPDATE HOTEL SET
+    ReviewCount = ReviewCount + (HotelID = NEW.HotelID) - (HotelID = OLD.HotelID),
+    RatingSum = RatingSum + IF(HotelID = NEW.HotelID, NEW.NumericRating, 0)
+                          - IF(HotelID = OLD.HotelID, OLD.NumericRating, 0),
+    VerifiedReviewCount = VerifiedReviewCount + (HotelID = NEW.HotelID AND NEW.IsVerifiedPurchase <> 0)
+                                              - (HotelID = OLD.HotelID AND OLD.IsVerifiedPurchase <> 0),
+    VerifiedRatingSum = VerifiedRatingSum + IF(HotelID = NEW.HotelID AND NEW.IsVerifiedPurchase, NEW.NumericRating, 0)
+                                          - IF(HotelID = OLD.HotelID AND OLD.IsVerifiedPurchase, OLD.NumericRating, 0),
+    AverageRating = ROUND(CASE WHEN BaseRating IS NOT NULL THEN (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+                               WHEN ReviewCount > 0 THEN RatingSum / ReviewCount END, 2)
+  WHERE HotelID IN (OLD.HotelID, NEW.HotelID);
+CREATE TRIGGER trg_review_rating_ad AFTER DELETE ON REVIEW FOR EACH ROW
+  UPDATE HOTEL SET
+    ReviewCount = ReviewCount - 1,
+    RatingSum = RatingSum - OLD.NumericRating,
+    VerifiedReviewCount = VerifiedReviewCount - (OLD.IsVerifiedPurchase <> 0),
+    VerifiedRatingSum = VerifiedRatingSum - IF(OLD.IsVerifiedPurchase, OLD.NumericRating, 0),
+    AverageRating = ROUND(CASE WHEN BaseRating IS NOT NULL THEN (BaseRating * 5 + RatingSum) / (5 + ReviewCount)
+                               WHEN ReviewCount > 0 THEN RatingSum / ReviewCount END, 2)
+  WHERE HotelID = OLD.HotelID;
+
 -- ============================================================
 -- SCHEMA CREATION COMPLETE
 -- ============================================================
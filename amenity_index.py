@@ -0,0 +1,173 @@
+"""
+Wedding Destination Hotel Finder - Amenity Index
+Per-hotel amenity bitsets keyed by AmenityID: must-have (AND) and
+any-of (OR) filters, facet counts and display names without parsing the
+GROUP_CONCAT amenity string on every request
+"""
+
+# ============================================================
+# AMENITY INDEX
+# ============================================================
+
+class AmenityIndex:
+    """
+    Bitset per hotel over the AMENITIES vocabulary
+
+    Each AmenityID gets a dense bit position (in AmenityID order) and each
+    hotel a Python int with the bits of its HOTELAMENITIES rows set, so an
+    AND filter is `mask & required == required` and an OR filter is
+    `mask & wanted != 0`. Build once per catalog refresh.
+    """
+
+    def __init__(self, amenity_names, hotel_amenities):
+        self.names = dict(amenity_names)                     # AmenityID -> AmenityName
+        self.ids = sorted(self.names)
+        self.bit = {amenity_id: i for i, amenity_id in enumerate(self.ids)}
+        self.by_name = {name.lower(): amenity_id for amenity_id, name in self.names.items()}
+
+        self.masks = {}     # HotelID -> bitset
+        self._labels = {}   # HotelID -> amenity names, sorted for display
+        for hotel_id, amenity_ids in hotel_amenities.items():
+            self.masks[hotel_id] = self.encode(amenity_ids)
+            self._labels[hotel_id] = tuple(sorted(self.names[a] for a in amenity_ids if a in self.names))
+
+    @classmethod
+    def from_connection(cls, connection, include_rooms=False):
+        """
+        Build from AMENITIES / HOTELAMENITIES
+
+        With include_rooms, amenities of a hotel's rooms (ROOMAMENITIES)
+        count as hotel amenities too.
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT AmenityID, AmenityName FROM AMENITIES")
+            names = dict(cursor.fetchall())
+            cursor.execute("SELECT HotelID, AmenityID FROM HOTELAMENITIES")
+            pairs = cursor.fetchall()
+            if include_rooms:
+                cursor.execute("""
+                    SELECT DISTINCT r.HotelID, ra.AmenityID
+                    FROM ROOMAMENITIES ra
+                    JOIN ROOM r ON r.RoomID = ra.RoomID
+                """)
+                pairs += cursor.fetchall()
+        finally:
+            cursor.close()
+
+        hotel_amenities = {}
+        for hotel_id, amenity_id in pairs:
+            hotel_amenities.setdefault(hotel_id, set()).add(amenity_id)
+        return cls(names, hotel_amenities)
+
+    def encode(self, amenity_ids):
+        """Bitset for a collection of AmenityIDs (unknown IDs are ignored)"""
+        mask = 0
+        for amenity_id in amenity_ids:
+            bit = self.bit.get(amenity_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def decode(self, mask):
+        """AmenityIDs whose bits are set in `mask`"""
+        return tuple(amenity_id for amenity_id, bit in self.bit.items() if mask >> bit & 1)
+
+    def resolve(self, names):
+        """AmenityIDs for display names (case-insensitive; unknown names are dropped)"""
+        return tuple(self.by_name[n.lower()] for n in names if n.lower() in self.by_name)
+
+    def amenities(self, hotel_id):
+        """Amenity names of a hotel, sorted"""
+        return self._labels.get(hotel_id, ())
+
+    def options(self):
+        """Every amenity name, sorted, for filter widgets"""
+        return sorted(self.names.values())
+
+    def matches(self, hotel_id, amenities_all=(), amenities_any=()):
+        """True if the hotel has every AmenityID in amenities_all and one of amenities_any"""
+        mask = self.masks.get(hotel_id, 0)
+        if amenities_all:
+            if any(a not in self.bit for a in amenities_all):
+                return False
+            required = self.encode(amenities_all)
+            if (mask & required) != required:
+                return False
+        if amenities_any and not (mask & self.encode(amenities_any)):
+            return False
+        return True
+
+    def facet_counts(self, hotel_ids):
+        """{AmenityID: number of the given hotels offering it}"""
+        counts = [0] * len(self.ids)
+        for hotel_id in hotel_ids:
+            mask = self.masks.get(hotel_id, 0)
+            while mask:
+                low = mask & -mask
+                counts[low.bit_length() - 1] += 1
+                mask ^= low
+        return {amenity_id: counts[bit] for amenity_id, bit in self.bit.items()}
+
+
+def amenity_predicate(amenities_all=(), amenities_any=(), alias="h"):
+    """
+    SQL predicate + params for amenity filters
+
+    Both forms probe uk_hotel_amenity (HotelID, AmenityID) per hotel
+    instead of matching the GROUP_CONCAT string. Returns ("", []) when
+    there is nothing to filter.
+    """
+    clauses = []
+    params = []
+    if amenities_all:
+        required = sorted(set(amenities_all))
+        clauses.append(
+            "(SELECT COUNT(*) FROM HOTELAMENITIES ha_all"
+            f" WHERE ha_all.HotelID = {alias}.HotelID"
+            f" AND ha_all.AmenityID IN ({', '.join(['%s'] * len(required))})) = %s"
+        )
+        params.extend(required)
+        params.append(len(required))
+    if amenities_any:
+        wanted = sorted(set(amenities_any))
+        clauses.append(
+            "EXISTS (SELECT 1 FROM HOTELAMENITIES ha_any"
+            f" WHERE ha_any.HotelID = {alias}.HotelID"
+            f" AND ha_any.AmenityID IN ({', '.join(['%s'] * len(wanted))}))"
+        )
+        params.extend(wanted)
+    return " AND ".join(clauses), params
+
+
+# HOTEL_SEARCH_SUMMARY.AmenityMask: bit (AmenityID - 1), AmenityIDs 1-64
+SQL_MASK_BITS = 64
+
+
+def amenity_mask_predicate(amenities_all=(), amenities_any=(), alias="h"):
+    """
+    SQL predicate + params over HOTEL_SEARCH_SUMMARY.AmenityMask
+
+    Tests the precomputed bitmask in the summary row, no HOTELAMENITIES
+    probe. Returns None when an AmenityID has no bit (outside 1-64), so
+    the caller can use amenity_predicate() instead.
+    """
+    masks = []
+    for amenity_ids in (amenities_all, amenities_any):
+        mask = 0
+        for amenity_id in amenity_ids:
+            if not 1 <= amenity_id <= SQL_MASK_BITS:
+                return None
+            mask |= 1 << (amenity_id - 1)
+        masks.append(mask)
+    required, wanted = masks
+
+    clauses = []
+    params = []
+    if required:
+        clauses.append(f"({alias}.AmenityMask & %s) = %s")
+        params.extend([required, required])
+    if wanted:
+        clauses.append(f"({alias}.AmenityMask & %s) <> 0")
+        params.append(wanted)
+    return " AND ".join(clauses), params
@@ -0,0 +1,226 @@
+"""
+Wedding Destination Hotel Finder - Concurrent Query Layer
+Fans independent MySQL queries out over a thread pool, one pooled
+connection each, with per-query timeouts and server-side cancellation.
+Sync (Streamlit) and asyncio entry points share the same executor.
+"""
+
+import asyncio
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from mysql.connector import Error
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_MAX_WORKERS = 8       # keep <= the connection pool size
+DEFAULT_TIMEOUT = 5.0         # seconds per query, counted from submission
+KILL_CHECKOUT_TIMEOUT = 1.0   # wait for a connection to send KILL QUERY on
+
+
+class QueryTimeoutError(Error):
+    """Raised for a query that did not finish within its timeout"""
+
+
+class QueryCall(namedtuple("QueryCall", ["fn", "args", "timeout"])):
+    """
+    One query for gather(): `fn(connection, *args)` with its own timeout
+
+    `fn` receives a pooled connection and returns plain Python data
+    (fetched rows, not a cursor).
+    """
+    __slots__ = ()
+
+    def __new__(cls, fn, *args, timeout=None):
+        return super().__new__(cls, fn, args, timeout)
+
+
+class _Running:
+    """Connection id of a query while it runs, for KILL QUERY"""
+    __slots__ = ("lock", "connection_id", "cancelled", "killed")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connection_id = None
+        self.cancelled = False
+        self.killed = False
+
+
+# ============================================================
+# EXECUTOR
+# ============================================================
+
+class QueryExecutor:
+    """
+    Thread-pool runner for independent read queries
+
+    gather() submits every call at once and waits for all of them, so a
+    page that needs N independent queries waits ~max(query) rather than
+    sum(query). A call that misses its timeout is cancelled: if it has not
+    started it never runs, if it is running its statement is stopped with
+    KILL QUERY, and MySQL's max_execution_time aborts a SELECT at the same
+    deadline even if the KILL cannot be sent. The other calls are not
+    affected.
+    """
+
+    def __init__(self, pool, max_workers=DEFAULT_MAX_WORKERS, default_timeout=DEFAULT_TIMEOUT):
+        self._pool = pool
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query")
+        self._lock = threading.Lock()
+        self._counters = {"queries": 0, "timeouts": 0, "kills": 0, "errors": 0}
+
+    # --------------------------------------------------------
+    # Submission
+    # --------------------------------------------------------
+
+    def _submit(self, call):
+        timeout = self.default_timeout if call.timeout is None else call.timeout
+        deadline = time.monotonic() + timeout
+        running = _Running()
+        future = self._executor.submit(self._run, running, call.fn, call.args, deadline)
+        self._count("queries")
+        return future, running, timeout, deadline
+
+    def _run(self, running, fn, args, deadline):
+        remaining = deadline - time.monotonic()
+        if running.cancelled or remaining <= 0:
+            raise QueryTimeoutError(msg="Query cancelled before it started")
+
+        connection = self._pool.acquire(timeout=remaining)
+        discard = False
+        try:
+            cursor = connection.cursor()
+            try:
+                # Server-side backstop: SELECTs stop at the deadline by themselves
+                cursor.execute("SET SESSION max_execution_time = %s",
+                               (max(1, int((deadline - time.monotonic()) * 1000)),))
+            finally:
+                cursor.close()
+            with running.lock:
+                running.connection_id = connection.connection_id
+            try:
+                return fn(connection, *args)
+            finally:
+                with running.lock:
+                    running.connection_id = None
+                    killed = running.killed
+                if killed:
+                    # The KILL may land after fn's last statement: never hand this session on
+                    discard = True
+                else:
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute("SET SESSION max_execution_time = 0")
+                    finally:
+                        cursor.close()
+        except Error:
+            self._count("errors")
+            # A killed or timed-out session is not worth reusing
+            discard = True
+            raise
+        finally:
+            self._pool.release(connection, discard=discard)
+
+    def _cancel(self, future, running):
+        self._count("timeouts")
+        running.cancelled = True
+        if future.cancel():
+            return
+        with running.lock:
+            connection_id = running.connection_id
+        if connection_id is None:
+            return
+        # Check out the KILL connection without holding running.lock, so the
+        # query thread is never blocked on the pool. Send the KILL under the
+        # lock only if the same query still holds that connection: _run
+        # clears connection_id under the lock before the session is reused.
+        try:
+            with self._pool.connection(timeout=KILL_CHECKOUT_TIMEOUT) as connection:
+                with running.lock:
+                    if running.connection_id != connection_id:
+                        return
+                    running.killed = True
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute(f"KILL QUERY {int(connection_id)}")
+                    finally:
+                        cursor.close()
+            self._count("kills")
+        except Error:
+            pass  # max_execution_time still ends a SELECT at the deadline
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    # --------------------------------------------------------
+    # Sync API (Streamlit)
+    # --------------------------------------------------------
+
+    def gather(self, calls, return_exceptions=False):
+        """
+        Run {name: QueryCall} concurrently; returns {name: result}
+
+        With return_exceptions, a failed or timed-out call maps to its
+        exception instead of raising, so a page can render the sections
+        that did load.
+        """
+        submitted = {name: self._submit(call) for name, call in calls.items()}
+        results = {}
+        first_error = None
+        for name, (future, running, timeout, deadline) in submitted.items():
+            try:
+                results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                self._cancel(future, running)
+                results[name] = QueryTimeoutError(msg=f"Query '{name}' timed out after {timeout:.1f}s")
+            except Exception as e:
+                results[name] = e
+            if isinstance(results[name], Exception) and first_error is None:
+                first_error = results[name]
+        if first_error is not None and not return_exceptions:
+            raise first_error
+        return results
+
+    def run(self, fn, *args, timeout=None):
+        """Run one query with a timeout (blocking)"""
+        return self.gather({"query": QueryCall(fn, *args, timeout=timeout)})["query"]
+
+    # --------------------------------------------------------
+    # Async API
+    # --------------------------------------------------------
+
+    async def gather_async(self, calls, return_exceptions=False):
+        """Awaitable gather(): the event loop stays free while the queries run"""
+        names = list(calls)
+
+        async def wait(name):
+            future, running, timeout, _ = self._submit(calls[name])
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                self._cancel(future, running)
+                raise QueryTimeoutError(msg=f"Query '{name}' timed out after {timeout:.1f}s")
+
+        results = await asyncio.gather(*(wait(name) for name in names), return_exceptions=return_exceptions)
+        return dict(zip(names, results))
+
+    async def run_async(self, fn, *args, timeout=None):
+        results = await self.gather_async({"query": QueryCall(fn, *args, timeout=timeout)})
+        return results["query"]
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,110 @@
+"""
+Wedding Destination Hotel Finder - Stay Availability
+Set-based date-range availability over the AVAILABILITY calendar
+"""
+
+# ============================================================
+# STAY AVAILABILITY SQL
+# ============================================================
+#
+# AVAILABILITY is treated as an exceptions calendar: a (RoomID, date) row
+# overrides the free count / price for that night, and a missing row means
+# the room is open at its BasePrice. Nights are generated once with a
+# recursive CTE and each room-night is resolved with a single uk_room_date
+# lookup, so the cost is rooms x nights-in-stay no matter how many years
+# of dates the calendar holds.
+
+STAY_AVAILABILITY_CTE = """
+WITH RECURSIVE stay_nights (night) AS (
+    SELECT CAST(%s AS DATE)
+    UNION ALL
+    SELECT night + INTERVAL 1 DAY FROM stay_nights
+    WHERE night + INTERVAL 1 DAY < %s
+),
+room_nights AS (
+    SELECT
+        r.HotelID,
+        r.RoomID,
+        n.night,
+        CASE WHEN av.IsBooked THEN 0
+             ELSE COALESCE(av.AvailableRoomsCount, 1) END AS free_count,
+        COALESCE(av.PriceOverride, r.BasePrice) AS nightly_price
+    FROM ROOM r
+    CROSS JOIN stay_nights n
+    LEFT JOIN AVAILABILITY av
+           ON av.RoomID = r.RoomID AND av.AvailableDate = n.night
+    WHERE r.RoomStatus = 'Available'{room_filter}
+),
+room_stay AS (
+    SELECT HotelID, RoomID,
+           MIN(free_count) AS min_free,
+           AVG(nightly_price) AS avg_price
+    FROM room_nights
+    GROUP BY HotelID, RoomID
+),
+night_free AS (
+    SELECT HotelID, MIN(free_rooms) AS min_free_rooms
+    FROM (
+        SELECT HotelID, night, SUM(free_count) AS free_rooms
+        FROM room_nights
+        GROUP BY HotelID, night
+    ) per_night
+    GROUP BY HotelID
+),
+hotel_stay AS (
+    SELECT
+        rs.HotelID,
+        SUM(rs.min_free) AS rooms_available,
+        nf.min_free_rooms,
+        AVG(CASE WHEN rs.min_free > 0 THEN rs.avg_price END) AS nightly_price,
+        MIN(CASE WHEN rs.min_free > 0 THEN rs.avg_price END) AS min_nightly_price
+    FROM room_stay rs
+    JOIN night_free nf ON nf.HotelID = rs.HotelID
+    GROUP BY rs.HotelID, nf.min_free_rooms
+)
+"""
+
+
+def stay_availability_cte(check_in, check_out, hotel_ids=None):
+    """
+    Build the stay-availability CTE and its parameters
+
+    The CTE exposes `hotel_stay` with one row per hotel:
+        rooms_available   - room units free on every night of the stay
+        min_free_rooms    - smallest hotel-wide free count across the nights
+        nightly_price     - average effective nightly price (PriceOverride
+                            applied) over rooms free for the whole stay
+        min_nightly_price - cheapest such room
+
+    Returns (sql, params); prepend the sql to a SELECT that reads hotel_stay.
+    """
+    if check_out <= check_in:
+        raise ValueError("Check-out date must be after check-in date")
+
+    params = [check_in, check_out]
+    room_filter = ""
+    if hotel_ids:
+        placeholders = ", ".join(["%s"] * len(hotel_ids))
+        room_filter = f" AND r.HotelID IN ({placeholders})"
+        params.extend(hotel_ids)
+    return STAY_AVAILABILITY_CTE.format(room_filter=room_filter), params
+
+
+def fetch_stay_availability(connection, check_in, check_out, hotel_ids=None):
+    """Return {hotel_id: availability dict} for the stay [check_in, check_out)"""
+    cte, params = stay_availability_cte(check_in, check_out, hotel_ids)
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(cte + " SELECT * FROM hotel_stay", params)
+        return {
+            row["HotelID"]: {
+                "rooms_available": int(row["rooms_available"] or 0),
+                "min_free_rooms": int(row["min_free_rooms"] or 0),
+                "nightly_price": float(row["nightly_price"]) if row["nightly_price"] is not None else None,
+                "min_nightly_price": float(row["min_nightly_price"]) if row["min_nightly_price"] is not None else None,
+            }
+            for row in cursor.fetchall()
+        }
+    finally:
+        cursor.close()
+
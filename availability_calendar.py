@@ -0,0 +1,241 @@
+"""
+Wedding Destination Hotel Finder - Availability Calendar
+Dense per-day free-room counts for every hotel x RoomType, held as
+min segment trees so "fewest rooms free on any night of [d1, d2)" is
+O(log days) and a booking updates it in place
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+FREE_DTYPE = np.int32
+NO_ROOMS = np.iinfo(FREE_DTYPE).max  # identity for min()
+ALL_TYPES = None                     # RoomType key of the hotel-wide row
+
+
+def free_count(entry):
+    """Free units for one AVAILABILITY entry (count, is_booked, override); None = no row"""
+    if entry is None:
+        return 1
+    count, is_booked, _ = entry
+    return 0 if is_booked else count
+
+
+# ============================================================
+# CALENDAR
+# ============================================================
+
+class AvailabilityCalendar:
+    """
+    Free room units per night for each (HotelID, RoomType)
+
+    Every key owns one row of an iterative bottom-up min segment tree laid
+    out node-major: `tree[n + d]` holds day `d` for all rows at once and
+    `tree[i] = min(tree[2i], tree[2i + 1])`. A range minimum touches
+    O(log days) nodes, and because each node is a contiguous vector over
+    all rows, one query answers every hotel in a handful of NumPy calls.
+
+    Each hotel also has an ALL_TYPES row (free units summed over its room
+    types), which is the per-night hotel total that
+    availability.stay_availability_cte reports as min_free_rooms. Only
+    rooms with RoomStatus 'Available' are counted; like the CTE, a
+    room-night without an AVAILABILITY row counts as 1 free unit.
+
+    Memory is 2 x days x rows x 4 bytes (~4.3 KB per row for 540 days).
+    """
+
+    def __init__(self, start_date, days, keys):
+        self.start_date = start_date
+        self.days = days
+        self.keys = list(keys)
+        self.row = {key: i for i, key in enumerate(self.keys)}
+        self.tree = np.full((2 * days, len(self.keys)), NO_ROOMS, dtype=FREE_DTYPE)
+
+        self._rows_by_hotel = {}
+        for key, i in self.row.items():
+            self._rows_by_hotel.setdefault(key[0], []).append(i)
+        totals = [(key[0], i) for key, i in self.row.items() if key[1] is ALL_TYPES]
+        self._total_hotels = np.array([hotel_id for hotel_id, _ in totals], dtype=np.int64)
+        self._total_rows = np.array([i for _, i in totals], dtype=np.intp)
+
+    @classmethod
+    def build(cls, rooms, availability, start_date, days):
+        """
+        Calendar from HotelCatalog state
+
+        `rooms` is RoomID -> ROOM row dict and `availability` is
+        (RoomID, date) -> (count, is_booked, price_override); entries
+        outside [start_date, start_date + days) are ignored.
+        """
+        units = {}
+        for room in rooms.values():
+            if room["RoomStatus"] != "Available":
+                continue
+            for key in ((room["HotelID"], room["RoomType"]), (room["HotelID"], ALL_TYPES)):
+                units[key] = units.get(key, 0) + 1
+
+        calendar = cls(start_date, days, sorted(units, key=lambda k: (k[0], k[1] is not ALL_TYPES, k[1] or "")))
+        leaves = calendar.tree[days:]
+        leaves[:] = np.array([units[key] for key in calendar.keys], dtype=FREE_DTYPE)
+
+        # Exceptions: a row with F free units replaces the default 1. One
+        # pass over the dict collects (room, day, change); the scatter-add
+        # into the leaves is a single bincount.
+        room_index, type_rows, total_rows = {}, [], []
+        for room in rooms.values():
+            if room["RoomStatus"] == "Available":
+                room_index[room["RoomID"]] = len(type_rows)
+                type_rows.append(calendar.row[(room["HotelID"], room["RoomType"])])
+                total_rows.append(calendar.row[(room["HotelID"], ALL_TYPES)])
+        day_of = {start_date + timedelta(days=d): d for d in range(days)}
+        room_at, day_at, change_at = [], [], []
+        for (room_id, night), (count, is_booked, _) in availability.items():
+            i, day = room_index.get(room_id), day_of.get(night)
+            change = (0 if is_booked else count) - 1
+            if i is None or day is None or not change:
+                continue
+            room_at.append(i)
+            day_at.append(day)
+            change_at.append(change)
+        if change_at:
+            width = len(calendar.keys)
+            room_at, day_at = np.array(room_at), np.array(day_at, dtype=np.int64) * width
+            cells = np.concatenate([day_at + np.array(type_rows)[room_at], day_at + np.array(total_rows)[room_at]])
+            weights = np.tile(np.array(change_at, dtype=np.float64), 2)
+            leaves += np.bincount(cells, weights=weights, minlength=days * width).reshape(days, width).astype(FREE_DTYPE)
+
+        calendar._rebuild()
+        return calendar
+
+    def _rebuild(self, rows=slice(None)):
+        """Recompute internal nodes from the leaves, one tree level per step"""
+        tree = self.tree
+        hi = self.days
+        while hi > 1:
+            # Nodes [lo, hi) only have children at >= hi, which are done
+            lo = (hi + 1) // 2
+            tree[lo:hi, rows] = np.minimum(tree[2 * lo:2 * hi:2, rows], tree[2 * lo + 1:2 * hi:2, rows])
+            hi = lo
+
+    def _day(self, night):
+        day = (night - self.start_date).days
+        if not 0 <= day < self.days:
+            raise ValueError(f"{night} is outside the calendar window")
+        return day
+
+    # --------------------------------------------------------
+    # Updates
+    # --------------------------------------------------------
+
+    def add(self, hotel_id, room_type, night, delta):
+        """
+        Shift the free count of one RoomType on one night by `delta`
+
+        Also shifts the hotel-wide row. Nights outside the window are
+        ignored. Returns False when the key is unknown (a room type the
+        calendar was not built with), in which case the caller rebuilds.
+        """
+        day = (night - self.start_date).days
+        if not delta or not 0 <= day < self.days:
+            return True
+        rows = [self.row.get((hotel_id, room_type)), self.row.get((hotel_id, ALL_TYPES))]
+        if None in rows:
+            return False
+        tree = self.tree
+        i = day + self.days
+        tree[i, rows] += delta
+        i //= 2
+        while i:
+            tree[i, rows] = np.minimum(tree[2 * i, rows], tree[2 * i + 1, rows])
+            i //= 2
+        return True
+
+    def reset_hotel(self, hotel_id, rooms, availability):
+        """
+        Rebuild one hotel's rows from its current rooms and calendar entries
+
+        `rooms` are the hotel's ROOM row dicts. Returns False when its set
+        of available room types changed, in which case the caller rebuilds
+        the whole calendar.
+        """
+        rooms = [room for room in rooms if room["RoomStatus"] == "Available"]
+        keys = {(hotel_id, room["RoomType"]) for room in rooms}
+        if rooms:
+            keys.add((hotel_id, ALL_TYPES))
+        rows = self._rows_by_hotel.get(hotel_id, [])
+        if keys != {self.keys[i] for i in rows}:
+            return False
+        if not rows:
+            return True
+
+        leaves = self.tree[self.days:]
+        leaves[:, rows] = 0
+        total = self.row[(hotel_id, ALL_TYPES)]
+        nights = [self.start_date + timedelta(days=d) for d in range(self.days)]
+        for room in rooms:
+            free = np.array([free_count(availability.get((room["RoomID"], night))) for night in nights],
+                            dtype=FREE_DTYPE)
+            leaves[:, self.row[(hotel_id, room["RoomType"])]] += free
+            leaves[:, total] += free
+        self._rebuild(rows)
+        return True
+
+    # --------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------
+
+    def _range_min(self, start_date, end_date, rows=slice(None)):
+        lo, hi = self._day(start_date), self._day(end_date - timedelta(days=1)) + 1
+        tree = self.tree
+        result = np.full(len(self.keys) if isinstance(rows, slice) else len(rows), NO_ROOMS, dtype=FREE_DTYPE)
+        lo += self.days
+        hi += self.days
+        while lo < hi:
+            if lo & 1:
+                np.minimum(result, tree[lo, rows], out=result)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                np.minimum(result, tree[hi, rows], out=result)
+            lo //= 2
+            hi //= 2
+        return result
+
+    def min_free(self, start_date, end_date, room_type=ALL_TYPES):
+        """
+        {HotelID: fewest free units on any night of [start_date, end_date)}
+
+        Hotel-wide by default; pass a RoomType for that type only (hotels
+        without it are left out).
+        """
+        if end_date <= start_date:
+            raise ValueError("Check-out date must be after check-in date")
+        if room_type is ALL_TYPES:
+            hotel_ids, rows = self._total_hotels, self._total_rows
+        else:
+            keyed = [(key[0], i) for key, i in self.row.items() if key[1] == room_type]
+            hotel_ids = [hotel_id for hotel_id, _ in keyed]
+            rows = [i for _, i in keyed]
+        if len(rows) == 0:
+            return {}
+        return dict(zip(np.asarray(hotel_ids).tolist(), self._range_min(start_date, end_date, rows).tolist()))
+
+    def room_types(self, hotel_id, start_date, end_date):
+        """{RoomType: fewest free units on any night of the stay} for one hotel"""
+        rows = [i for i in self._rows_by_hotel.get(hotel_id, []) if self.keys[i][1] is not ALL_TYPES]
+        if not rows:
+            return {}
+        return dict(zip((self.keys[i][1] for i in rows), self._range_min(start_date, end_date, rows).tolist()))
+
+    def hotels_with(self, rooms_needed, start_date, end_date, room_type=ALL_TYPES):
+        """HotelIDs that have `rooms_needed` units free on every night of the stay"""
+        return {hotel_id for hotel_id, free in self.min_free(start_date, end_date, room_type).items()
+                if free >= rooms_needed}
+
+    def stats(self):
+        return {"rows": len(self.keys), "days": self.days, "bytes": self.tree.nbytes}
@@ -0,0 +1,4 @@
+"""
+Wedding Destination Hotel Finder - Benchmarks
+Run from the repository root, e.g. `python -m benchmarks.bench_search_query`
+"""
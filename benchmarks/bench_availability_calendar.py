@@ -0,0 +1,113 @@
+"""
+Room block search in memory: per-night scan over AVAILABILITY vs the calendar
+
+Generates a synthetic catalog (10k hotels by default) with a booked-up
+AVAILABILITY calendar and times "which hotels have N rooms free on every
+night of the stay" both ways, plus the cost of applying one booking to
+the calendar. No database needed.
+
+    python -m benchmarks.bench_availability_calendar [--hotels 10000] [--repeat 10]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from availability_calendar import AvailabilityCalendar, free_count
+from benchmarks.common import ROOM_TYPES
+
+SCENARIOS = [
+    # (label, nights, rooms needed)
+    ("weekend, 20 rooms", 3, 20),
+    ("week, 40 rooms", 7, 40),
+    ("two weeks, 10 rooms", 14, 10),
+]
+
+
+def synthetic_calendar(hotels, rooms_per_hotel, days, booked_share, seed=2025):
+    """(rooms, availability) shaped like HotelCatalog.rooms / .availability"""
+    rng = random.Random(seed)
+    start = date.today()
+    rooms, availability = {}, {}
+    room_id = 0
+    for hotel_id in range(1, hotels + 1):
+        for _ in range(rooms_per_hotel):
+            room_id += 1
+            rooms[room_id] = {"RoomID": room_id, "HotelID": hotel_id,
+                              "RoomType": rng.choice(ROOM_TYPES)[0], "RoomStatus": "Available"}
+            for day in rng.sample(range(days), int(days * booked_share)):
+                availability[(room_id, start + timedelta(days=day))] = (0, True, None)
+    return start, rooms, availability
+
+
+def scan_search(rooms_by_hotel, availability, start_date, end_date, rooms_needed):
+    """The pre-calendar path: sum free rooms per night, hotel by hotel"""
+    nights = [start_date + timedelta(days=i) for i in range((end_date - start_date).days)]
+    found = set()
+    for hotel_id, room_ids in rooms_by_hotel.items():
+        if all(sum(free_count(availability.get((room_id, night))) for room_id in room_ids) >= rooms_needed
+               for night in nights):
+            found.add(hotel_id)
+    return found
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=10_000)
+    parser.add_argument("--rooms-per-hotel", type=int, default=50)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--booked-share", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    start, rooms, availability = synthetic_calendar(args.hotels, args.rooms_per_hotel, args.days, args.booked_share)
+    rooms_by_hotel = {}
+    for room in rooms.values():
+        rooms_by_hotel.setdefault(room["HotelID"], []).append(room["RoomID"])
+
+    started = time.perf_counter()
+    calendar = AvailabilityCalendar.build(rooms, availability, start, args.days)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"built calendar over {args.hotels:,} hotels x {args.days} days in {build_ms:.0f} ms "
+          f"({calendar.tree.nbytes / 2**20:.0f} MiB)")
+
+    report = {"build_ms": round(build_ms, 1), "calendar": calendar.stats(), "scenarios": []}
+    for label, nights, rooms_needed in SCENARIOS:
+        check_in = start + timedelta(days=30)
+        check_out = check_in + timedelta(days=nights)
+        expected, before = timed(lambda: scan_search(rooms_by_hotel, availability, check_in, check_out, rooms_needed),
+                                 max(1, args.repeat // 5))
+        found, after = timed(lambda: calendar.hotels_with(rooms_needed, check_in, check_out), args.repeat)
+        assert found == expected, f"{label}: calendar returned different hotels"
+        report["scenarios"].append({"scenario": label, "hotels": len(found), "before": before, "after": after})
+        print(f"{label:>20}: median {before['median_ms']:>9.2f} ms -> {after['median_ms']:>7.3f} ms")
+
+    # One booking: a room block taken for a week at a random hotel
+    rng = random.Random(7)
+    samples = []
+    for _ in range(200):
+        room = rooms[rng.randint(1, len(rooms))]
+        night = start + timedelta(days=rng.randrange(args.days))
+        started = time.perf_counter()
+        calendar.add(room["HotelID"], room["RoomType"], night, -1)
+        samples.append((time.perf_counter() - started) * 1e6)
+    report["update_median_us"] = round(statistics.median(samples), 1)
+    print(f"incremental update: median {report['update_median_us']} us per room-night")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Booking write path under contention: many concurrent bookers, one hot hotel
+
+Loads WBNB_combined_mysql.sql into a scratch database, adds one synthetic
+hotel and lets `--workers` threads book 1..`--max-rooms` rooms for the same
+stay until it sells out. Reports throughput, latency, lock retries and
+checks that no room-night was oversold and that double submits with the
+same idempotency key produced one booking.
+
+    MYSQL_HOST=localhost MYSQL_USER=root MYSQL_PASSWORD=... \
+        python -m benchmarks.bench_booking_contention [--workers 32] [--rooms 200]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+
+from benchmarks.common import bench_connection_settings, connect, load_schema, percentile, populate
+from booking_service import BookingService, Guest, SoldOutError
+from db_pool import ConnectionPool
+
+
+def available_units(connection, hotel_id):
+    """Room units of a freshly populated hotel: no calendar rows, so 1 per Available room"""
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM ROOM WHERE HotelID = %s AND RoomStatus = 'Available'", (hotel_id,))
+    (units,) = cursor.fetchone()
+    cursor.close()
+    return units
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--rooms", type=int, default=200, help="ROOM rows in the hot hotel")
+    parser.add_argument("--max-rooms", type=int, default=3, help="rooms per booking (1..N)")
+    parser.add_argument("--nights", type=int, default=3)
+    parser.add_argument("--double-submit", type=float, default=0.2,
+                        help="share of bookings submitted twice concurrently with the same key")
+    args = parser.parse_args()
+
+    connection = connect()
+    load_schema(connection)
+    (hotel_id,) = populate(connection, 1, rooms_per_hotel=args.rooms)
+    check_in = date.today() + timedelta(days=30)
+    check_out = check_in + timedelta(days=args.nights)
+    inventory = available_units(connection, hotel_id)
+
+    pool = ConnectionPool(bench_connection_settings(), size=args.workers * 2, checkout_timeout=30)
+    service = BookingService(pool)
+    lock = threading.Lock()
+    latencies, outcomes = [], {"booked": 0, "sold_out": 0, "replayed": 0, "errors": 0}
+    sold_out = threading.Event()
+
+    def submit(key, rooms, guest):
+        started = time.perf_counter()
+        try:
+            result = service.book(key, hotel_id, check_in, check_out, rooms, guest, num_guests=rooms * 2)
+            outcome = "replayed" if result.replayed else "booked"
+        except SoldOutError:
+            outcome = "sold_out"
+        except Exception:
+            outcome = "errors"
+        with lock:
+            latencies.append((time.perf_counter() - started) * 1000)
+            outcomes[outcome] += 1
+        return outcome
+
+    def worker(n):
+        rng = random.Random(n)
+        guest = Guest(f"Bench{n}", "Booker", f"booker{n}@example.com", "5550000000", "Wedding Planner")
+        while not sold_out.is_set():
+            key = uuid.uuid4().hex
+            rooms = rng.randint(1, args.max_rooms)
+            if rng.random() < args.double_submit:
+                twin = threading.Thread(target=submit, args=(key, rooms, guest))
+                twin.start()
+                submit(key, rooms, guest)
+                twin.join()
+            elif submit(key, rooms, guest) == "sold_out" and rooms == 1:
+                sold_out.set()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    connection.commit()  # drop the pre-run snapshot before reading the results
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT COALESCE(SUM(b.NumberOfRooms), 0), COUNT(DISTINCT b.ConfirmationNumber) "
+        "FROM BOOKING b JOIN ROOM r ON r.RoomID = b.RoomID "
+        "WHERE r.HotelID = %s AND b.CheckInDate = %s",
+        (hotel_id, check_in)
+    )
+    booked_units, confirmations = cursor.fetchone()
+    cursor.execute(
+        "SELECT COUNT(*) FROM AVAILABILITY av JOIN ROOM r ON r.RoomID = av.RoomID "
+        "WHERE r.HotelID = %s AND av.AvailableRoomsCount < 0",
+        (hotel_id,)
+    )
+    (negative_rows,) = cursor.fetchone()
+    cursor.close()
+
+    report = {
+        "workers": args.workers,
+        "inventory_units": inventory,
+        "booked_units": int(booked_units),
+        "oversold": int(booked_units) > inventory or negative_rows > 0,
+        "confirmations": confirmations,
+        "outcomes": outcomes,
+        "double_booked": confirmations != outcomes["booked"],
+        "bookings_per_second": round(outcomes["booked"] / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "service": service.stats(),
+        "pool": pool.stats(),
+    }
+    print(json.dumps(report, indent=2, default=str))
+    pool.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Capacity planning: cheapest room mix for a wedding party across a search
+
+Generates synthetic room inventories (1,000 hotels by default) and times
+CapacityPlanner.plan_many() per guest count, cold (every table solved)
+and warm (tables cached by an earlier, larger search). A sample of plans
+is checked against a per-hotel Python DP. No database needed.
+
+    python -m benchmarks.bench_capacity_planner [--hotels 1000] [--repeat 7]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from benchmarks.common import ROOM_TYPES
+from capacity_planner import CapacityPlanner, RoomOption
+
+GUEST_COUNTS = [50, 150, 300, 500]
+
+
+def synthetic_inventories(count, seed=2025):
+    """{hotel_id: [RoomOption, ...]} with every ROOM_TYPES entry at a local price"""
+    rng = random.Random(seed)
+    return {
+        hotel_id: [RoomOption(room_type, capacity, rng.randint(0, 30), round(price * rng.uniform(0.8, 1.3), 2))
+                   for room_type, capacity, price in ROOM_TYPES]
+        for hotel_id in range(1, count + 1)
+    }
+
+
+def reference_cost(guests, options):
+    """Plain bounded-knapsack DP, one unit at a time"""
+    best = [0.0] + [float("inf")] * guests
+    for option in options:
+        for _ in range(option.units):
+            for seats in range(guests, 0, -1):
+                best[seats] = min(best[seats], best[max(0, seats - option.capacity)] + option.price)
+    return None if best[guests] == float("inf") else round(best[guests], 2)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, {"median_ms": round(statistics.median(samples), 2), "min_ms": round(min(samples), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--check", type=int, default=25, help="plans per guest count checked against the reference")
+    args = parser.parse_args()
+
+    inventories = synthetic_inventories(args.hotels)
+    rng = random.Random(7)
+    report = []
+    for guests in GUEST_COUNTS:
+        plans, cold = timed(lambda: CapacityPlanner().plan_many(guests, inventories), args.repeat)
+        warm_planner = CapacityPlanner()
+        warm_planner.plan_many(guests + 20, inventories)
+        _, warm = timed(lambda: warm_planner.plan_many(guests, inventories), args.repeat)
+
+        for hotel_id in rng.sample(sorted(inventories), min(args.check, len(inventories))):
+            plan = plans[hotel_id]
+            expected = reference_cost(guests, inventories[hotel_id])
+            assert (plan.nightly_cost if plan else None) == expected, f"hotel {hotel_id}: {plan} != {expected}"
+
+        feasible = sum(plan is not None for plan in plans.values())
+        report.append({"guests": guests, "feasible_hotels": feasible, "cold": cold, "warm": warm})
+        print(f"{guests:>4} guests: cold {cold['median_ms']:>7.2f} ms, warm {warm['median_ms']:>6.2f} ms "
+              f"({feasible:,} of {args.hotels:,} hotels can seat everyone)")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Comparison chart cost: plotly.express per render vs cached figure JSON
+
+Builds the Details page's price and rating charts for `--sets` comparison
+sets of six venues: with plotly.express over a DataFrame (the old path,
+skipped when plotly/pandas are missing), cold through a ChartService, as
+cache hits, and with a new selected hotel on a cached base. No database
+needed.
+
+    python -m benchmarks.bench_comparison_charts [--sets 200]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from comparison_charts import ChartService, ComparisonSet
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def comparison_sets(count, size, seed=7):
+    rng = random.Random(seed)
+    sets = []
+    for n in range(count):
+        rows = [(n * size + i, f"Grand Venue {n}-{i}", round(rng.uniform(150, 900), 2),
+                 round(rng.uniform(3, 5), 1)) for i in range(size)]
+        sets.append(ComparisonSet.from_rows(rows))
+    return sets
+
+
+def express_loop(sets):
+    """The old render: two px.bar figures from DataFrames, serialized"""
+    import pandas as pd
+    import plotly.express as px
+
+    def run():
+        for comparison in sets:
+            frame = pd.DataFrame({"Hotel": list(comparison.names), "Price": comparison.prices,
+                                  "Rating": comparison.ratings,
+                                  "Selected": comparison.hotel_ids == comparison.hotel_ids[0]})
+            for metric in ("Price", "Rating"):
+                px.bar(frame, x="Hotel", y=metric, color="Selected").to_json()
+    return run
+
+
+def service_loop(service, sets, pick=0):
+    def run():
+        for comparison in sets:
+            service.figures(comparison, int(comparison.hotel_ids[pick]))
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sets", type=int, default=200)
+    parser.add_argument("--size", type=int, default=6, help="venues per comparison")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sets = comparison_sets(args.sets, args.size)
+    report = {"sets": args.sets, "size": args.size, "modes": []}
+
+    def record(label, timing):
+        per_set_us = timing["median_ms"] * 1000 / args.sets
+        report["modes"].append(dict(timing, mode=label, per_set_us=round(per_set_us, 1)))
+        print(f"{label:>22}: median {timing['median_ms']:>9.2f} ms, {per_set_us:>9.1f} us per set")
+
+    try:
+        _, timing = timed(express_loop(sets), args.repeat)
+        record("plotly.express", timing)
+    except ImportError as exc:
+        print(f"plotly.express: skipped ({exc})")
+
+    cold = []
+    for _ in range(args.repeat):
+        service = ChartService()
+        _, timing = timed(service_loop(service, sets), 1)
+        cold.append(timing["median_ms"])
+    record("service, cold", {"median_ms": round(statistics.median(cold), 3), "min_ms": round(min(cold), 3)})
+
+    _, timing = timed(service_loop(service, sets), args.repeat)
+    record("service, cache hit", timing)
+
+    highlights = []
+    for pick in range(1, min(args.size, args.repeat + 1)):
+        _, timing = timed(service_loop(service, sets, pick), 1)
+        highlights.append(timing["median_ms"])
+    record("service, new highlight", {"median_ms": round(statistics.median(highlights), 3),
+                                      "min_ms": round(min(highlights), 3)})
+
+    figure = service.figures(sets[0], int(sets[0].hotel_ids[0]))
+    report["figure_bytes"] = {metric: len(text) for metric, text in figure.items()}
+    report["service"] = service.stats()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
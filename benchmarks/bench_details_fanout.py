@@ -0,0 +1,99 @@
+"""
+Details page data: the three page queries one after another vs fanned out
+
+Loads WBNB_combined_mysql.sql into a scratch database, scales it to
+`--hotels` hotels and times hotel_details.detail_calls() per hotel run
+sequentially on one connection and concurrently through QueryExecutor.
+The concurrent time should track the slowest single query, not the sum.
+
+    MYSQL_HOST=localhost MYSQL_USER=root MYSQL_PASSWORD=... \
+        python -m benchmarks.bench_details_fanout [--hotels 10000] [--samples 200]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from async_queries import QueryExecutor
+from benchmarks.common import bench_connection_settings, connect, load_schema, populate
+from db_pool import ConnectionPool
+from hotel_details import detail_calls
+from hotel_records import hotels_from_cursor
+from search_summary import SearchSummaryRefresher
+
+
+def median_ms(samples):
+    return round(statistics.median(samples) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=10_000)
+    parser.add_argument("--rooms-per-hotel", type=int, default=50)
+    parser.add_argument("--availability-days", type=int, default=60)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--skip-load", action="store_true", help="reuse an already populated database")
+    args = parser.parse_args()
+
+    connection = connect()
+    if not args.skip_load:
+        load_schema(connection)
+        populate(connection, args.hotels, rooms_per_hotel=args.rooms_per_hotel,
+                 availability_days=args.availability_days)
+    cursor = connection.cursor()
+    cursor.execute("""
+        SELECT h.HotelID, h.State, COALESCE(AVG(r.BasePrice), 300) AS price_per_night
+        FROM HOTEL h LEFT JOIN ROOM r ON r.HotelID = h.HotelID
+        GROUP BY h.HotelID, h.State
+    """)
+    hotels = hotels_from_cursor(cursor)
+    cursor.close()
+
+    pool = ConnectionPool(bench_connection_settings(), size=8)
+    SearchSummaryRefresher(pool, batch_size=2000).refresh(full=True)
+    executor = QueryExecutor(pool, max_workers=4, default_timeout=30)
+
+    rng = random.Random(2025)
+    check_in = date.today() + timedelta(days=14)
+    check_out = check_in + timedelta(days=3)
+    sequential, concurrent, slowest = [], [], []
+    per_query = {}
+    for hotel in rng.sample(hotels, min(args.samples, len(hotels))):
+        calls = detail_calls(hotel, check_in, check_out)
+
+        with pool.connection() as conn:
+            started = time.perf_counter()
+            longest = 0.0
+            for name, call in calls.items():
+                query_started = time.perf_counter()
+                call.fn(conn, *call.args)
+                elapsed = time.perf_counter() - query_started
+                per_query.setdefault(name, []).append(elapsed)
+                longest = max(longest, elapsed)
+            sequential.append(time.perf_counter() - started)
+            slowest.append(longest)
+
+        started = time.perf_counter()
+        executor.gather(calls)
+        concurrent.append(time.perf_counter() - started)
+
+    report = {
+        "samples": len(sequential),
+        "sequential_median_ms": median_ms(sequential),
+        "concurrent_median_ms": median_ms(concurrent),
+        "slowest_query_median_ms": median_ms(slowest),
+        "per_query_median_ms": {name: median_ms(samples) for name, samples in per_query.items()},
+        "executor": executor.stats(),
+        "pool": pool.stats(),
+    }
+    print(json.dumps(report, indent=2, default=str))
+    executor.shutdown()
+    pool.close()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Cold-start import cost of the app against a time budget, and whether the deferred stacks stay unloaded
+
+Runs the app's module-level imports in fresh interpreters under
+`python -X importtime` and reports the median total, the slowest
+top-level imports, and which of the deferred stacks (pandas, plotly) got
+loaded and through which import. Exits 1 when the median total is over
+`--budget-ms` or a deferred stack is loaded at import. No database needed.
+
+    python -m benchmarks.bench_import_time [--budget-ms 1500] [--repeat 5]
+"""
+
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.common import REPO_ROOT
+
+APP_FILE = REPO_ROOT / "wedding_hotel_finder_redesigned.py"
+IMPORT_BUDGET_MS = 1500
+DEFERRED = ("pandas", "plotly")  # loaded on first table / chart, never at import
+
+
+def module_imports(path):
+    """Source of the module-level import statements of a script"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def parse_importtime(stderr):
+    """[(depth, name, cumulative ms)] from -X importtime output, in print order (children first)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1000))
+    return entries
+
+
+def loaded_via(entries, stack):
+    """Top-level imports under which a module of `stack` was first loaded"""
+    via = []
+    for i, (depth, name, _) in enumerate(entries):
+        if name.split(".")[0] != stack:
+            continue
+        # Parents print after their children: the next shallower top-level line
+        parent = next((n for d, n, _ in entries[i:] if d == 0), name)
+        if parent not in via:
+            via.append(parent)
+    return via
+
+
+def measure(code):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode:
+        raise SystemExit(f"import failed:\n{result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", default=str(APP_FILE), help="script whose imports are timed")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    code = module_imports(Path(args.app))
+    startup = {name for depth, name, _ in measure("pass") if depth == 0}  # the interpreter's own
+    runs = [[entry for entry in measure(code) if not (entry[0] == 0 and entry[1] in startup)]
+            for _ in range(args.repeat)]
+    totals = [sum(ms for depth, _, ms in entries if depth == 0) for entries in runs]
+    median_run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+
+    slowest = sorted(((name, ms) for depth, name, ms in median_run if depth == 0), key=lambda item: -item[1])[:10]
+    deferred = {stack: loaded_via(median_run, stack) for stack in DEFERRED}
+    total = statistics.median(totals)
+    over_budget = total > args.budget_ms
+    eager = {stack: via for stack, via in deferred.items() if via}
+
+    for name, ms in slowest:
+        print(f"{name:>32}: {ms:>8.1f} ms")
+    print(f"total median {total:.1f} ms (budget {args.budget_ms:.0f} ms)"
+          + "".join(f" | {stack} loaded via {', '.join(via)}" for stack, via in eager.items()))
+
+    print(json.dumps({
+        "app": Path(args.app).name, "runs": args.repeat, "total_median_ms": round(total, 1),
+        "total_min_ms": round(min(totals), 1), "budget_ms": args.budget_ms, "over_budget": over_budget,
+        "slowest": [{"module": name, "cumulative_ms": round(ms, 1)} for name, ms in slowest],
+        "deferred_loaded_via": deferred,
+    }, indent=2))
+    if over_budget or eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
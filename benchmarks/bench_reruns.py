@@ -0,0 +1,157 @@
+"""
+Rerun cost per interaction: what each click or widget change re-executes, and how long it takes
+
+Drives the app with Streamlit's AppTest through one visit: Home, a search,
+then on Results a sort change, List view and loading more venues, Grid
+view and its next cards, a hotel's Details and a room count change on
+Booking. Telemetry is exported to a
+scratch OTLP/JSON file, so for every interaction the report lists the
+wall time and the root spans it ran: `page.<Page>` for a full script run,
+`fragment.<name>` for a fragment-only rerun. Loads WBNB_combined_mysql.sql
+into a scratch database first (`--skip-load` to reuse one).
+
+    MYSQL_HOST=localhost MYSQL_USER=root MYSQL_PASSWORD=... \\
+        python -m benchmarks.bench_reruns [--hotels 1000] [--repeat 5]
+
+With `--spans FILE` it only summarizes an OTLP/JSON file the running app
+exported (secrets `telemetry_export = "spans.jsonl"`): runs, p50 and p95
+per root span, i.e. per page load and per fragment rerun in real use.
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import REPO_ROOT, bench_connection_settings, connect, load_schema, percentile, populate
+
+APP_FILE = REPO_ROOT / "wedding_hotel_finder_redesigned.py"
+EXPORT_INTERVAL = 0.05  # seconds; telemetry_export_seconds for the app under test
+
+
+def root_spans(lines):
+    """(name, duration ms) of every root span in OTLP/JSON export lines"""
+    spans = []
+    for line in lines:
+        if not line.strip():
+            continue
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                for span in scope["spans"]:
+                    if "parentSpanId" not in span:
+                        duration = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+                        spans.append((span["name"], duration))
+    return spans
+
+
+def summarize_spans(path):
+    """Runs, p50 and p95 ms per root span name in an exported file"""
+    by_name = {}
+    for name, duration in root_spans(Path(path).read_text(encoding="utf-8").splitlines()):
+        by_name.setdefault(name, []).append(duration)
+    return {
+        name: {"runs": len(durations), "p50_ms": round(percentile(durations, 50), 1),
+               "p95_ms": round(percentile(durations, 95), 1)}
+        for name, durations in sorted(by_name.items(), key=lambda item: -len(item[1]))
+    }
+
+
+# ============================================================
+# SCRIPTED VISIT
+# ============================================================
+
+def _labelled(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+# One visit, as (label, fn(at) -> element to run)
+VISIT = [
+    ("load Home", lambda at: at),
+    ("open Search", lambda at: _labelled(at.sidebar.button, "🔍 Search Hotels").click()),
+    ("run search", lambda at: _labelled(at.main.button, "🔍 Search Hotels").click()),
+    ("Results: sort by price", lambda at: _labelled(at.selectbox, "Sort by").select("Lowest Price")),
+    ("Results: list view", lambda at: _labelled(at.radio, "View").set_value("List")),
+    ("Results: load more", lambda at: next(b for b in at.main.button if b.label.startswith("Load ")).click()),
+    ("Results: grid view", lambda at: _labelled(at.radio, "View").set_value("Grid")),
+    ("Results: next cards", lambda at: _labelled(at.main.button, "Next →").click()),
+    ("open Details", lambda at: _labelled(at.selectbox, "🔎 View details for").select_index(1)),
+    ("open Booking", lambda at: _labelled(at.sidebar.button, "✓ Book Now").click()),
+    ("Booking: one more room", lambda at: _labelled(at.number_input, "Number of Rooms").increment()),
+]
+
+
+def run_visit(at, spans_file, offset):
+    """Time each interaction; returns (results, new file offset)"""
+    results = []
+    for label, interact in VISIT:
+        element = interact(at)
+        started = time.perf_counter()
+        element.run()
+        wall_ms = (time.perf_counter() - started) * 1000
+        if at.exception:
+            raise SystemExit(f"{label}: {at.exception[0].value}")
+        time.sleep(EXPORT_INTERVAL * 3)  # let the exporter write this run's spans
+        with open(spans_file, encoding="utf-8") as f:
+            f.seek(offset)
+            lines = f.read().splitlines()
+            offset = f.tell()
+        results.append((label, wall_ms, root_spans(lines)))
+    return results, offset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=1000)
+    parser.add_argument("--rooms-per-hotel", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5, help="visits; medians are reported")
+    parser.add_argument("--skip-load", action="store_true", help="reuse an already populated database")
+    parser.add_argument("--spans", help="only summarize this OTLP/JSON file exported by the app")
+    args = parser.parse_args()
+
+    if args.spans:
+        print(json.dumps(summarize_spans(args.spans), indent=2))
+        return
+
+    from streamlit.testing.v1 import AppTest
+
+    connection = connect()
+    if not args.skip_load:
+        load_schema(connection)
+        populate(connection, args.hotels, rooms_per_hotel=args.rooms_per_hotel)
+    connection.close()
+
+    settings = bench_connection_settings()
+    spans_file = Path(tempfile.mkdtemp()) / "spans.jsonl"
+    spans_file.touch()
+    offset = 0
+    by_interaction = {}
+    for _ in range(args.repeat):
+        at = AppTest.from_file(str(APP_FILE), default_timeout=60)
+        for key, value in settings.items():
+            at.secrets[f"mysql_{key}"] = value
+        at.secrets["telemetry_export"] = str(spans_file)
+        at.secrets["telemetry_export_seconds"] = EXPORT_INTERVAL
+        results, offset = run_visit(at, spans_file, offset)
+        for label, wall_ms, spans in results:
+            entry = by_interaction.setdefault(label, {"wall_ms": [], "spans": {}})
+            entry["wall_ms"].append(wall_ms)
+            for name, duration in spans:
+                entry["spans"].setdefault(name, []).append(duration)
+
+    report = []
+    for label, entry in by_interaction.items():
+        spans = {name: {"runs_per_interaction": round(len(durations) / args.repeat, 2),
+                        "median_ms": round(statistics.median(durations), 1)}
+                 for name, durations in entry["spans"].items()}
+        report.append({"interaction": label, "wall_median_ms": round(statistics.median(entry["wall_ms"]), 1),
+                       "root_spans": spans})
+        print(f"{label:>24}: {statistics.median(entry['wall_ms']):>8.1f} ms | " + ", ".join(
+            f"{name} {span['median_ms']} ms" for name, span in spans.items()))
+
+    print(json.dumps({"visits": args.repeat, "hotels": args.hotels, "interactions": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
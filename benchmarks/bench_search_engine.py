@@ -0,0 +1,120 @@
+"""
+Hotel search in memory: list comprehension over dicts vs the columnar engine
+
+Generates a synthetic catalog (100k hotels by default) and times filter +
+rank + first page for both paths. No database needed.
+
+    python -m benchmarks.bench_search_engine [--hotels 100000] [--repeat 20]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from benchmarks.common import AMENITY_COUNT, CITIES
+from location_index import LocationIndex
+from search_engine import ColumnarHotelIndex
+
+SCENARIOS = [
+    # (label, location, max price, min rating, required amenity ids, sort)
+    ("all, best match", None, None, None, (), "Best Match"),
+    ("CA, budget + rating", "CA", 800, 4.0, (), "Highest Rated"),
+    ("Maui, amenities", "Maui", None, None, (1, 4), "Lowest Price"),
+]
+
+
+def synthetic_records(count, seed=2025):
+    rng = random.Random(seed)
+    records = []
+    for hotel_id in range(1, count + 1):
+        city, state = rng.choice(CITIES)
+        records.append({
+            "hotel_id": hotel_id,
+            "city": city,
+            "state": state,
+            "price": round(rng.uniform(150, 1500), 2),
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "star_rating": rng.randint(3, 5),
+            "total_rooms": rng.randint(20, 500),
+            "capacity": rng.randint(40, 1200),
+            "amenity_ids": set(rng.sample(range(1, AMENITY_COUNT + 1), 10)),
+        })
+    return records
+
+
+def best_match(record):
+    price = min(record["price"], 2000)
+    return 0.5 * record["rating"] / 5 + 0.2 * record["star_rating"] / 5 + 0.3 * (1 - price / 2000)
+
+
+DICT_SORT_KEYS = {
+    "Best Match": (best_match, True),
+    "Highest Rated": (lambda r: r["rating"], True),
+    "Lowest Price": (lambda r: r["price"], False),
+}
+
+
+def dict_search(records, location, max_price, min_rating, amenities, sort_by, limit):
+    """The pre-engine path: list comprehension filter, then a Python sort"""
+    states = set(location.states) if location else set()
+    cities = set(location.cities) if location else set()
+    required = set(amenities)
+    rows = [
+        r for r in records
+        if (not location or r["state"] in states or (r["city"], r["state"]) in cities)
+        and (not max_price or r["price"] <= max_price)
+        and (not min_rating or r["rating"] >= min_rating)
+        and required <= r["amenity_ids"]
+    ]
+    key, descending = DICT_SORT_KEYS[sort_by]
+    rows.sort(key=lambda r: (key(r), r["hotel_id"]), reverse=descending)
+    return [r["hotel_id"] for r in rows[:limit]]
+
+
+def engine_search(index, location, max_price, min_rating, amenities, sort_by, limit):
+    mask = index.filter_mask(location=location, max_price=max_price,
+                             min_rating=min_rating, amenities_all=amenities)
+    positions, _ = index.search(sort_by, mask=mask, limit=limit)
+    return index.hotel_id[positions].tolist()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.hotels)
+    start = time.perf_counter()
+    index = ColumnarHotelIndex(records)
+    build_ms = (time.perf_counter() - start) * 1000
+    locations = LocationIndex(CITIES)
+    print(f"built columnar index over {args.hotels:,} hotels in {build_ms:.0f} ms")
+
+    report = []
+    for label, location_text, max_price, min_rating, amenities, sort_by in SCENARIOS:
+        location = locations.resolve(location_text) if location_text else None
+        query = (location, max_price, min_rating, amenities, sort_by, args.limit)
+        expected, before = timed(lambda: dict_search(records, *query), args.repeat)
+        found, after = timed(lambda: engine_search(index, *query), args.repeat)
+        assert found == expected, f"{label}: engine returned a different page"
+        report.append({"scenario": label, "before": before, "after": after})
+        print(f"{label:>22}: median {before['median_ms']:>8.2f} ms -> {after['median_ms']:>7.3f} ms")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Hotel search query: ROOM x HOTELAMENITIES fan-out vs derived tables vs HOTEL_SEARCH_SUMMARY
+
+Loads WBNB_combined_mysql.sql into a scratch database, scales it to
+10k hotels / 500k rooms, builds the search summary and compares rows
+examined and latency.
+
+    MYSQL_HOST=localhost MYSQL_USER=root MYSQL_PASSWORD=... \
+        python -m benchmarks.bench_search_query [--hotels 10000] [--rooms-per-hotel 50]
+"""
+
+import argparse
+import json
+
+from benchmarks.common import bench_connection_settings, connect, load_schema, measure_query, populate
+from db_pool import ConnectionPool
+from hotel_queries import build_hotel_search_query, build_summary_search_query
+from location_index import LocationIndex
+from search_summary import SearchSummaryRefresher
+
+# Search query as it shipped before the derived-table rewrite
+LEGACY_QUERY = """
+SELECT
+    h.HotelID, h.HotelName as name, h.City, h.State,
+    CONCAT(h.City, ', ', h.State) as location,
+    h.AverageRating as rating, h.PhoneNumber as phone, h.Email as email,
+    h.Website as website, h.StreetAddress as address, h.Description,
+    COALESCE(AVG(r.BasePrice), 300) as price_per_night,
+    COALESCE(COUNT(DISTINCT r.RoomID), 0) as rooms,
+    GROUP_CONCAT(DISTINCT a.AmenityName SEPARATOR ', ') as amenities,
+    h.StarRating, h.TotalRooms
+FROM HOTEL h
+LEFT JOIN ROOM r ON h.HotelID = r.HotelID AND r.RoomStatus = 'Available'
+LEFT JOIN HOTELAMENITIES ha ON h.HotelID = ha.HotelID
+LEFT JOIN AMENITIES a ON ha.AmenityID = a.AmenityID
+WHERE 1=1 {location}
+GROUP BY h.HotelID, h.HotelName, h.City, h.State,
+         h.PhoneNumber, h.Email, h.Website, h.StreetAddress,
+         h.AverageRating, h.StarRating, h.Description, h.TotalRooms
+HAVING COALESCE(AVG(r.BasePrice), 300) <= %s AND h.AverageRating >= %s
+ORDER BY h.AverageRating DESC, h.StarRating DESC LIMIT 100
+"""
+
+SCENARIOS = [
+    ("all locations", None),
+    ("state = CA", "CA"),
+    ("city = Maui", "Maui"),
+]
+
+
+def legacy_query(location_filter, budget, min_rating):
+    params = []
+    location = ""
+    if location_filter:
+        location = "AND (LOWER(h.City) LIKE %s OR LOWER(h.State) = %s)"
+        params.extend([f"%{location_filter.lower()}%", location_filter.lower()])
+    return LEGACY_QUERY.format(location=location), params + [budget, min_rating]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=10_000)
+    parser.add_argument("--rooms-per-hotel", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=800)
+    parser.add_argument("--min-rating", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-load", action="store_true", help="reuse an already populated database")
+    args = parser.parse_args()
+
+    connection = connect()
+    if not args.skip_load:
+        load_schema(connection)
+        populate(connection, args.hotels, rooms_per_hotel=args.rooms_per_hotel)
+        cursor = connection.cursor()
+        cursor.execute("ANALYZE TABLE HOTEL, ROOM, HOTELAMENITIES")
+        cursor.fetchall()
+        cursor.close()
+
+    pool = ConnectionPool(bench_connection_settings(), size=1)
+    refresher = SearchSummaryRefresher(pool, batch_size=2000)
+    refresher.refresh(full=True)
+    pool.close()
+
+    locations = LocationIndex.from_connection(connection)
+    report = [{"summary_rebuild": refresher.stats()}]
+    for label, location in SCENARIOS:
+        before = measure_query(connection, *legacy_query(location, args.budget, args.min_rating), repeat=args.repeat)
+        match = locations.resolve(location) if location else None
+        query, params = build_hotel_search_query(match, args.budget, args.min_rating)
+        after = measure_query(connection, query, params, repeat=args.repeat)
+        query, params = build_summary_search_query(match, args.budget, args.min_rating)
+        summary = measure_query(connection, query, params, repeat=args.repeat)
+        report.append({"scenario": label, "before": before, "after": after, "summary": summary})
+        print(f"{label:>16}: rows examined {before['rows_examined']:>10,} -> {after['rows_examined']:>10,} "
+              f"-> {summary['rows_examined']:>8,} | median {before['median_ms']:>9.1f} ms -> "
+              f"{after['median_ms']:>9.1f} ms -> {summary['median_ms']:>7.1f} ms")
+
+    print(json.dumps(report, indent=2))
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Session memory: Results pages held as dicts, as Hotel records, or as HotelIDs
+
+Simulates `--sessions` concurrent Streamlit sessions (1,000 by default),
+each holding one 100-hotel Results page from one of `--searches` distinct
+stays, and measures the memory kept across all sessions with tracemalloc
+for three layouts: a list of per-hotel dicts in every session (the old
+`search_results`), a list of Hotel records per session, and HotelIDs per
+session with the records in one shared HotelRecords store. Also times
+building a page of records from dict rows and from cursor tuples. No
+database needed.
+
+    python -m benchmarks.bench_session_memory [--sessions 1000] [--searches 50]
+"""
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks.common import CITIES
+from hotel_records import ROW_COLUMNS, Hotel, HotelRecords, row_mapper
+
+PAGE_SIZE = 100
+
+
+def search_rows(search, hotels, rng):
+    """One Results page of catalog-shaped rows; fresh objects, as a new query returns"""
+    rows = []
+    for hotel_id in rng.sample(range(1, hotels + 1), PAGE_SIZE):
+        city, state = CITIES[hotel_id % len(CITIES)]
+        rows.append({
+            "HotelID": hotel_id,
+            "name": f"Grand Venue {hotel_id}",
+            "City": city,
+            "State": state,
+            "location": f"{city}, {state}",
+            "rating": Decimal(f"{3 + hotel_id % 20 / 10:.1f}"),
+            "ReviewCount": hotel_id % 400,
+            "VerifiedAverageRating": Decimal(f"{3 + hotel_id % 17 / 10:.2f}"),
+            "phone": f"555-{hotel_id:07d}",
+            "email": f"events{hotel_id}@example.com",
+            "website": f"https://venue{hotel_id}.example.com",
+            "address": f"{hotel_id} Main Street",
+            "Description": f"Elegant ballroom and garden venue number {hotel_id} for weddings of every size",
+            "price_per_night": Decimal(200 + (hotel_id * 37 + search) % 600),
+            "rooms": 20 + hotel_id % 180,
+            "amenities": "WiFi, Pool, Spa, Ballroom, Catering, Garden, Bridal Suite",
+            "StarRating": 3 + hotel_id % 3,
+            "TotalRooms": 50 + hotel_id % 300,
+            "min_free_rooms": 5 + hotel_id % 40,
+            "room_plan": None,
+            "sort_key": float(hotel_id % 50),
+        })
+    return rows
+
+
+def as_dict(hotel):
+    """The per-hotel dict sessions held before Hotel records (every field, category included)"""
+    return dict(hotel._asdict(), category=hotel.category)
+
+
+def measure(build):
+    """(live bytes, built value) kept by build()"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--searches", type=int, default=50, help="distinct stays searched across sessions")
+    parser.add_argument("--hotels", type=int, default=10_000)
+    args = parser.parse_args()
+
+    start = date.today() + timedelta(days=180)
+    offer_keys = [(start + timedelta(days=7 * s), start + timedelta(days=7 * s + 3), 50, 1)
+                  for s in range(args.searches)]
+    session_search = [random.Random(i).randrange(args.searches) for i in range(args.sessions)]
+
+    def pages():
+        # Sessions on the same search see the same hotels, as fresh row objects
+        for search in session_search:
+            yield search, search_rows(search, args.hotels, random.Random(search))
+
+    def dicts_per_session():
+        return [[as_dict(Hotel.from_row(row)) for row in rows] for _, rows in pages()]
+
+    def records_per_session():
+        return [[Hotel.from_row(row) for row in rows] for _, rows in pages()]
+
+    def ids_with_shared_store():
+        store = HotelRecords()
+        sessions = [store.put(offer_keys[search], [Hotel.from_row(row) for row in rows])
+                    for search, rows in pages()]
+        return store, sessions
+
+    report = {"sessions": args.sessions, "distinct_searches": args.searches, "page_size": PAGE_SIZE,
+              "layouts": []}
+    for label, build in [("dicts per session", dicts_per_session),
+                         ("Hotel records per session", records_per_session),
+                         ("HotelIDs + shared store", ids_with_shared_store)]:
+        total, value = measure(build)
+        del value
+        per_session = total / args.sessions
+        report["layouts"].append({"layout": label, "total_mib": round(total / 2**20, 1),
+                                  "per_session_kib": round(per_session / 1024, 1)})
+        print(f"{label:>26}: {total / 2**20:>7.1f} MiB total, {per_session / 1024:>7.1f} KiB per session")
+
+    # Mapping cost for one page: dict rows vs tuple rows read by position
+    rows = search_rows(0, args.hotels, random.Random(7))
+    columns = list(rows[0])
+    tuples = [tuple(row[c] for c in columns) for row in rows]
+    mapper = row_mapper(columns)
+    assert [mapper(t) for t in tuples] == [Hotel.from_row(row) for row in rows]
+    timings = {}
+    for label, fn in [("from_row", lambda: [Hotel.from_row(row) for row in rows]),
+                      ("row_mapper", lambda: list(map(mapper, tuples)))]:
+        samples = []
+        for _ in range(50):
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1e6)
+        timings[label] = round(statistics.median(samples), 1)
+    report["map_page_us"] = timings
+    print(f"mapping {PAGE_SIZE} rows: " + ", ".join(f"{k} {v} us" for k, v in timings.items())
+          + f" ({len(ROW_COLUMNS)} columns)")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Similar venues: precomputed neighbour table vs live and brute-force search, across catalog sizes
+
+For each synthetic catalog size, times building the SimilarVenueIndex,
+top-k lookups from its table, live searches at an overridden price, the
+brute-force scan, and an incremental update after `--changes` hotels
+change versus a rebuild. Table and updated-table answers are checked
+against the brute-force path on `--validate` sampled hotels; any mismatch
+exits 1. No database needed.
+
+    python -m benchmarks.bench_similar_venues [--sizes 1000,10000,100000] [--k 5]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from benchmarks.bench_search_engine import synthetic_records
+from benchmarks.common import percentile
+from search_engine import ColumnarHotelIndex
+from similar_venues import SimilarVenueIndex
+
+
+def latencies_us(fn, hotel_ids):
+    samples = []
+    for hotel_id in hotel_ids:
+        start = time.perf_counter()
+        fn(hotel_id)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {"p50_us": round(percentile(samples, 50), 1), "p99_us": round(percentile(samples, 99), 1)}
+
+
+def changed_records(records, changes, seed=11):
+    """Copy of `records` with `changes` hotels repriced or moved, a few dropped and a few added"""
+    rng = random.Random(seed)
+    records = [dict(record) for record in records]
+    for record in rng.sample(records, changes):
+        record["price"] = round(rng.uniform(150, 1500), 2)
+    dropped = {record["hotel_id"] for record in rng.sample(records, max(changes // 10, 1))}
+    records = [record for record in records if record["hotel_id"] not in dropped]
+    next_id = max(record["hotel_id"] for record in records) + 1
+    records += [dict(rng.choice(records), hotel_id=next_id + i) for i in range(max(changes // 10, 1))]
+    return records
+
+
+def mismatches(index, hotel_ids, k):
+    return sum(index.neighbors(hotel_id, k) != index.exact_neighbors(hotel_id, k) for hotel_id in hotel_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated catalog sizes")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--changes", type=int, default=50, help="hotels changed before the incremental update")
+    parser.add_argument("--validate", type=int, default=200, help="hotels checked against brute force")
+    args = parser.parse_args()
+
+    report = {"k": args.k, "sizes": []}
+    failed = False
+    for size in [int(s) for s in args.sizes.split(",")]:
+        records = synthetic_records(size)
+        rng = random.Random(size)
+        sample = [rng.choice(records)["hotel_id"] for _ in range(args.lookups)]
+        columns = ColumnarHotelIndex(records)
+
+        start = time.perf_counter()
+        index = SimilarVenueIndex(columns)
+        build_s = time.perf_counter() - start
+
+        lookup = latencies_us(lambda hotel_id: index.neighbors(hotel_id, args.k), sample)
+        live = latencies_us(lambda hotel_id: index.neighbors(hotel_id, args.k, price=777), sample[:500])
+        brute = latencies_us(lambda hotel_id: index.exact_neighbors(hotel_id, args.k), sample[:100])
+
+        changed = ColumnarHotelIndex(changed_records(records, args.changes))
+        start = time.perf_counter()
+        updated = index.updated(changed)
+        update_s = time.perf_counter() - start
+        start = time.perf_counter()
+        SimilarVenueIndex(changed)
+        rebuild_s = time.perf_counter() - start
+
+        checked = sample[:args.validate]
+        wrong = mismatches(index, checked, args.k) + mismatches(
+            updated, [h for h in checked if updated.neighbors(h, 1)], args.k)
+        failed |= wrong > 0
+
+        entry = {"hotels": size, "build_s": round(build_s, 3), "lookup": lookup, "live_price_search": live,
+                 "brute_force": brute, "incremental_update_s": round(update_s, 4),
+                 "rebuild_s": round(rebuild_s, 3), "validated": len(checked), "mismatches": wrong}
+        report["sizes"].append(entry)
+        print(f"{size:>8} hotels: build {build_s:.2f} s | lookup p50 {lookup['p50_us']} us, "
+              f"p99 {lookup['p99_us']} us | live p50 {live['p50_us']} us | brute p50 {brute['p50_us']} us | "
+              f"update {update_s * 1000:.1f} ms vs rebuild {rebuild_s * 1000:.0f} ms | mismatches {wrong}")
+
+    print(json.dumps(report, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
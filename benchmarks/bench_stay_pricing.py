@@ -0,0 +1,118 @@
+"""
+Stay pricing: a Results page of stay totals, per-line Decimal loop vs price_stays()
+
+Generates synthetic rooms with PriceOverride-heavy calendars and times
+pricing one page of hotels (stay total for a room block, including the
+group discount, service fee and tax) both ways. Every quote is checked
+to the cent against the Decimal loop. No database needed.
+
+    python -m benchmarks.bench_stay_pricing [--hotels 50] [--repeat 20]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from benchmarks.common import ROOM_TYPES
+from stay_pricing import CENTS, SERVICE_FEE_RATE, TAX_RATE, group_discount_rate, price_stays
+
+SCENARIOS = [
+    # (label, nights, rooms per hotel)
+    ("weekend, 4 rooms", 3, 4),
+    ("week, 12 rooms", 7, 12),
+    ("two weeks, 25 rooms", 14, 25),
+]
+
+
+def synthetic_rooms(hotels, rooms_per_hotel, days, override_share, seed=2025):
+    """(rooms, calendar) shaped like price_stays() arguments"""
+    rng = random.Random(seed)
+    start = date.today()
+    rooms, calendar = [], {}
+    room_id = 0
+    for hotel_id in range(1, hotels + 1):
+        for _ in range(rooms_per_hotel):
+            room_id += 1
+            _, _, price = rng.choice(ROOM_TYPES)
+            base = Decimal(price) * Decimal(rng.randint(80, 130)) / 100
+            rooms.append((hotel_id, room_id, base.quantize(CENTS)))
+            for day in range(days):
+                roll = rng.random()
+                if roll < 0.1:
+                    calendar[(room_id, start + timedelta(days=day))] = (0, True, None)
+                elif roll < 0.1 + override_share:
+                    override = (base * Decimal(rng.randint(90, 160)) / 100).quantize(CENTS)
+                    calendar[(room_id, start + timedelta(days=day))] = (rng.randint(1, 3), False, override)
+    return start, rooms, calendar
+
+
+def _money(value):
+    return value.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def decimal_loop(rooms, check_in, check_out, calendar, num_rooms):
+    """Hotel by hotel, room by room, night by night in Decimal, as the booking is charged"""
+    nights = [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+    by_hotel = {}
+    for room in sorted(rooms, key=lambda room: (room[0], room[2], room[1])):
+        by_hotel.setdefault(room[0], []).append(room)
+    totals = {}
+    for hotel_id, hotel_rooms in by_hotel.items():
+        needed, total = num_rooms, Decimal(0)
+        rate = group_discount_rate(num_rooms)
+        for _, room_id, base_price in hotel_rooms:
+            if not needed:
+                break
+            entries = [calendar.get((room_id, night), (1, False, None)) for night in nights]
+            take = min(needed, min(0 if is_booked else count for count, is_booked, _ in entries))
+            if take <= 0:
+                continue
+            subtotal = _money(sum(base_price if override is None else override for _, _, override in entries) * take)
+            net = subtotal - _money(subtotal * rate / 100)
+            fee = _money(net * SERVICE_FEE_RATE)
+            total += net + fee + _money((net + fee) * TAX_RATE)
+            needed -= take
+        totals[hotel_id] = None if needed else total
+    return totals
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=50, help="hotels on one Results page")
+    parser.add_argument("--rooms-per-hotel", type=int, default=40)
+    parser.add_argument("--override-share", type=float, default=0.4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    start, rooms, calendar = synthetic_rooms(args.hotels, args.rooms_per_hotel, 30, args.override_share)
+    report = []
+    for label, nights, num_rooms in SCENARIOS:
+        check_in = start + timedelta(days=7)
+        check_out = check_in + timedelta(days=nights)
+        expected, before = timed(lambda: decimal_loop(rooms, check_in, check_out, calendar, num_rooms), args.repeat)
+        quotes, after = timed(lambda: price_stays(rooms, check_in, check_out, calendar, num_rooms), args.repeat)
+        got = {hotel_id: quote.total if quote else None for hotel_id, quote in quotes.items()}
+        assert got == expected, f"{label}: stay totals differ from the Decimal loop"
+        priced = sum(total is not None for total in got.values())
+        report.append({"scenario": label, "priced_hotels": priced, "before": before, "after": after})
+        print(f"{label:>20}: median {before['median_ms']:>8.2f} ms -> {after['median_ms']:>7.2f} ms "
+              f"({priced} of {args.hotels} hotels have the rooms)")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Tracing overhead: cost per span and counter with telemetry disabled and enabled
+
+Times `--spans` nested page/fetch spans with a counter each, bare and
+through a disabled and an enabled Tracer, then renders both export
+formats from the enabled run. No database needed.
+
+    python -m benchmarks.bench_tracing_overhead [--spans 100000]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from telemetry import Tracer
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def traced_loop(tracer, spans):
+    """What one script run does: a page span with a fetch span, rows and a cache counter inside"""
+    def run():
+        for i in range(spans // 2):
+            page = tracer.start_span("page.Results", root=True, page="Results").activate()
+            with tracer.span("fetch_hotels", sort_by="rating") as span:
+                span.set(source="catalog", rows=i % 50)
+            tracer.count("cache_requests", cache="hotel_catalog", result="hit")
+            page.end(interrupted=False)
+    return run
+
+
+def bare_loop(spans):
+    def run():
+        for i in range(spans // 2):
+            rows = i % 50
+        return rows
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--spans", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {"spans": args.spans, "modes": []}
+    enabled = Tracer(enabled=True, max_spans=args.spans)
+    for label, run in [("no tracing", bare_loop(args.spans)),
+                       ("tracer disabled", traced_loop(Tracer(enabled=False), args.spans)),
+                       ("tracer enabled", traced_loop(enabled, args.spans))]:
+        _, timing = timed(run, args.repeat)
+        per_span_ns = timing["median_ms"] * 1e6 / args.spans
+        report["modes"].append(dict(timing, mode=label, per_span_ns=round(per_span_ns)))
+        print(f"{label:>16}: median {timing['median_ms']:>8.2f} ms, {per_span_ns:>7.0f} ns per span")
+
+    text, render = timed(enabled.prometheus_text, 1)
+    payload, drain = timed(enabled.drain_otlp, 1)
+    report["export"] = {"prometheus_ms": render["median_ms"], "prometheus_bytes": len(text),
+                        "otlp_ms": drain["median_ms"],
+                        "otlp_spans": len(payload["resourceSpans"][0]["scopeSpans"][0]["spans"])}
+    print(f"export: prometheus {render['median_ms']} ms ({len(text)} bytes), "
+          f"otlp drain {drain['median_ms']} ms")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
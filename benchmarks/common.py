@@ -0,0 +1,195 @@
+"""
+Shared helpers for the benchmarks: connection settings, schema loading
+and synthetic data generation at 10k-100k hotel scale
+"""
+
+import os
+import random
+import time
+from pathlib import Path
+
+import mysql.connector
+
+from db_pool import connection_settings
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_FILE = REPO_ROOT / "WBNB_combined_mysql.sql"
+SOURCE_DATABASE = "5033_ali"
+
+CITIES = [
+    ("New York", "NY"), ("Washington", "DC"), ("Los Angeles", "CA"), ("San Francisco", "CA"),
+    ("San Diego", "CA"), ("Miami", "FL"), ("Orlando", "FL"), ("Chicago", "IL"),
+    ("Las Vegas", "NV"), ("Boston", "MA"), ("Seattle", "WA"), ("Denver", "CO"),
+    ("Aspen", "CO"), ("Phoenix", "AZ"), ("Scottsdale", "AZ"), ("New Orleans", "LA"),
+    ("Maui", "HI"), ("Honolulu", "HI"), ("Kauai", "HI"), ("Austin", "TX"),
+    ("Nashville", "TN"), ("Charleston", "SC"), ("Savannah", "GA"), ("Napa", "CA"),
+]
+ROOM_TYPES = [
+    ("Single", 1, 250), ("Double", 2, 400), ("Suite", 4, 650),
+    ("Deluxe", 2, 550), ("Presidential", 6, 1400),
+]
+AMENITY_COUNT = 20  # AMENITIES rows seeded by WBNB_combined_mysql.sql
+BATCH_SIZE = 5000
+
+
+def bench_connection_settings(database=None):
+    """connect() kwargs from MYSQL_HOST / MYSQL_USER / ... environment variables"""
+    settings = connection_settings({k.lower(): v for k, v in os.environ.items() if k.startswith("MYSQL_")})
+    settings["port"] = int(settings["port"])
+    settings["database"] = database or os.environ.get("WBNB_BENCH_DATABASE", "wbnb_bench")
+    return settings
+
+
+def connect(database=None):
+    """Open a benchmark connection, creating the scratch database if needed"""
+    settings = bench_connection_settings(database)
+    database = settings.pop("database")
+    connection = mysql.connector.connect(**settings)
+    cursor = connection.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}` DEFAULT CHARACTER SET utf8mb4")
+    cursor.execute(f"USE `{database}`")
+    cursor.close()
+    return connection
+
+
+def load_schema(connection, database=None):
+    """Load WBNB_combined_mysql.sql (schema + sample data) into the scratch database"""
+    database = database or bench_connection_settings()["database"]
+    script = SCHEMA_FILE.read_text(encoding="utf-8").replace(SOURCE_DATABASE, database)
+    cursor = connection.cursor()
+    for statement in script.split(";\n"):
+        lines = [line for line in statement.splitlines() if not line.strip().startswith("--")]
+        statement = "\n".join(lines).strip()
+        if statement:
+            cursor.execute(statement)
+    connection.commit()
+    cursor.close()
+
+
+def _batched(rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        yield rows[start:start + BATCH_SIZE]
+
+
+def populate(connection, hotels, rooms_per_hotel=50, amenities_per_hotel=10,
+             availability_days=0, seed=2025):
+    """
+    Add `hotels` synthetic hotels with rooms, amenities and (optionally)
+    `availability_days` of AVAILABILITY rows per room starting today
+    """
+    rng = random.Random(seed)
+    cursor = connection.cursor()
+    cursor.execute("SELECT COALESCE(MAX(HotelID), 0) FROM HOTEL")
+    first_id = cursor.fetchone()[0] + 1
+
+    hotel_rows = []
+    for i in range(hotels):
+        city, state = rng.choice(CITIES)
+        hotel_rows.append((
+            f"Synthetic Hotel {first_id + i}", f"{rng.randint(1, 9999)} Main St", city, state,
+            "00000", "USA", "5550000000", f"events{first_id + i}@example.com",
+            f"www.hotel{first_id + i}.example.com", "Synthetic benchmark venue",
+            round(rng.uniform(3.0, 5.0), 1), rng.randint(3, 5), rooms_per_hotel,
+        ))
+    for batch in _batched(hotel_rows):
+        cursor.executemany(
+            "INSERT INTO HOTEL (HotelName, StreetAddress, City, State, PostalCode, Country, "
+            "PhoneNumber, Email, Website, Description, AverageRating, StarRating, TotalRooms) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            batch,
+        )
+    connection.commit()
+
+    hotel_ids = range(first_id, first_id + hotels)
+    amenity_rows = [
+        (hotel_id, amenity_id)
+        for hotel_id in hotel_ids
+        for amenity_id in rng.sample(range(1, AMENITY_COUNT + 1), amenities_per_hotel)
+    ]
+    for batch in _batched(amenity_rows):
+        cursor.executemany("INSERT INTO HOTELAMENITIES (HotelID, AmenityID) VALUES (%s, %s)", batch)
+    connection.commit()
+
+    room_rows = []
+    for hotel_id in hotel_ids:
+        for n in range(rooms_per_hotel):
+            room_type, capacity, price = rng.choice(ROOM_TYPES)
+            status = "Available" if rng.random() < 0.85 else rng.choice(["Occupied", "Maintenance", "Reserved"])
+            room_rows.append((hotel_id, str(1000 + n), room_type, capacity,
+                              round(price * rng.uniform(0.7, 1.6), 2), status))
+    for batch in _batched(room_rows):
+        cursor.executemany(
+            "INSERT INTO ROOM (HotelID, RoomNumber, RoomType, GuestCapacity, BasePrice, RoomStatus) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            batch,
+        )
+    connection.commit()
+
+    if availability_days:
+        cursor.execute("SELECT RoomID FROM ROOM WHERE HotelID >= %s", (first_id,))
+        room_ids = [row[0] for row in cursor.fetchall()]
+        batch = []
+        for room_id in room_ids:
+            for day in range(availability_days):
+                booked = rng.random() < 0.2
+                override = round(rng.uniform(200, 1500), 2) if rng.random() < 0.1 else None
+                batch.append((room_id, day, 0 if booked else 1, booked, override))
+                if len(batch) >= BATCH_SIZE:
+                    _insert_availability(cursor, batch)
+                    batch = []
+        if batch:
+            _insert_availability(cursor, batch)
+        connection.commit()
+
+    cursor.close()
+    return list(hotel_ids)
+
+
+def _insert_availability(cursor, batch):
+    cursor.executemany(
+        "INSERT INTO AVAILABILITY (RoomID, AvailableDate, AvailableRoomsCount, IsBooked, PriceOverride) "
+        "VALUES (%s, CURDATE() + INTERVAL %s DAY, %s, %s, %s)",
+        batch,
+    )
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of the samples (0.0 if none)"""
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def handler_reads(cursor):
+    """Sum of the session Handler_read_* counters (rows examined by the engine)"""
+    cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(value) for _, value in cursor.fetchall())
+
+
+def measure_query(connection, query, params, repeat=5):
+    """Run a query `repeat` times; return latency stats and rows examined per run"""
+    cursor = connection.cursor()
+    timings = []
+    examined = 0
+    rows = 0
+    for _ in range(repeat):
+        before = handler_reads(cursor)
+        started = time.perf_counter()
+        cursor.execute(query, params)
+        rows = len(cursor.fetchall())
+        timings.append((time.perf_counter() - started) * 1000)
+        examined = handler_reads(cursor) - before
+    cursor.close()
+    timings.sort()
+    return {
+        "rows_returned": rows,
+        "rows_examined": examined,
+        "min_ms": round(timings[0], 2),
+        "median_ms": round(timings[len(timings) // 2], 2),
+        "max_ms": round(timings[-1], 2),
+    }
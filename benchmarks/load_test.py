@@ -0,0 +1,351 @@
+"""
+Load test: the search, location stats, details and booking flows at increasing concurrency
+
+Loads WBNB_combined_mysql.sql into a scratch database, scales it to
+`--hotels` synthetic hotels and, for each `--concurrency` level, runs that
+many worker threads for `--duration` seconds. Each worker has its own
+connection and picks operations at random by the `--mix` weights:
+
+    search          the Search page SQL (build_hotel_search_query) for a random stay
+    catalog_search  the same search served by the in-memory HotelCatalog
+    location_stats  the Home page STATE_STATS query
+    details         the Details page queries (hotel_details.detail_calls) on one connection
+    booking         a BookingService.book() transaction for a random hotel and stay
+
+Reports p50/p95/p99 latency, throughput and, for the SQL operations, rows
+returned and rows examined (Handler_read_*) per call, as JSON. With
+`--output` the report is written to a file; with `--baseline` it is
+compared to an earlier report and the run fails if any operation's p95
+regressed by more than `--tolerance` percent.
+
+    MYSQL_HOST=localhost MYSQL_USER=root MYSQL_PASSWORD=... \\
+        python -m benchmarks.load_test [--hotels 10000] [--concurrency 1,8,32] [--duration 30] \\
+        [--output load.json] [--baseline previous.json]
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import mysql.connector
+from mysql.connector import Error
+
+from benchmarks.common import (CITIES, REPO_ROOT, bench_connection_settings, connect, handler_reads,
+                               load_schema, percentile, populate)
+from booking_service import BookingError, BookingService, Guest, SoldOutError
+from db_pool import ConnectionPool
+from hotel_catalog import HotelCatalog
+from hotel_details import detail_calls
+from hotel_queries import SORT_OPTIONS, build_hotel_search_query
+from hotel_records import hotels_from_cursor
+from location_index import LocationIndex
+from search_summary import SearchSummaryRefresher
+
+DEFAULT_MIX = "search=40,catalog_search=25,location_stats=10,details=20,booking=5"
+REPORT_VERSION = 1
+
+# The Home page query (get_location_stats)
+LOCATION_STATS_SQL = """
+    SELECT State, HotelCount as hotel_count, RoomCount as room_count, AvgRating as avg_rating,
+           MinRating as min_rating, MaxRating as max_rating
+    FROM STATE_STATS
+    ORDER BY hotel_count DESC
+"""
+
+
+class Workload:
+    """Shared, read-only state the operations draw their parameters from"""
+
+    def __init__(self, pool, hotels, locations, catalog, availability_days, seed):
+        self.pool = pool
+        self.hotels = hotels
+        self.locations = locations
+        self.catalog = catalog
+        self.booking_service = BookingService(pool)
+        self.availability_days = availability_days
+        self.seed = seed
+        self.today = date.today()
+
+    def stay(self, rng):
+        check_in = self.today + timedelta(days=rng.randint(1, max(1, self.availability_days - 8)))
+        return check_in, check_in + timedelta(days=rng.randint(1, 4))
+
+    def search_params(self, rng):
+        location = None
+        if rng.random() < 0.7:
+            city, state = rng.choice(CITIES)
+            location = self.locations.resolve(city if rng.random() < 0.5 else state)
+        check_in, check_out = self.stay(rng) if rng.random() < 0.6 else (None, None)
+        return dict(
+            location=location,
+            budget_filter=rng.choice([400, 600, 800, 1200]),
+            min_rating=rng.choice([3.0, 3.5, 4.0, 4.5]),
+            start_date=check_in,
+            end_date=check_out,
+            sort_by=rng.choice(list(SORT_OPTIONS)),
+            limit=51,
+            rooms_needed=rng.randint(1, 5) if check_in else 1,
+        )
+
+
+# ============================================================
+# OPERATIONS
+# ============================================================
+#
+# Each takes (workload, connection, rng) and returns the rows it returned,
+# or None when rows do not apply. SQL operations run on the worker's own
+# connection so their Handler_read_* delta is theirs alone.
+
+def op_search(workload, connection, rng):
+    query, params = build_hotel_search_query(**workload.search_params(rng))
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, params)
+        return len(cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def op_catalog_search(workload, connection, rng):
+    rows = workload.catalog.search(**workload.search_params(rng))
+    return len(rows) if rows is not None else None
+
+
+def op_location_stats(workload, connection, rng):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(LOCATION_STATS_SQL)
+        return len(cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def op_details(workload, connection, rng):
+    check_in, check_out = workload.stay(rng)
+    rows = 0
+    for call in detail_calls(rng.choice(workload.hotels), check_in, check_out).values():
+        result = call.fn(connection, *call.args)
+        rows += len(result) if isinstance(result, list) else int(result is not None)
+    return rows
+
+
+def op_booking(workload, connection, rng):
+    check_in, check_out = workload.stay(rng)
+    rooms = rng.randint(1, 3)
+    guest = Guest("Load", "Tester", f"load{rng.randrange(10**6)}@example.com", "5550000000", "Wedding Planner")
+    try:
+        workload.booking_service.book(uuid.uuid4().hex, rng.choice(workload.hotels).hotel_id,
+                                      check_in, check_out, rooms, guest, num_guests=rooms * 2)
+    except SoldOutError:
+        pass  # a normal outcome under load, not an error
+    return None
+
+
+OPERATIONS = {
+    "search": (op_search, True),
+    "catalog_search": (op_catalog_search, False),
+    "location_stats": (op_location_stats, True),
+    "details": (op_details, True),
+    "booking": (op_booking, False),
+}  # name -> (fn, measure rows examined on the worker connection)
+
+
+def parse_mix(mix):
+    """'search=40,details=20' -> ([names], [weights])"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        weights[name] = float(weight or 1)
+    return list(weights), list(weights.values())
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def run_level(workload, concurrency, duration, names, weights):
+    """Run `concurrency` workers for `duration` seconds; per-operation samples"""
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+    samples = {name: {"latencies": [], "rows": [], "examined": [], "errors": 0} for name in names}
+
+    def worker(n):
+        rng = random.Random(workload.seed * 1000 + concurrency * 100 + n)
+        connection = mysql.connector.connect(**bench_connection_settings())
+        connection.autocommit = True  # every read sees the bookings committed so far
+        cursor = connection.cursor()
+        local = {name: {"latencies": [], "rows": [], "examined": [], "errors": 0} for name in names}
+        try:
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                fn, examine = OPERATIONS[name]
+                before = handler_reads(cursor) if examine else None
+                started = time.perf_counter()
+                try:
+                    rows = fn(workload, connection, rng)
+                except (Error, BookingError):
+                    local[name]["errors"] += 1
+                    connection.rollback()
+                    continue
+                local[name]["latencies"].append((time.perf_counter() - started) * 1000)
+                if rows is not None:
+                    local[name]["rows"].append(rows)
+                if examine:
+                    local[name]["examined"].append(handler_reads(cursor) - before)
+        finally:
+            cursor.close()
+            connection.close()
+        with lock:
+            for name, values in local.items():
+                for key in ("latencies", "rows", "examined"):
+                    samples[name][key].extend(values[key])
+                samples[name]["errors"] += values["errors"]
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    """Report entry for one operation's samples"""
+    latencies = samples["latencies"]
+    mean = lambda values: round(sum(values) / len(values), 1) if values else None
+    return {
+        "calls": len(latencies),
+        "errors": samples["errors"],
+        "ops_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+        "rows_returned_avg": mean(samples["rows"]),
+        "rows_examined_avg": mean(samples["examined"]),
+    }
+
+
+def compare(report, baseline, tolerance):
+    """(concurrency, operation, baseline p95, p95, change %) for every p95 worse than tolerance"""
+    previous = {(level["concurrency"], name): op
+                for level in baseline.get("levels", []) for name, op in level["operations"].items()}
+    regressions = []
+    for level in report["levels"]:
+        for name, op in level["operations"].items():
+            before = previous.get((level["concurrency"], name))
+            if not before or not before["p95_ms"] or not op["calls"]:
+                continue
+            change = (op["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+            op["p95_change_pct"] = round(change, 1)
+            if change > tolerance:
+                regressions.append((level["concurrency"], name, before["p95_ms"], op["p95_ms"], round(change, 1)))
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=10_000, help="synthetic hotels (10k / 100k)")
+    parser.add_argument("--rooms-per-hotel", type=int, default=50)
+    parser.add_argument("--availability-days", type=int, default=60)
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight, comma-separated")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--skip-load", action="store_true", help="reuse an already populated database")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier report to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed p95 regression, percent")
+    args = parser.parse_args()
+
+    names, weights = parse_mix(args.mix)
+    levels = [int(n) for n in args.concurrency.split(",")]
+
+    connection = connect()
+    if not args.skip_load:
+        load_schema(connection)
+        populate(connection, args.hotels, rooms_per_hotel=args.rooms_per_hotel,
+                 availability_days=args.availability_days, seed=args.seed)
+        cursor = connection.cursor()
+        cursor.execute("ANALYZE TABLE HOTEL, ROOM, HOTELAMENITIES, AVAILABILITY")
+        cursor.fetchall()
+        cursor.close()
+
+    pool = ConnectionPool(bench_connection_settings(), size=max(levels) + 4, checkout_timeout=30)
+    SearchSummaryRefresher(pool, batch_size=2000).refresh(full=True)
+    cursor = connection.cursor()
+    cursor.execute("""
+        SELECT h.HotelID, h.State, COALESCE(AVG(r.BasePrice), 300) AS price_per_night
+        FROM HOTEL h LEFT JOIN ROOM r ON r.HotelID = h.HotelID
+        GROUP BY h.HotelID, h.State
+    """)
+    hotels = hotels_from_cursor(cursor)
+    cursor.close()
+    catalog = None
+    if "catalog_search" in names:
+        catalog = HotelCatalog(pool, availability_days=args.availability_days)
+        catalog.ensure_fresh()
+    workload = Workload(pool, hotels, LocationIndex.from_connection(connection), catalog,
+                        args.availability_days, args.seed)
+
+    report = {
+        "version": REPORT_VERSION,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {"hotels": len(hotels), "rooms_per_hotel": args.rooms_per_hotel,
+                   "availability_days": args.availability_days, "duration_s": args.duration,
+                   "mix": dict(zip(names, weights)), "seed": args.seed},
+        "levels": [],
+    }
+    for concurrency in levels:
+        samples, elapsed = run_level(workload, concurrency, args.duration, names, weights)
+        operations = {name: summarize(samples[name], elapsed) for name in names}
+        calls = sum(op["calls"] for op in operations.values())
+        report["levels"].append({"concurrency": concurrency, "elapsed_s": round(elapsed, 2),
+                                 "ops_per_second": round(calls / elapsed, 1), "operations": operations})
+        print(f"concurrency {concurrency:>3}: {calls / elapsed:>8.1f} ops/s | " + " | ".join(
+            f"{name} p50 {op['p50_ms']:.1f} / p95 {op['p95_ms']:.1f} / p99 {op['p99_ms']:.1f} ms"
+            for name, op in operations.items()), file=sys.stderr)
+    report["booking_service"] = workload.booking_service.stats()
+    report["pool"] = pool.stats()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = [dict(zip(("concurrency", "operation", "baseline_p95_ms", "p95_ms", "change_pct"), r))
+                                 for r in regressions]
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    pool.close()
+    connection.close()
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
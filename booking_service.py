@@ -0,0 +1,355 @@
+"""
+Wedding Destination Hotel Finder - Booking Service
+Transactional booking write path: reserves rooms on every night of a stay,
+decrements AVAILABILITY and writes BOOKING / GUESTINFO / PAYMENT in one
+transaction, safe against concurrent bookers and double submits
+"""
+
+import random
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from mysql.connector import Error, errorcode
+
+from confirmation_ids import ConfirmationIdGenerator
+from stay_pricing import basis_points, from_cents, group_discount_rate, line_totals, to_cents
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_LOCK_WAIT_TIMEOUT = 5       # seconds InnoDB waits for a calendar row lock
+RETRY_BACKOFF = 0.02                # seconds; doubled per attempt, with jitter
+RETRYABLE_ERRORS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+
+# App roles -> USER.Role
+USER_ROLES = {
+    "Couple": "Couple",
+    "Wedding Planner": "Planner",
+    "Event Organizer": "Planner",
+    "Hotel Admin": "HotelAdmin",
+}
+# Accounts created at checkout cannot log in until a password is set
+UNUSABLE_PASSWORD = "!"
+
+
+class BookingError(Exception):
+    """Raised when a booking request cannot be fulfilled as asked"""
+
+
+class SoldOutError(BookingError):
+    """Raised when fewer rooms are free on every night than were requested"""
+
+    def __init__(self, requested, available):
+        super().__init__(f"Only {available} of the {requested} requested rooms are free for the whole stay")
+        self.requested = requested
+        self.available = available
+
+
+class Guest(namedtuple("Guest", ["first_name", "last_name", "email", "phone", "role"])):
+    """Person making the booking (becomes USER + GUESTINFO)"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_full_name(cls, name, email, phone="", role="Couple"):
+        first, _, last = (name or "").strip().partition(" ")
+        return cls(first or email, last.strip() or "-", email, phone or "", role)
+
+
+BookingResult = namedtuple(
+    "BookingResult", ["confirmation_number", "booking_ids", "rooms", "total_price", "replayed"]
+)
+
+
+# ============================================================
+# BOOKING SERVICE
+# ============================================================
+
+class BookingService:
+    """
+    Books `num_rooms` room units of one hotel for every night of a stay
+
+    Concurrency: the (RoomID, night) rows of the rooms being booked are
+    materialized in AVAILABILITY (a missing row means "1 free at BasePrice",
+    so inserting that default changes nothing) and locked in uk_room_date
+    order with SELECT ... FOR UPDATE. Free counts are re-checked under the
+    lock before the decrement, so two sessions can't both take the last
+    room. Deadlocks and lock-wait timeouts retry the whole transaction.
+
+    Idempotency: the caller's key is inserted into BOOKINGREQUEST first in
+    the same transaction. A duplicate submit waits on uk_idempotencyKey,
+    then gets the committed confirmation back (`replayed=True`).
+    """
+
+    def __init__(self, pool, max_retries=DEFAULT_MAX_RETRIES,
+                 lock_wait_timeout=DEFAULT_LOCK_WAIT_TIMEOUT, id_generator=None):
+        self._pool = pool
+        self._ids = id_generator or ConfirmationIdGenerator()
+        self.max_retries = max_retries
+        self.lock_wait_timeout = lock_wait_timeout
+        self._lock = threading.Lock()
+        self._counters = {"bookings": 0, "replays": 0, "sold_out": 0, "retries": 0}
+
+    def book(self, idempotency_key, hotel_id, check_in, check_out, num_rooms, guest,
+             num_guests=0, special_requests=None, payment_method="CreditCard"):
+        """Reserve the rooms and record the booking; returns a BookingResult"""
+        if check_out <= check_in:
+            raise ValueError("Check-out date must be after check-in date")
+        if num_rooms < 1:
+            raise ValueError("At least one room must be booked")
+        if not idempotency_key or len(idempotency_key) > 64:
+            raise ValueError("Idempotency key must be 1-64 characters")
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._pool.connection() as connection:
+                    result = self._book_once(
+                        connection, idempotency_key, hotel_id, check_in, check_out, num_rooms,
+                        guest, num_guests, special_requests, payment_method
+                    )
+            except SoldOutError:
+                self._count("sold_out")
+                raise
+            except Error as e:
+                if e.errno not in RETRYABLE_ERRORS or attempt == self.max_retries:
+                    raise
+                self._count("retries")
+                time.sleep(RETRY_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+                continue
+            self._count("replays" if result.replayed else "bookings")
+            return result
+
+    def stats(self):
+        """Booking / replay / sold-out / retry counters"""
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    # --------------------------------------------------------
+    # One transaction
+    # --------------------------------------------------------
+
+    def _book_once(self, connection, idempotency_key, hotel_id, check_in, check_out, num_rooms,
+                   guest, num_guests, special_requests, payment_method):
+        cursor = connection.cursor()
+        previous_timeout = None
+        try:
+            # Pooled session: put the server's lock wait back for the next
+            # borrower (the summary refresher, search logger and catalog)
+            cursor.execute("SELECT @@SESSION.innodb_lock_wait_timeout")
+            ((previous_timeout,),) = cursor.fetchall()
+            cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (self.lock_wait_timeout,))
+            connection.start_transaction(isolation_level="READ COMMITTED")
+
+            user_id = self._upsert_user(cursor, guest)
+            confirmation_number = self._ids.next_id()
+            try:
+                cursor.execute(
+                    "INSERT INTO BOOKINGREQUEST (IdempotencyKey, UserID, HotelID, CheckInDate, "
+                    "CheckOutDate, NumberOfRooms, ConfirmationNumber) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                    (idempotency_key, user_id, hotel_id, check_in, check_out, num_rooms, confirmation_number)
+                )
+            except Error as e:
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                connection.rollback()
+                return self._replay(cursor, idempotency_key, hotel_id, check_in, check_out, num_rooms)
+            request_id = cursor.lastrowid
+
+            nights = [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+            allocation = self._reserve(cursor, hotel_id, nights, num_rooms)
+
+            booking_ids = []
+            request_total = Decimal(0)
+            guests_left = num_guests
+            discount_rate = group_discount_rate(num_rooms)
+            for i, (room_id, units, capacity, subtotal) in enumerate(allocation):
+                total = from_cents(line_totals(to_cents(subtotal), basis_points(discount_rate))[3])
+                guests = guests_left if i == len(allocation) - 1 else min(guests_left, units * capacity)
+                guests_left -= guests
+                request_total += total
+
+                cursor.execute(
+                    "INSERT INTO BOOKING (ConfirmationNumber, UserID, RoomID, CheckInDate, CheckOutDate, "
+                    "NumberOfGuests, NumberOfRooms, TotalPrice, BookingStatus, SpecialRequests, "
+                    "GroupBookingDiscount, PaymentStatus) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'Confirmed', %s, %s, 'Pending')",
+                    (confirmation_number, user_id, room_id, check_in, check_out,
+                     guests, units, total, special_requests or None, discount_rate)
+                )
+                booking_id = cursor.lastrowid
+                booking_ids.append(booking_id)
+                cursor.execute(
+                    "INSERT INTO GUESTINFO (BookingID, FirstName, LastName, Email, PhoneNumber) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    (booking_id, guest.first_name, guest.last_name, guest.email, guest.phone or "")
+                )
+                cursor.execute(
+                    "INSERT INTO PAYMENT (BookingID, UserID, PaymentAmount, PaymentMethod, PaymentStatus, "
+                    "PaymentDate) VALUES (%s, %s, %s, %s, 'Pending', NOW())",
+                    (booking_id, user_id, total, payment_method)
+                )
+
+            cursor.execute(
+                "UPDATE BOOKINGREQUEST SET TotalPrice = %s WHERE BookingRequestID = %s",
+                (request_total, request_id)
+            )
+            connection.commit()
+            return BookingResult(confirmation_number, booking_ids, num_rooms, request_total, False)
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            try:
+                if previous_timeout is not None:
+                    cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (previous_timeout,))
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def _upsert_user(cursor, guest):
+        """UserID for the guest's email, creating the account on first booking"""
+        cursor.execute(
+            "INSERT INTO `USER` (Email, Password, FirstName, LastName, PhoneNumber, Role) "
+            "VALUES (%s, %s, %s, %s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE UserID = LAST_INSERT_ID(UserID)",
+            (guest.email, UNUSABLE_PASSWORD, guest.first_name, guest.last_name,
+             guest.phone or None, USER_ROLES.get(guest.role, "Couple"))
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _replay(cursor, idempotency_key, hotel_id, check_in, check_out, num_rooms):
+        cursor.execute(
+            "SELECT HotelID, CheckInDate, CheckOutDate, NumberOfRooms, TotalPrice, ConfirmationNumber "
+            "FROM BOOKINGREQUEST WHERE IdempotencyKey = %s",
+            (idempotency_key,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise BookingError("Booking request is still being processed; try again")
+        if tuple(row[:4]) != (hotel_id, check_in, check_out, num_rooms):
+            raise BookingError("Idempotency key was already used for a different booking")
+        cursor.execute(
+            "SELECT BookingID FROM BOOKING WHERE ConfirmationNumber = %s ORDER BY BookingID", (row[5],)
+        )
+        booking_ids = [booking_id for (booking_id,) in cursor.fetchall()]
+        return BookingResult(row[5], booking_ids, row[3], row[4], True)
+
+    # --------------------------------------------------------
+    # Inventory
+    # --------------------------------------------------------
+
+    def _reserve(self, cursor, hotel_id, nights, num_rooms):
+        """
+        Lock, re-check and decrement calendar rows for `num_rooms` units
+
+        Candidates are picked cheapest-first from an unlocked read, so only
+        the rooms likely to be booked are locked; if the locked re-check
+        comes up short (another session got there first) the remaining rooms
+        are locked too. Returns [(RoomID, units, GuestCapacity, subtotal)].
+        """
+        cursor.execute(
+            "SELECT RoomID, GuestCapacity, BasePrice FROM ROOM "
+            "WHERE HotelID = %s AND RoomStatus = 'Available' ORDER BY BasePrice, RoomID",
+            (hotel_id,)
+        )
+        rooms = {room_id: (capacity, base_price) for room_id, capacity, base_price in cursor.fetchall()}
+        if not rooms:
+            raise SoldOutError(num_rooms, 0)
+
+        calendar = self._read_calendar(cursor, list(rooms), nights, lock=False)
+        candidates, units = [], 0
+        for room_id in rooms:
+            if units >= num_rooms:
+                break
+            free = self._room_free(room_id, nights, calendar)
+            if free > 0:
+                candidates.append(room_id)
+                units += free
+
+        if units < num_rooms:
+            raise SoldOutError(num_rooms, units)
+
+        locked_rooms = set(candidates)
+        locked = self._lock_rooms(cursor, candidates, nights)
+        if sum(self._room_free(r, nights, locked) for r in candidates) < num_rooms:
+            others = [r for r in rooms if r not in locked_rooms]
+            locked.update(self._lock_rooms(cursor, others, nights))
+            locked_rooms.update(others)
+
+        allocation = []
+        needed = num_rooms
+        for room_id, (capacity, base_price) in rooms.items():
+            if needed == 0:
+                break
+            if room_id not in locked_rooms:
+                continue
+            take = min(needed, self._room_free(room_id, nights, locked))
+            if take <= 0:
+                continue
+            cursor.execute(
+                "UPDATE AVAILABILITY "
+                "SET AvailableRoomsCount = AvailableRoomsCount - %s, IsBooked = (AvailableRoomsCount = 0) "
+                "WHERE RoomID = %s AND AvailableDate >= %s AND AvailableDate < %s "
+                "AND IsBooked = FALSE AND AvailableRoomsCount >= %s",
+                (take, room_id, nights[0], nights[-1] + timedelta(days=1), take)
+            )
+            if cursor.rowcount != len(nights):
+                raise BookingError("Room inventory changed while it was locked")
+            # A PriceOverride (even 0.00) replaces BasePrice, as in stay_pricing quotes
+            overrides = [locked[(room_id, night)][2] for night in nights]
+            nightly = [base_price if override is None else override for override in overrides]
+            allocation.append((room_id, take, capacity or 0, sum(Decimal(p) for p in nightly) * take))
+            needed -= take
+
+        if needed:
+            raise SoldOutError(num_rooms, num_rooms - needed)
+        return allocation
+
+    @staticmethod
+    def _room_free(room_id, nights, calendar):
+        """Units of a room free on every night (missing calendar row = 1 free)"""
+        free = None
+        for night in nights:
+            count, is_booked, _ = calendar.get((room_id, night), (1, False, None))
+            night_free = 0 if is_booked else count
+            free = night_free if free is None else min(free, night_free)
+        return free or 0
+
+    @staticmethod
+    def _read_calendar(cursor, room_ids, nights, lock):
+        if not room_ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(room_ids))
+        cursor.execute(
+            "SELECT RoomID, AvailableDate, AvailableRoomsCount, IsBooked, PriceOverride FROM AVAILABILITY "
+            f"WHERE RoomID IN ({placeholders}) AND AvailableDate >= %s AND AvailableDate < %s "
+            "ORDER BY RoomID, AvailableDate" + (" FOR UPDATE" if lock else ""),
+            list(room_ids) + [nights[0], nights[-1] + timedelta(days=1)]
+        )
+        return {
+            (room_id, night): (count, bool(is_booked), override)
+            for room_id, night, count, is_booked, override in cursor.fetchall()
+        }
+
+    def _lock_rooms(self, cursor, room_ids, nights):
+        """Materialize and row-lock the stay's calendar rows for `room_ids`"""
+        room_ids = sorted(room_ids)
+        if not room_ids:
+            return {}
+        cursor.executemany(
+            "INSERT INTO AVAILABILITY (RoomID, AvailableDate, AvailableRoomsCount) VALUES (%s, %s, 1) "
+            "ON DUPLICATE KEY UPDATE AvailabilityID = AvailabilityID",
+            [(room_id, night) for room_id in room_ids for night in nights]
+        )
+        return self._read_calendar(cursor, room_ids, nights, lock=True)
@@ -0,0 +1,188 @@
+"""
+Wedding Destination Hotel Finder - Capacity Planner
+Cheapest mix of rooms that seats a whole wedding party at one hotel:
+a bounded knapsack over (RoomType, GuestCapacity) options, solved for
+many hotels at once with NumPy and cached per room inventory
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+MAX_GUESTS = 500                # Search page guest_count upper bound
+SEATS_STEP = 50                 # tables are solved for guests rounded up to this
+DEFAULT_CACHE_ENTRIES = 20_000  # room inventories kept (one solved table each)
+
+
+class RoomOption(namedtuple("RoomOption", ["room_type", "capacity", "units", "price"])):
+    """`units` rooms of one kind that each seat `capacity` guests at `price` per night"""
+    __slots__ = ()
+
+
+class RoomPlan(namedtuple("RoomPlan", ["rooms", "room_count", "guests_seated", "nightly_cost"])):
+    """Chosen mix: `rooms` is ((room_type, capacity, count), ...), largest rooms first"""
+    __slots__ = ()
+
+    def describe(self):
+        return " + ".join(f"{count} × {room_type}" for room_type, _, count in self.rooms)
+
+
+# 0/1 tables solved together: for hotel h, step s adds count[h, s] units
+# of option step_option[s] (shift[h, s] seats), and take[s, h, c] says
+# whether step s was used on the way to c seats. A hotel's cached table
+# is (batch, h); the batch stays alive while any of its hotels is cached.
+_Batch = namedtuple("_Batch", ["seats", "dp", "take", "step_option", "count", "shift"])
+
+
+# ============================================================
+# PLANNER
+# ============================================================
+
+class CapacityPlanner:
+    """
+    Bounded knapsack: seat at least G guests at the lowest nightly cost
+
+    Each option's units are split into 1, 2, 4, ... chunks (binary
+    splitting), turning the bounded problem into a 0/1 knapsack with
+    O(log units) items per option. dp[c] is the cheapest way to seat at
+    least c guests, so one table answers every guest count up to the
+    seats it was solved for.
+
+    Tables are cached by the hotel's normalized options: a search for
+    120 guests after one for 150 (or the next Results page, or another
+    hotel with the same inventory) reads the cached table instead of
+    solving again. Misses are solved together, one NumPy step per item
+    across all hotels.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._tables = OrderedDict()  # normalized options -> (_Batch, row)
+        self._lock = threading.Lock()
+        self._counters = {"plans": 0, "cache_hits": 0, "tables_solved": 0}
+
+    @staticmethod
+    def _normalize(options):
+        return tuple(sorted(o for o in options if o.capacity > 0 and o.units > 0 and o.price is not None))
+
+    def plan(self, guests, options):
+        """Cheapest RoomPlan seating `guests`, or None if the options cannot"""
+        return self.plan_many(guests, {None: options})[None]
+
+    def plan_many(self, guests, options_by_key):
+        """{key: RoomPlan or None} for {key: [RoomOption, ...]} (e.g. keyed by HotelID)"""
+        guests = max(1, int(guests))
+        normalized = {key: self._normalize(options) for key, options in options_by_key.items()}
+        # Hotels that cannot seat everyone even fully booked need no table
+        unique = {options for options in set(normalized.values())
+                  if sum(o.capacity * o.units for o in options) >= guests}
+        with self._lock:
+            tables = {}
+            for options in unique:
+                table = self._tables.get(options)
+                if table is not None and table[0].seats >= guests:
+                    self._tables.move_to_end(options)
+                    tables[options] = table
+            self._counters["plans"] += len(normalized)
+            self._counters["cache_hits"] += len(tables)
+
+        missing = [options for options in unique if options not in tables]
+        if missing:
+            seats = min(max(MAX_GUESTS, guests), -(-guests // SEATS_STEP) * SEATS_STEP)
+            solved = self._solve(missing, seats)
+            tables.update(solved)
+            with self._lock:
+                self._tables.update(solved)
+                while len(self._tables) > self.max_entries:
+                    self._tables.popitem(last=False)
+                self._counters["tables_solved"] += len(solved)
+
+        by_batch = {}
+        for options in unique:
+            batch, row = tables[options]
+            _, option_lists, rows = by_batch.setdefault(id(batch), (batch, [], []))
+            option_lists.append(options)
+            rows.append(row)
+        plans = {}
+        for batch, option_lists, rows in by_batch.values():
+            plans.update(self._backtrack(batch, option_lists, rows, guests))
+        return {key: plans.get(options) for key, options in normalized.items()}
+
+    @staticmethod
+    def _solve(option_lists, seats):
+        """Solve the 0/1 tables for every option list at once; {options: (_Batch, row)}"""
+        hotels = len(option_lists)
+        width = max(len(options) for options in option_lists)
+        padding = [RoomOption(None, 1, 0, 0.0)]
+        grid = np.array([[option[1:] for option in options + tuple(padding * (width - len(options)))]
+                         for options in option_lists], dtype=np.float64).reshape(hotels, width, 3)
+        capacity, units, price = grid[:, :, 0].astype(np.int64), grid[:, :, 1].astype(np.int64), grid[:, :, 2]
+        # More units than seat everyone on their own are never needed
+        units = np.minimum(units, -(-seats // capacity))
+
+        # Binary splitting: step (o, b) takes min(2^b, what is left) units of option o
+        bits = max(1, int(units.max()).bit_length())
+        step_option = np.repeat(np.arange(width), bits)
+        step_bit = np.tile(np.arange(bits), width)
+        count = np.clip(units[:, step_option] - (2 ** step_bit - 1), 0, 2 ** step_bit)
+        used = count.any(axis=0)
+        step_option, count = step_option[used], count[:, used]
+        shift = count * capacity[:, step_option]
+        cost = np.where(count > 0, count * price[:, step_option], np.inf)
+
+        # dp[h, 0] is always 0, so zero padding on the left makes
+        # dp[h, max(c - shift, 0)] a plain window of the padded row
+        pad = int(shift.max())
+        rows = np.arange(hotels)
+        padded = np.zeros((hotels, pad + seats + 1))
+        padded[:, pad + 1:] = np.inf
+        dp = padded[:, pad:]
+        windows = sliding_window_view(padded, seats + 1, axis=1)
+        step_start = np.ascontiguousarray(pad - shift.T)
+        step_cost = np.ascontiguousarray(cost.T)[:, :, None]
+        take = np.zeros((len(step_option), hotels, seats + 1), dtype=bool)
+        for s in range(len(step_option)):
+            candidate = windows[rows, step_start[s]]
+            candidate += step_cost[s]
+            np.less(candidate, dp, out=take[s])
+            np.minimum(dp, candidate, out=dp)
+
+        batch = _Batch(seats, dp, take, step_option, count, shift)
+        return {options: (batch, h) for h, options in enumerate(option_lists)}
+
+    @staticmethod
+    def _backtrack(batch, option_lists, rows, guests):
+        """{options: RoomPlan or None} for rows of one batch, walked back together"""
+        rows = np.array(rows)
+        seat = np.full(len(rows), guests)
+        counts = np.zeros((len(rows), max(len(options) for options in option_lists)), dtype=np.int64)
+        for s in range(len(batch.step_option) - 1, -1, -1):
+            taken = batch.take[s, rows, seat]
+            counts[:, batch.step_option[s]] += taken * batch.count[rows, s]
+            seat = np.maximum(seat - taken * batch.shift[rows, s], 0)
+
+        plans = {}
+        for options, hotel_counts, nightly_cost in zip(option_lists, counts.tolist(),
+                                                       batch.dp[rows, guests].tolist()):
+            if nightly_cost == float("inf"):
+                plans[options] = None
+                continue
+            chosen = [(option, n) for option, n in zip(options, hotel_counts) if n]
+            plans[options] = RoomPlan(
+                rooms=tuple(sorted(((o.room_type, o.capacity, n) for o, n in chosen),
+                                   key=lambda room: (-room[1], room[0]))),
+                room_count=sum(n for _, n in chosen),
+                guests_seated=sum(o.capacity * n for o, n in chosen),
+                nightly_cost=round(sum(o.price * n for o, n in chosen), 2),
+            )
+        return plans
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, cached_tables=len(self._tables))
@@ -0,0 +1,138 @@
+"""
+Wedding Destination Hotel Finder - Comparison Charts
+Price and rating comparison figures built as Plotly figure JSON from
+compact column arrays, cached process-wide per (comparison set, selected
+hotel)
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+#
+# plotly.express rebuilds a DataFrame, groups it by colour and validates
+# every trace on each call. The figures here are plain figure JSON written
+# once per comparison set; a selected hotel only changes the bar colours,
+# spliced into the set's serialized base figure. The JSON strings are
+# immutable, so every session can share them.
+
+DEFAULT_MAX_FIGURES = 5_000  # (set, selected hotel) figure pairs kept
+NAME_LENGTH = 25             # characters of a venue name on the x axis
+CHART_HEIGHT = 300
+OTHER_COLOR = "#B8B8B8"
+
+# metric -> (title, y axis range, highlight colour)
+METRICS = {
+    "price": ("Price Comparison", None, "#D4AF37"),
+    "rating": ("Rating Comparison", [0, 5], "#FFD700"),
+}
+
+_COLORS_PLACEHOLDER = '"__BAR_COLORS__"'
+
+
+class ComparisonSet(namedtuple("ComparisonSet", ["key", "hotel_ids", "names", "prices", "ratings"])):
+    """
+    Venues compared on one pair of charts, in bar order, as column arrays
+
+    `key` is a digest of every value shown, so equal sets share cached
+    figures whichever page or session built them.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """From (hotel_id, name, price_per_night, rating) rows"""
+        hotel_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        names = tuple(str(row[1])[:NAME_LENGTH] for row in rows)
+        prices = np.array([float(row[2]) for row in rows], dtype=np.float64)
+        ratings = np.array([float(row[3] or 0) for row in rows], dtype=np.float64)
+        digest = hashlib.blake2b(digest_size=16)
+        for column in (hotel_ids, prices, ratings):
+            digest.update(column.tobytes())
+        digest.update("\0".join(names).encode())
+        return cls(digest.hexdigest(), hotel_ids, names, prices, ratings)
+
+
+def base_figure(comparison, metric):
+    """Serialized figure for one metric, split around its bar colour list: (prefix, suffix)"""
+    title, y_range, _ = METRICS[metric]
+    values = comparison.prices if metric == "price" else comparison.ratings
+    layout = {"title": {"text": title}, "height": CHART_HEIGHT, "showlegend": False,
+              "xaxis": {"title": {"text": "Hotel"}}, "yaxis": {"title": {"text": metric.title()}}}
+    if y_range:
+        layout["yaxis"]["range"] = y_range
+    figure = {
+        "data": [{"type": "bar", "x": list(comparison.names), "y": values.tolist(),
+                  "marker": {"color": "__BAR_COLORS__"}}],
+        "layout": layout,
+    }
+    prefix, suffix = json.dumps(figure, separators=(",", ":")).split(_COLORS_PLACEHOLDER)
+    return prefix, suffix
+
+
+# ============================================================
+# CHART SERVICE
+# ============================================================
+
+class ChartService:
+    """
+    Process-wide cache of comparison figure JSON
+
+    `figures()` returns {metric: figure JSON} for a ComparisonSet with
+    the selected hotel highlighted. Base figures are kept per set and
+    highlighted figures per (set, selected hotel); both are evicted
+    least recently used past `max_entries`.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_FIGURES):
+        self.max_entries = max_entries
+        self._bases = OrderedDict()     # set key -> {metric: (prefix, suffix)}
+        self._figures = OrderedDict()   # (set key, selected hotel) -> {metric: JSON}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "bases_built": 0}
+
+    def figures(self, comparison, selected_id):
+        """{metric: Plotly figure JSON} with `selected_id`'s bars highlighted"""
+        key = (comparison.key, selected_id)
+        with self._lock:
+            figures = self._figures.get(key)
+            if figures is not None:
+                self._figures.move_to_end(key)
+                self._counters["hits"] += 1
+                return figures
+            self._counters["misses"] += 1
+            bases = self._bases.get(comparison.key)
+            if bases is not None:
+                self._bases.move_to_end(comparison.key)
+
+        if bases is None:
+            bases = {metric: base_figure(comparison, metric) for metric in METRICS}
+            with self._lock:
+                self._bases[comparison.key] = bases
+                self._counters["bases_built"] += 1
+                self._evict(self._bases)
+
+        selected = comparison.hotel_ids == selected_id
+        figures = {}
+        for metric, (prefix, suffix) in bases.items():
+            colors = np.where(selected, METRICS[metric][2], OTHER_COLOR).tolist()
+            figures[metric] = prefix + json.dumps(colors, separators=(",", ":")) + suffix
+
+        with self._lock:
+            self._figures[key] = figures
+            self._evict(self._figures)
+        return figures
+
+    def _evict(self, entries):
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, figures=len(self._figures), bases=len(self._bases))
@@ -0,0 +1,148 @@
+"""
+Wedding Destination Hotel Finder - Confirmation Numbers
+Time-ordered, node-tagged booking confirmation IDs generated in-process:
+unique across processes and hosts, sortable by creation time, and
+produced without a database round trip
+"""
+
+import hashlib
+import os
+import socket
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+#
+# 64-bit layout (most significant first):
+#     41 bits  milliseconds since EPOCH_MS  (~69 years)
+#     10 bits  node id                      (1024 app processes)
+#     12 bits  per-millisecond sequence     (4096 IDs / ms / node)
+# rendered as 13 fixed-width Crockford base32 characters, so string order
+# is creation order and new IDs append to the right of idx_confirmationNumber.
+
+EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+ID_CHARS = 13
+
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford: no I, L, O, U
+DECODE = {char: value for value, char in enumerate(ALPHABET)}
+DEFAULT_PREFIX = "WED"
+
+ConfirmationParts = namedtuple("ConfirmationParts", ["created_at", "node_id", "sequence"])
+
+
+def default_node_id():
+    """
+    Node id from WBNB_NODE_ID, else derived from host name and process id
+
+    Set WBNB_NODE_ID (0-1023) per process in multi-node deployments; the
+    derived value is stable for a process but two processes can collide.
+    """
+    configured = os.environ.get("WBNB_NODE_ID")
+    if configured is not None:
+        node_id = int(configured)
+        if not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"WBNB_NODE_ID must be between 0 and {MAX_NODE_ID}")
+        return node_id
+    digest = hashlib.blake2b(f"{socket.gethostname()}:{os.getpid()}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") & MAX_NODE_ID
+
+
+def encode(value):
+    chars = []
+    for _ in range(ID_CHARS):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode(text):
+    value = 0
+    for char in text.upper():
+        value = (value << 5) | DECODE[char]
+    return value
+
+
+# ============================================================
+# GENERATOR
+# ============================================================
+
+class ConfirmationIdGenerator:
+    """
+    Thread-safe generator of "WED-XXXXXXXXXXXXX" confirmation numbers
+
+    The sequence resets every millisecond; if it runs out, or the wall
+    clock steps backwards, the generator waits for the clock to pass the
+    last timestamp it issued instead of reusing one.
+    """
+
+    def __init__(self, node_id=None, prefix=DEFAULT_PREFIX, clock=time.time):
+        self.node_id = default_node_id() if node_id is None else node_id
+        if not 0 <= self.node_id <= MAX_NODE_ID:
+            raise ValueError(f"Node id must be between 0 and {MAX_NODE_ID}")
+        self.prefix = prefix
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _now_ms(self):
+        return int(self._clock() * 1000) - EPOCH_MS
+
+    def next_int(self):
+        """Next 64-bit ID"""
+        with self._lock:
+            now = self._now_ms()
+            if now < self._last_ms:
+                now = self._wait_past(self._last_ms - 1)
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    now = self._wait_past(self._last_ms)
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (now << (NODE_BITS + SEQUENCE_BITS)) | (self.node_id << SEQUENCE_BITS) | self._sequence
+
+    def _wait_past(self, timestamp_ms):
+        now = self._now_ms()
+        while now <= timestamp_ms:
+            time.sleep(0.0001)
+            now = self._now_ms()
+        return now
+
+    def next_id(self):
+        """Next confirmation number, e.g. WED-01JC8X4R2M0G0"""
+        return f"{self.prefix}-{encode(self.next_int())}"
+
+    @staticmethod
+    def parse(confirmation_number):
+        """Split a confirmation number into (created_at UTC, node_id, sequence)"""
+        value = decode(confirmation_number.rsplit("-", 1)[-1])
+        millis = (value >> (NODE_BITS + SEQUENCE_BITS)) + EPOCH_MS
+        return ConfirmationParts(
+            datetime.fromtimestamp(millis / 1000, tz=timezone.utc),
+            (value >> SEQUENCE_BITS) & MAX_NODE_ID,
+            value & MAX_SEQUENCE,
+        )
+
+
+_default_generator = None
+_default_lock = threading.Lock()
+
+
+def new_confirmation_number():
+    """Confirmation number from the process-wide generator"""
+    global _default_generator
+    if _default_generator is None:
+        with _default_lock:
+            if _default_generator is None:
+                _default_generator = ConfirmationIdGenerator()
+    return _default_generator.next_id()
@@ -0,0 +1,255 @@
+"""
+Wedding Destination Hotel Finder - MySQL Connection Pool
+Shared, thread-safe connection pool used by both Streamlit apps
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import Error
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_CHECKOUT_TIMEOUT = 5.0      # seconds a session waits for a free connection
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0  # ping idle connections older than this
+DEFAULT_MAX_IDLE = 600.0            # recycle connections idle longer than this
+
+
+class PoolTimeoutError(Error):
+    """Raised when no pooled connection frees up within the checkout timeout"""
+
+
+def connection_settings(secrets):
+    """Build mysql.connector.connect() kwargs from st.secrets (or any mapping)"""
+    return {
+        "host": secrets.get("mysql_host", "localhost"),
+        "user": secrets.get("mysql_user", "root"),
+        "password": secrets.get("mysql_password", ""),
+        "database": secrets.get("mysql_database", "5033_ali"),
+        "port": secrets.get("mysql_port", 3306),
+    }
+
+
+# ============================================================
+# CONNECTION POOL
+# ============================================================
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections shared by every Streamlit session
+
+    Connections are opened lazily up to `size`. A checkout blocks for at most
+    `checkout_timeout` seconds, pings connections that have been idle longer
+    than `health_check_interval` and transparently replaces stale ones.
+    """
+
+    def __init__(self, connect_kwargs=None, size=DEFAULT_POOL_SIZE,
+                 checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+                 max_idle=DEFAULT_MAX_IDLE, connect=None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect_kwargs = dict(connect_kwargs or {})
+        self._connect = connect or (lambda: mysql.connector.connect(**self._connect_kwargs))
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.max_idle = max_idle
+
+        self._lock = threading.Condition()
+        self._idle = deque()          # (connection, returned_at)
+        self._open = 0                # idle + checked out
+        self._in_use = 0
+        self._waiters = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._reconnects = 0
+        self._created = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # --------------------------------------------------------
+    # Checkout / return
+    # --------------------------------------------------------
+
+    def acquire(self, timeout=None):
+        """Check out a healthy connection, waiting up to `timeout` seconds"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise Error(msg="Connection pool is closed")
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._open < self.size:
+                    connection, returned_at = None, None
+                    self._open += 1
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        msg=f"No database connection available after {timeout:.1f}s "
+                            f"({self._in_use} in use, {self._waiters} waiting)"
+                    )
+                self._waiters += 1
+                try:
+                    self._lock.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+        # Connect / health check outside the lock so one slow ping
+        # doesn't stall every other session
+        try:
+            if connection is None:
+                connection = self._new_connection()
+            else:
+                connection = self._validate(connection, returned_at)
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return connection
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool (or drop it if broken)"""
+        if not discard:
+            try:
+                # End any implicit transaction so the next borrower
+                # doesn't read from a stale REPEATABLE READ snapshot
+                if connection.in_transaction:
+                    connection.rollback()
+            except Exception:
+                discard = True
+
+        with self._lock:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._open -= 1
+                self._close_quietly(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._lock.notify()
+
+    def prefill(self, count=None):
+        """Open up to `count` connections (default `size`) ahead of the first checkouts; returns how many are idle"""
+        count = self.size if count is None else min(count, self.size)
+        held = []
+        try:
+            while len(held) < count:
+                try:
+                    held.append(self.acquire(timeout=0))
+                except PoolTimeoutError:
+                    break  # the rest are checked out by sessions already
+        finally:
+            for connection in held:
+                self.release(connection)
+        with self._lock:
+            return len(self._idle)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager: `with pool.connection() as conn: ...`"""
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            yield connection
+        except Error:
+            # Driver errors may leave the session in an unknown state
+            discard = not self._is_alive(connection)
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    # --------------------------------------------------------
+    # Health checks
+    # --------------------------------------------------------
+
+    def _new_connection(self):
+        connection = self._connect()
+        with self._lock:
+            self._created += 1
+        return connection
+
+    def _validate(self, connection, returned_at):
+        idle_for = time.monotonic() - returned_at
+        if idle_for > self.max_idle:
+            self._close_quietly(connection)
+            return self._reconnect()
+        if idle_for > self.health_check_interval and not self._is_alive(connection):
+            self._close_quietly(connection)
+            return self._reconnect()
+        return connection
+
+    def _reconnect(self):
+        with self._lock:
+            self._reconnects += 1
+        return self._new_connection()
+
+    @staticmethod
+    def _is_alive(connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    # --------------------------------------------------------
+    # Metrics / shutdown
+    # --------------------------------------------------------
+
+    def stats(self):
+        """Snapshot of pool metrics for dashboards and logging"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "reconnects": self._reconnects,
+                "created": self._created,
+                "avg_checkout_ms": (self._wait_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                "max_checkout_ms": self._wait_max * 1000,
+            }
+
+    def close(self):
+        """Close idle connections; checked-out ones close when returned"""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._open -= 1
+                self._close_quietly(connection)
+            self._lock.notify_all()
@@ -0,0 +1,745 @@
+"""
+Wedding Destination Hotel Finder - In-Process Hotel Catalog
+Shared in-memory copy of HOTEL, ROOM, amenities and AVAILABILITY that
+answers searches without a MySQL round trip and refreshes incrementally
+from the UpdatedAt columns
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+
+from amenity_index import AmenityIndex
+from availability_calendar import AvailabilityCalendar, free_count
+from capacity_planner import CapacityPlanner, RoomOption
+from hotel_queries import DEFAULT_SORT, PRICE_CEILING, RANKING_WEIGHTS, SORT_OPTIONS
+from search_engine import ColumnarHotelIndex
+from similar_venues import SimilarVenueIndex
+from stay_pricing import price_stays
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_REFRESH_INTERVAL = 30.0        # seconds; upper bound on staleness
+DEFAULT_FULL_RELOAD_INTERVAL = 3600.0  # catches deletes, which UpdatedAt can't
+DEFAULT_AVAILABILITY_DAYS = 540        # calendar horizon kept in memory
+DEFAULT_MAX_AVAILABILITY_ROWS = 2_000_000
+DEFAULT_PRICE = 300
+
+HOTEL_COLUMNS = """
+    HotelID, HotelName, StreetAddress, City, State, PhoneNumber, Email, Website,
+    Description, AverageRating, ReviewCount, VerifiedAverageRating, StarRating,
+    TotalRooms, UpdatedAt
+"""
+ROOM_COLUMNS = "RoomID, HotelID, RoomType, GuestCapacity, BasePrice, RoomStatus, UpdatedAt"
+AVAILABILITY_COLUMNS = "RoomID, AvailableDate, AvailableRoomsCount, IsBooked, PriceOverride, UpdatedAt"
+
+
+
+def best_match_score(row):
+    """Row-at-a-time hotel_queries.BEST_MATCH_SQL (stay searches)"""
+    price = min(float(row["price_per_night"]), PRICE_CEILING)
+    return (RANKING_WEIGHTS["rating"] * float(row["rating"] or 0) / 5
+            + RANKING_WEIGHTS["stars"] * (row["StarRating"] or 0) / 5
+            + RANKING_WEIGHTS["price"] * (1 - price / PRICE_CEILING))
+
+
+# In-memory counterparts of hotel_queries.SORT_OPTIONS (direction comes from there)
+SORT_KEYS = {
+    "Highest Rated": lambda row: row["rating"] or 0,
+    "Best Match": best_match_score,
+    "Lowest Price": lambda row: row["price_per_night"],
+    "Highest Price": lambda row: row["price_per_night"],
+    "Most Rooms": lambda row: row["TotalRooms"] or 0,
+}
+
+
+def latest_stamp(rows, column="UpdatedAt"):
+    """Newest non-NULL `column` value of `rows` (None if there is none)"""
+    return max((row[column] for row in rows if row.get(column) is not None), default=None)
+
+
+def options_from_groups(groups):
+    """RoomOptions from {(RoomType, GuestCapacity): [units, summed unit prices]}"""
+    return [RoomOption(room_type, capacity or 0, units, round(total / units, 2))
+            for (room_type, capacity), (units, total) in groups.items() if units]
+
+
+class HotelCatalog:
+    """
+    In-memory hotel catalog shared by every Streamlit session
+
+    Loaded once per process, then kept current by re-reading rows whose
+    UpdatedAt (CreatedAt for HOTELAMENITIES) moved past the last seen
+    watermark, at most every `refresh_interval` seconds. Deleted rows are
+    picked up by the periodic full reload or by `refresh_hotel()`, which
+    admin tools call after editing a hotel.
+
+    AVAILABILITY is held for `availability_days` from today and capped at
+    `max_availability_rows`; `search()` returns None for stays outside that
+    window (or over the cap) so callers can fall back to SQL. Stay searches
+    first prune hotels with an AvailabilityCalendar, which is built once and
+    then patched row by row as AVAILABILITY changes arrive.
+    """
+
+    def __init__(self, pool, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 full_reload_interval=DEFAULT_FULL_RELOAD_INTERVAL,
+                 availability_days=DEFAULT_AVAILABILITY_DAYS,
+                 max_availability_rows=DEFAULT_MAX_AVAILABILITY_ROWS):
+        self._pool = pool
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self.availability_days = availability_days
+        self.max_availability_rows = max_availability_rows
+
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()  # one full reload at a time, run outside _lock
+        self._loaded = False
+        self._last_refresh = 0.0
+        self._last_full_reload = 0.0
+        self._watermarks = {}
+        self._window = (None, None)
+        self._availability_complete = False
+        self._listeners = []
+        self._columns = None        # ColumnarHotelIndex, rebuilt lazily after a change
+        self._amenity_index = None  # AmenityIndex, likewise
+        self._similar = None        # SimilarVenueIndex, patched to the latest columns on use
+        self._calendar = None       # AvailabilityCalendar, built lazily, then updated in place
+        self.planner = CapacityPlanner()  # caches by room inventory, so it survives refreshes
+
+        self.hotels = {}            # HotelID -> HOTEL row dict
+        self.rooms = {}             # RoomID -> ROOM row dict
+        self.rooms_by_hotel = {}    # HotelID -> set(RoomID)
+        self.amenity_names = {}     # AmenityID -> AmenityName
+        self.hotel_amenities = {}   # HotelID -> set(AmenityID)
+        self.availability = {}      # (RoomID, date) -> (count, is_booked, price_override)
+
+        self._counters = {"hits": 0, "misses": 0, "refreshes": 0,
+                          "full_reloads": 0, "rows_refreshed": 0}
+
+    # --------------------------------------------------------
+    # Loading and refresh
+    # --------------------------------------------------------
+
+    def ensure_fresh(self):
+        """Load on first use, then refresh if the staleness bound has passed"""
+        with self._lock:
+            loaded = self._loaded
+            if loaded and not self._reload_due():
+                if time.monotonic() - self._last_refresh > self.refresh_interval:
+                    self._incremental_refresh()
+                return
+        # Only the first load makes callers wait; a periodic reload runs in
+        # one session while the others keep searching the current catalog
+        if not self._reload_lock.acquire(blocking=not loaded):
+            return
+        try:
+            with self._lock:
+                if self._loaded and not self._reload_due():
+                    return  # another session just reloaded
+                self._counters["misses"] += 1
+            self._full_reload()
+        finally:
+            self._reload_lock.release()
+
+    def force_refresh(self):
+        """Reload everything from MySQL"""
+        with self._reload_lock:
+            self._full_reload()
+
+    def refresh_hotel(self, hotel_id):
+        """Re-read one hotel with its rooms, amenities and calendar (after an admin edit or a booking)"""
+        with self._lock:
+            loaded = self._loaded
+            start, end = self._window
+        if not loaded:
+            self.ensure_fresh()
+            return
+        # The round trips run outside the lock so other sessions' searches don't wait on them
+        with self._pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(f"SELECT {HOTEL_COLUMNS} FROM HOTEL WHERE HotelID = %s", (hotel_id,))
+                hotel_rows = cursor.fetchall()
+                cursor.execute(f"SELECT {ROOM_COLUMNS} FROM ROOM WHERE HotelID = %s", (hotel_id,))
+                room_rows = cursor.fetchall()
+                cursor.execute(
+                    "SELECT HotelID, AmenityID, CreatedAt FROM HOTELAMENITIES WHERE HotelID = %s",
+                    (hotel_id,)
+                )
+                amenity_rows = cursor.fetchall()
+                availability_rows = []
+                room_ids = {row["RoomID"] for row in room_rows}
+                if room_ids:
+                    placeholders = ", ".join(["%s"] * len(room_ids))
+                    cursor.execute(
+                        f"SELECT {AVAILABILITY_COLUMNS} FROM AVAILABILITY "
+                        f"WHERE RoomID IN ({placeholders}) AND AvailableDate >= %s AND AvailableDate < %s",
+                        list(room_ids) + [start, end]
+                    )
+                    availability_rows = cursor.fetchall()
+            finally:
+                cursor.close()
+
+        with self._lock:
+            if not self._loaded:
+                return
+            # Patched below in one pass instead of row by row
+            calendar, self._calendar = self._calendar, None
+            moved_in = any(self.rooms[r]["HotelID"] != hotel_id for r in room_ids if r in self.rooms)
+            old_hotel = self.hotels.get(hotel_id)
+            old_amenities = set(self.hotel_amenities.get(hotel_id, ()))
+            old_room_ids = self.rooms_by_hotel.pop(hotel_id, set())
+            old_rooms = {room_id: self.rooms.get(room_id) for room_id in old_room_ids}
+            for room_id in old_room_ids:
+                self.rooms.pop(room_id, None)
+            self.hotels.pop(hotel_id, None)
+            self.hotel_amenities.pop(hotel_id, None)
+
+            # Only this hotel's calendar entries, old rooms included (deleted or moved away)
+            start, end = self._window
+            nights = [start + timedelta(days=d) for d in range((end - start).days)]
+            for room_id in old_room_ids | room_ids:
+                for night in nights:
+                    self.availability.pop((room_id, night), None)
+
+            # One hotel's rows say nothing about the others: leave the
+            # catalog-wide watermarks to _incremental_refresh
+            self._apply_hotels(hotel_rows, advance=False)
+            self._apply_rooms(room_rows, advance=False)
+            self._apply_hotel_amenities(amenity_rows, advance=False)
+            self._apply_availability([row for row in availability_rows if start <= row["AvailableDate"] < end],
+                                     advance=False)
+
+            rooms = {r: self.rooms[r] for r in self.rooms_by_hotel.get(hotel_id, ())}
+            if calendar is not None and not moved_in and calendar.reset_hotel(hotel_id, list(rooms.values()),
+                                                                              self.availability):
+                self._calendar = calendar
+            self._counters["refreshes"] += 1
+            # A booking only touches AVAILABILITY, which the calendar already has
+            if (self.hotels.get(hotel_id) != old_hotel or rooms != old_rooms
+                    or self.hotel_amenities.get(hotel_id, set()) != old_amenities):
+                self._notify()
+
+    def on_change(self, listener):
+        """Register a callback run (without arguments) after every refresh"""
+        self._listeners.append(listener)
+
+    def _reload_due(self):
+        return time.monotonic() - self._last_full_reload > self.full_reload_interval
+
+    def _full_reload(self):
+        # Everything is read and built into locals without the lock, then
+        # swapped in at once: searches keep using the current catalog
+        # meanwhile, and a failed reload leaves it as it was
+        today = date.today()
+        window = (today, today + timedelta(days=self.availability_days))
+        with self._pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("SELECT AmenityID, AmenityName FROM AMENITIES")
+                amenity_names = {row["AmenityID"]: row["AmenityName"] for row in cursor.fetchall()}
+                cursor.execute(f"SELECT {HOTEL_COLUMNS} FROM HOTEL")
+                hotel_rows = cursor.fetchall()
+                cursor.execute(f"SELECT {ROOM_COLUMNS} FROM ROOM")
+                room_rows = cursor.fetchall()
+                cursor.execute("SELECT HotelID, AmenityID, CreatedAt FROM HOTELAMENITIES")
+                amenity_rows = cursor.fetchall()
+
+                cursor.execute(
+                    "SELECT COUNT(*) AS n FROM AVAILABILITY WHERE AvailableDate >= %s AND AvailableDate < %s",
+                    window
+                )
+                availability_complete = cursor.fetchone()["n"] <= self.max_availability_rows
+                availability_rows = []
+                if availability_complete:
+                    cursor.execute(
+                        f"SELECT {AVAILABILITY_COLUMNS} FROM AVAILABILITY "
+                        "WHERE AvailableDate >= %s AND AvailableDate < %s",
+                        window
+                    )
+                    availability_rows = cursor.fetchall()
+            finally:
+                cursor.close()
+
+        hotels = {row["HotelID"]: row for row in hotel_rows}
+        rooms = {row["RoomID"]: row for row in room_rows}
+        rooms_by_hotel = {}
+        for row in room_rows:
+            rooms_by_hotel.setdefault(row["HotelID"], set()).add(row["RoomID"])
+        hotel_amenities = {}
+        for row in amenity_rows:
+            hotel_amenities.setdefault(row["HotelID"], set()).add(row["AmenityID"])
+        availability = {
+            (row["RoomID"], row["AvailableDate"]):
+                (row["AvailableRoomsCount"], bool(row["IsBooked"]), row["PriceOverride"])
+            for row in availability_rows
+        }
+        watermarks = {}
+        for table, rows, column in (("HOTEL", hotel_rows, "UpdatedAt"), ("ROOM", room_rows, "UpdatedAt"),
+                                    ("HOTELAMENITIES", amenity_rows, "CreatedAt"),
+                                    ("AVAILABILITY", availability_rows, "UpdatedAt")):
+            latest = latest_stamp(rows, column)
+            if latest is not None:
+                watermarks[table] = latest
+
+        with self._lock:
+            self.hotels, self.rooms, self.rooms_by_hotel = hotels, rooms, rooms_by_hotel
+            self.amenity_names, self.hotel_amenities = amenity_names, hotel_amenities
+            self.availability = availability
+            self._availability_complete = availability_complete
+            self._calendar = None
+            self._watermarks = watermarks
+            self._window = window
+            self._loaded = True
+            self._last_refresh = self._last_full_reload = time.monotonic()
+            self._counters["full_reloads"] += 1
+            self._notify()
+
+    def _incremental_refresh(self):
+        # Watermark reads are inclusive (a row committed later with the same
+        # UpdatedAt must not be missed), so rows already cached come back;
+        # only rows that differ from the cache count as changes
+        changed = 0
+        availability_changed = 0
+        with self._pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                for table, columns, apply in (
+                    ("HOTEL", HOTEL_COLUMNS, self._apply_hotels),
+                    ("ROOM", ROOM_COLUMNS, self._apply_rooms),
+                ):
+                    since = self._watermarks.get(table)
+                    if since is None:
+                        continue
+                    cursor.execute(f"SELECT {columns} FROM {table} WHERE UpdatedAt >= %s", (since,))
+                    changed += apply(cursor.fetchall())
+
+                since = self._watermarks.get("HOTELAMENITIES")
+                if since is not None:
+                    cursor.execute(
+                        "SELECT HotelID, AmenityID, CreatedAt FROM HOTELAMENITIES WHERE CreatedAt >= %s",
+                        (since,)
+                    )
+                    changed += self._apply_hotel_amenities(cursor.fetchall())
+
+                since = self._watermarks.get("AVAILABILITY")
+                if since is not None and self._availability_complete:
+                    start, end = self._window
+                    cursor.execute(
+                        f"SELECT {AVAILABILITY_COLUMNS} FROM AVAILABILITY "
+                        "WHERE UpdatedAt >= %s AND AvailableDate >= %s AND AvailableDate < %s",
+                        (since, start, end)
+                    )
+                    availability_changed = self._apply_availability(cursor.fetchall())
+                    if len(self.availability) > self.max_availability_rows:
+                        self._availability_complete = False
+                        self.availability = {}
+                        self._calendar = None
+            finally:
+                cursor.close()
+
+        self._last_refresh = time.monotonic()
+        self._counters["refreshes"] += 1
+        self._counters["rows_refreshed"] += changed + availability_changed
+        # AVAILABILITY is patched into the calendar in place; the columnar,
+        # amenity and location indexes only depend on HOTEL, ROOM and amenities
+        if changed:
+            self._notify()
+
+    def _advance(self, table, rows, column="UpdatedAt"):
+        latest = latest_stamp(rows, column)
+        if latest is not None:
+            current = self._watermarks.get(table)
+            self._watermarks[table] = latest if current is None else max(current, latest)
+
+    def _apply_hotels(self, rows, advance=True):
+        """Cache HOTEL rows; returns how many differ from what was cached"""
+        changed = 0
+        for row in rows:
+            if self.hotels.get(row["HotelID"]) != row:
+                self.hotels[row["HotelID"]] = row
+                changed += 1
+        if advance:
+            self._advance("HOTEL", rows)
+        return changed
+
+    def _apply_rooms(self, rows, advance=True):
+        """Cache ROOM rows; returns how many differ from what was cached"""
+        changed = 0
+        for row in rows:
+            previous = self.rooms.get(row["RoomID"])
+            if previous == row:
+                continue
+            changed += 1
+            if previous is None or any(previous[c] != row[c] for c in ("HotelID", "RoomType", "RoomStatus")):
+                self._calendar = None
+            if previous and previous["HotelID"] != row["HotelID"]:
+                self.rooms_by_hotel.get(previous["HotelID"], set()).discard(row["RoomID"])
+            self.rooms[row["RoomID"]] = row
+            self.rooms_by_hotel.setdefault(row["HotelID"], set()).add(row["RoomID"])
+        if advance:
+            self._advance("ROOM", rows)
+        return changed
+
+    def _apply_hotel_amenities(self, rows, advance=True):
+        """Cache HOTELAMENITIES rows; returns how many were new"""
+        changed = 0
+        for row in rows:
+            amenities = self.hotel_amenities.setdefault(row["HotelID"], set())
+            if row["AmenityID"] not in amenities:
+                amenities.add(row["AmenityID"])
+                changed += 1
+        if advance:
+            self._advance("HOTELAMENITIES", rows, column="CreatedAt")
+        return changed
+
+    def _apply_availability(self, rows, advance=True):
+        """Cache AVAILABILITY rows, patching the calendar; returns how many differ from what was cached"""
+        changed = 0
+        for row in rows:
+            key = (row["RoomID"], row["AvailableDate"])
+            entry = (row["AvailableRoomsCount"], bool(row["IsBooked"]), row["PriceOverride"])
+            if self.availability.get(key) == entry:
+                continue
+            changed += 1
+            room = self.rooms.get(row["RoomID"])
+            if self._calendar is not None and room is not None and room["RoomStatus"] == "Available":
+                delta = free_count(entry) - free_count(self.availability.get(key))
+                if not self._calendar.add(room["HotelID"], room["RoomType"], row["AvailableDate"], delta):
+                    self._calendar = None
+            self.availability[key] = entry
+        if advance:
+            self._advance("AVAILABILITY", rows)
+        return changed
+
+    def _notify(self):
+        self._columns = None
+        self._amenity_index = None
+        for listener in list(self._listeners):
+            listener()
+
+    # --------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------
+
+    def covers(self, start_date, end_date):
+        """True when the in-memory calendar can answer a stay search"""
+        if not (start_date and end_date):
+            return True
+        start, end = self._window
+        return self._availability_complete and start is not None and start <= start_date and end_date <= end
+
+    def calendar(self):
+        """AvailabilityCalendar over the in-memory window (None when AVAILABILITY is over the cap)"""
+        with self._lock:
+            if self._calendar is None and self._availability_complete:
+                start, end = self._window
+                self._calendar = AvailabilityCalendar.build(self.rooms, self.availability,
+                                                            start, (end - start).days)
+            return self._calendar
+
+    def room_stats(self, hotel_id):
+        """(average BasePrice, room count) over rooms with RoomStatus 'Available'"""
+        prices = [self.rooms[r]["BasePrice"] for r in self.rooms_by_hotel.get(hotel_id, ())
+                  if self.rooms[r]["RoomStatus"] == "Available"]
+        return (sum(prices) / len(prices) if prices else None), len(prices)
+
+    def stay_availability(self, hotel_id, start_date, end_date):
+        """In-memory equivalent of availability.stay_availability_cte for one hotel"""
+        nights = [start_date + timedelta(days=i) for i in range((end_date - start_date).days)]
+        night_free = [0] * len(nights)
+        rooms_available = 0
+        free_prices = []
+        groups = {}  # (RoomType, GuestCapacity) -> [units free all stay, summed unit prices]
+        any_room = False
+        for room_id in self.rooms_by_hotel.get(hotel_id, ()):
+            room = self.rooms[room_id]
+            if room["RoomStatus"] != "Available":
+                continue
+            any_room = True
+            room_min_free = None
+            room_prices = []
+            for i, night in enumerate(nights):
+                count, is_booked, override = self.availability.get((room_id, night), (1, False, None))
+                free = 0 if is_booked else count
+                night_free[i] += free
+                room_min_free = free if room_min_free is None else min(room_min_free, free)
+                room_prices.append(override if override is not None else room["BasePrice"])
+            rooms_available += room_min_free
+            if room_min_free > 0:
+                free_prices.append(sum(room_prices) / len(room_prices))
+                group = groups.setdefault((room["RoomType"], room["GuestCapacity"]), [0, 0.0])
+                group[0] += room_min_free
+                group[1] += room_min_free * float(free_prices[-1])
+        if not any_room:
+            return None
+        return {
+            "rooms_available": rooms_available,
+            "min_free_rooms": min(night_free),
+            "nightly_price": sum(free_prices) / len(free_prices) if free_prices else None,
+            "min_nightly_price": min(free_prices) if free_prices else None,
+            "room_options": options_from_groups(groups),
+        }
+
+    def room_options(self, hotel_id):
+        """RoomOptions over Available rooms at BasePrice (date-less capacity planning)"""
+        groups = {}
+        for room_id in self.rooms_by_hotel.get(hotel_id, ()):
+            room = self.rooms[room_id]
+            if room["RoomStatus"] == "Available":
+                group = groups.setdefault((room["RoomType"], room["GuestCapacity"]), [0, 0.0])
+                group[0] += 1
+                group[1] += float(room["BasePrice"])
+        return options_from_groups(groups)
+
+    def quote_stays(self, hotel_ids, start_date, end_date, num_rooms):
+        """
+        {HotelID: StayQuote or None} priced from the in-memory calendar
+
+        Same arguments and result as stay_pricing.fetch_stay_quotes; returns
+        None when the stay falls outside the in-memory calendar.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            if not self.covers(start_date, end_date):
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            rooms = [(hotel_id, room_id, self.rooms[room_id]["BasePrice"])
+                     for hotel_id in hotel_ids
+                     for room_id in self.rooms_by_hotel.get(hotel_id, ())
+                     if self.rooms[room_id]["RoomStatus"] == "Available"]
+            quotes = price_stays(rooms, start_date, end_date, self.availability, num_rooms)
+        return {hotel_id: quotes.get(hotel_id) for hotel_id in hotel_ids}
+
+    def amenity_index(self):
+        """AmenityIndex over HOTELAMENITIES (rebuilt after changes)"""
+        with self._lock:
+            if self._amenity_index is None:
+                self._amenity_index = AmenityIndex(self.amenity_names, self.hotel_amenities)
+            return self._amenity_index
+
+    def columns(self):
+        """Columnar snapshot of the catalog for date-less searches (rebuilt after changes)"""
+        with self._lock:
+            if self._columns is None:
+                records = []
+                for hotel_id, hotel in self.hotels.items():
+                    avg_price, _ = self.room_stats(hotel_id)
+                    records.append({
+                        "hotel_id": hotel_id,
+                        "city": hotel["City"],
+                        "state": hotel["State"],
+                        "price": avg_price if avg_price is not None else DEFAULT_PRICE,
+                        "rating": hotel["AverageRating"],
+                        "star_rating": hotel["StarRating"],
+                        "total_rooms": hotel["TotalRooms"],
+                        "capacity": sum(self.rooms[r]["GuestCapacity"] or 0
+                                        for r in self.rooms_by_hotel.get(hotel_id, ())
+                                        if self.rooms[r]["RoomStatus"] == "Available"),
+                        "amenity_ids": self.hotel_amenities.get(hotel_id, ()),
+                    })
+                self._columns = ColumnarHotelIndex(records, amenity_bits=self.amenity_index().bit)
+            return self._columns
+
+    def similar_venues(self):
+        """SimilarVenueIndex over the current columns (patched, not rebuilt, after changes)"""
+        with self._lock:
+            columns = self.columns()
+            if self._similar is None:
+                self._similar = SimilarVenueIndex(columns)
+            elif self._similar.columns is not columns:
+                self._similar = self._similar.updated(columns)
+            return self._similar
+
+    def comparison_peers(self, hotel_id, price=None, limit=5):
+        """
+        (HotelID, name, price_per_night, rating) of a hotel's comparison peers
+
+        The `limit` most similar venues (SimilarVenueIndex); `price`
+        compares the hotel at that nightly price instead of its average
+        base price. Empty if the hotel is not in the catalog.
+        """
+        self.ensure_fresh()
+        similar = self.similar_venues()
+        columns = similar.columns
+        peers = []
+        with self._lock:
+            for peer_id, _ in similar.neighbors(hotel_id, limit, price):
+                peer, p = self.hotels.get(peer_id), columns.position(peer_id)
+                if peer is not None:
+                    peers.append((peer_id, peer["HotelName"], float(columns.price[p]), float(columns.rating[p])))
+        return peers
+
+    def search(self, location=None, budget_filter=None, min_rating=None,
+               start_date=None, end_date=None, sort_by=DEFAULT_SORT, after=None, limit=100,
+               amenities_all=(), amenities_any=(), rooms_needed=1, guest_count=None):
+        """
+        Same contract as hotel_queries.build_hotel_search_query, answered in memory
+
+        Returns rows shaped like the SQL result set (HotelID, name, location,
+        price_per_night, rooms, amenities, sort_key, ...), or None when the
+        stay falls outside the in-memory calendar. Date-less searches run on
+        the columnar snapshot; only the returned page is turned into dicts.
+        Stay searches skip hotels with fewer than `rooms_needed` rooms free
+        on some night, answered for every hotel at once by the calendar.
+
+        With `guest_count`, hotels that cannot seat every guest are left out
+        and each row carries `room_plan`, the cheapest CapacityPlanner mix
+        (for a stay: rooms free every night, at their stay prices).
+        """
+        if sort_by not in SORT_OPTIONS:
+            raise ValueError(f"Unknown sort option: {sort_by}")
+        self.ensure_fresh()
+        stay_query = bool(start_date and end_date and end_date > start_date)
+
+        with self._lock:
+            if stay_query and not self.covers(start_date, end_date):
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+
+            if not stay_query:
+                columns = self.columns()
+                mask = columns.filter_mask(location=location, max_price=budget_filter, min_rating=min_rating,
+                                           min_capacity=guest_count, amenities_all=amenities_all,
+                                           amenities_any=amenities_any)
+                positions, keys = columns.search(sort_by, mask=mask, after=after, limit=limit)
+                rows = []
+                for position, key in zip(positions.tolist(), keys.tolist()):
+                    hotel_id = int(columns.hotel_id[position])
+                    _, room_count = self.room_stats(hotel_id)
+                    row = self._result_row(hotel_id, float(columns.price[position]), room_count)
+                    row["sort_key"] = key
+                    rows.append(row)
+                if guest_count:
+                    plans = self.planner.plan_many(guest_count, {row["HotelID"]: self.room_options(row["HotelID"])
+                                                                 for row in rows})
+                    for row in rows:
+                        row["room_plan"] = plans[row["HotelID"]]
+                return rows
+
+            states = set(location.states) if location is not None else None
+            cities = set(location.cities) if location is not None else None
+            sort_key = SORT_KEYS[sort_by]
+            descending = SORT_OPTIONS[sort_by][1]
+            amenity_index = self.amenity_index()
+            # Hotel-wide min over the nights; 0 means no room is free all stay
+            night_free = self.calendar().min_free(start_date, end_date)
+            rooms_needed = max(rooms_needed or 1, 1)
+
+            rows = []
+            options = {}
+            for hotel_id, hotel in self.hotels.items():
+                if night_free.get(hotel_id, 0) < rooms_needed:
+                    continue
+                if location is not None and hotel["State"] not in states \
+                        and (hotel["City"], hotel["State"]) not in cities:
+                    continue
+                rating = hotel["AverageRating"]
+                if min_rating and (rating is None or rating < min_rating):
+                    continue
+                if not amenity_index.matches(hotel_id, amenities_all, amenities_any):
+                    continue
+
+                stay = self.stay_availability(hotel_id, start_date, end_date)
+                if not stay or stay["rooms_available"] <= 0:
+                    continue
+                avg_price, _ = self.room_stats(hotel_id)
+                price = stay["nightly_price"] or avg_price or DEFAULT_PRICE
+                if budget_filter and price > budget_filter:
+                    continue
+
+                row = self._result_row(hotel_id, price, stay["rooms_available"], stay)
+                row["sort_key"] = key = sort_key(row)
+
+                if after is not None:
+                    after_key, after_id = after
+                    if descending and not (key < after_key or (key == after_key and hotel_id < after_id)):
+                        continue
+                    if not descending and not (key > after_key or (key == after_key and hotel_id > after_id)):
+                        continue
+                rows.append(row)
+                options[hotel_id] = stay["room_options"]
+
+            if guest_count:
+                # One batched solve over every candidate hotel
+                plans = self.planner.plan_many(guest_count, options)
+                rows = [row for row in rows if plans[row["HotelID"]] is not None]
+                for row in rows:
+                    row["room_plan"] = plans[row["HotelID"]]
+
+        rows.sort(key=lambda row: (row["sort_key"], row["HotelID"]), reverse=descending)
+        return rows[:limit]
+
+    def amenity_facets(self, location=None, budget_filter=None, min_rating=None,
+                       start_date=None, end_date=None, amenities_all=(), amenities_any=(), rooms_needed=1,
+                       guest_count=None):
+        """
+        {AmenityID: hotel count} over every hotel matching the search filters
+
+        Counts the whole result set, not one page. Returns None when the stay
+        falls outside the in-memory calendar.
+        """
+        filters = dict(location=location, budget_filter=budget_filter, min_rating=min_rating,
+                       amenities_all=amenities_all, amenities_any=amenities_any)
+        if not (start_date and end_date and end_date > start_date):
+            self.ensure_fresh()
+            with self._lock:
+                columns = self.columns()
+                filters["max_price"] = filters.pop("budget_filter")
+                return columns.facet_counts(columns.filter_mask(min_capacity=guest_count, **filters))
+
+        rows = self.search(start_date=start_date, end_date=end_date, rooms_needed=rooms_needed,
+                           guest_count=guest_count, limit=len(self.hotels) or 1, **filters)
+        if rows is None:
+            return None
+        return self.amenity_index().facet_counts(row["HotelID"] for row in rows)
+
+    def _result_row(self, hotel_id, price, rooms, stay=None):
+        hotel = self.hotels[hotel_id]
+        return {
+            "HotelID": hotel_id,
+            "name": hotel["HotelName"],
+            "City": hotel["City"],
+            "State": hotel["State"],
+            "location": f"{hotel['City']}, {hotel['State']}",
+            "rating": hotel["AverageRating"],
+            "ReviewCount": hotel["ReviewCount"],
+            "VerifiedAverageRating": hotel["VerifiedAverageRating"],
+            "phone": hotel["PhoneNumber"],
+            "email": hotel["Email"],
+            "website": hotel["Website"],
+            "address": hotel["StreetAddress"],
+            "Description": hotel["Description"],
+            "price_per_night": price,
+            "rooms": rooms,
+            "amenities": ", ".join(self.amenity_index().amenities(hotel_id)) or None,
+            "StarRating": hotel["StarRating"],
+            "TotalRooms": hotel["TotalRooms"],
+            "min_free_rooms": stay["min_free_rooms"] if stay else None,
+            "room_plan": None,
+        }
+
+    def location_pairs(self):
+        """Distinct (City, State) pairs, for building a LocationIndex"""
+        self.ensure_fresh()
+        with self._lock:
+            return {(h["City"], h["State"]) for h in self.hotels.values()}
+
+    def stats(self):
+        """Hit/miss/refresh counters and in-memory row counts"""
+        with self._lock:
+            return dict(
+                self._counters,
+                hotels=len(self.hotels),
+                rooms=len(self.rooms),
+                availability_rows=len(self.availability),
+                availability_complete=self._availability_complete,
+                calendar=self._calendar.stats() if self._calendar is not None else None,
+                planner=self.planner.stats(),
+                similar_venues=self._similar.stats() if self._similar is not None else None,
+                seconds_since_refresh=round(time.monotonic() - self._last_refresh, 1) if self._loaded else None,
+            )
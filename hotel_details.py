@@ -0,0 +1,109 @@
+"""
+Wedding Destination Hotel Finder - Hotel Details Queries
+Independent reads behind the Details page, shaped as
+`fn(connection, ...)` so async_queries.QueryExecutor can run them
+concurrently
+"""
+
+from async_queries import QueryCall
+from availability import stay_availability_cte
+
+# ============================================================
+# QUERIES
+# ============================================================
+
+def fetch_hotel(connection, hotel_id):
+    """Current HOTEL row with its review aggregates (None if deleted)"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT HotelID, HotelName, City, State, AverageRating, ReviewCount,
+                   VerifiedAverageRating, StarRating, TotalRooms, CheckInTime, CheckOutTime
+            FROM HOTEL
+            WHERE HotelID = %s
+        """, (hotel_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def fetch_reviews(connection, hotel_id, limit=5):
+    """Most recent reviews, verified stays first"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT rv.Title, rv.ReviewText, rv.NumericRating, rv.IsVerifiedPurchase,
+                   rv.HelpfulCount, rv.CreatedAt, u.FirstName
+            FROM REVIEW rv
+            JOIN `USER` u ON u.UserID = rv.UserID
+            WHERE rv.HotelID = %s
+            ORDER BY rv.IsVerifiedPurchase DESC, rv.CreatedAt DESC
+            LIMIT %s
+        """, (hotel_id, limit))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def fetch_room_types(connection, hotel_id, check_in=None, check_out=None):
+    """
+    Rooms free per RoomType with the cheapest nightly price
+
+    For a stay, counts room units free on every night and prices them from
+    AVAILABILITY.PriceOverride; otherwise counts Available rooms at BasePrice.
+    """
+    cursor = connection.cursor(dictionary=True)
+    try:
+        if check_in and check_out and check_out > check_in:
+            cte, params = stay_availability_cte(check_in, check_out, hotel_ids=[hotel_id])
+            cursor.execute(cte + """
+                SELECT r.RoomType, SUM(rs.min_free) AS rooms_available,
+                       MIN(rs.avg_price) AS min_price, MAX(r.GuestCapacity) AS max_capacity
+                FROM room_stay rs
+                JOIN ROOM r ON r.RoomID = rs.RoomID
+                GROUP BY r.RoomType
+                ORDER BY min_price
+            """, params)
+        else:
+            cursor.execute("""
+                SELECT RoomType, COUNT(*) AS rooms_available,
+                       MIN(BasePrice) AS min_price, MAX(GuestCapacity) AS max_capacity
+                FROM ROOM
+                WHERE HotelID = %s AND RoomStatus = 'Available'
+                GROUP BY RoomType
+                ORDER BY min_price
+            """, (hotel_id,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def fetch_similar_hotels(connection, hotel_id, state, price, limit=5):
+    """
+    Hotels in the same state closest in nightly price (HOTEL_SEARCH_SUMMARY)
+
+    The Details page takes its peers from the catalog
+    (HotelCatalog.comparison_peers); this is its fallback.
+    """
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT HotelID, HotelName AS name, AverageRating AS rating, AvgPrice AS price_per_night
+            FROM HOTEL_SEARCH_SUMMARY
+            WHERE State = %s AND HotelID <> %s
+            ORDER BY ABS(AvgPrice - %s), HotelID
+            LIMIT %s
+        """, (state, hotel_id, price, limit))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def detail_calls(hotel, check_in=None, check_out=None, timeout=None):
+    """{name: QueryCall} for everything the Details page loads for a hotel_records.Hotel"""
+    hotel_id = hotel.hotel_id
+    return {
+        "hotel": QueryCall(fetch_hotel, hotel_id, timeout=timeout),
+        "reviews": QueryCall(fetch_reviews, hotel_id, timeout=timeout),
+        "room_types": QueryCall(fetch_room_types, hotel_id, check_in, check_out, timeout=timeout),
+    }
@@ -0,0 +1,245 @@
+"""
+Wedding Destination Hotel Finder - Hotel Search Queries
+SQL builders shared by the Streamlit app and the benchmarks
+"""
+
+from amenity_index import amenity_mask_predicate, amenity_predicate
+from availability import stay_availability_cte
+from location_index import location_predicate
+
+# ============================================================
+# HOTEL SEARCH QUERY
+# ============================================================
+#
+# Room statistics and the amenity list are aggregated in their own derived
+# tables and joined 1:1 on HotelID. Joining ROOM and HOTELAMENITIES in the
+# same GROUP BY would produce rooms x amenities rows per hotel and repeat
+# every BasePrice once per amenity inside AVG().
+#
+# Both are LATERAL (MySQL 8.0.14+) and correlated on h.HotelID, so they are
+# evaluated only for the HOTEL rows that pass the location / rating filters,
+# through the HotelID indexes, instead of aggregating all of ROOM and
+# HOTELAMENITIES on every search (the same restriction search_summary
+# applies with its HotelID IN list).
+
+ROOM_STATS_SQL = """
+    SELECT AVG(r.BasePrice) AS avg_price,
+           COUNT(*) AS room_count
+    FROM ROOM r
+    WHERE r.HotelID = h.HotelID AND r.RoomStatus = 'Available'
+"""
+
+AMENITY_LIST_SQL = """
+    SELECT GROUP_CONCAT(a.AmenityName ORDER BY a.AmenityName SEPARATOR ', ') AS amenities
+    FROM HOTELAMENITIES ha
+    JOIN AMENITIES a ON a.AmenityID = ha.AmenityID
+    WHERE ha.HotelID = h.HotelID
+"""
+
+# "Best Match" ranking: weighted blend of guest rating, star rating and
+# price (cheaper scores higher, capped at PRICE_CEILING). search_engine
+# evaluates the same formula over NumPy columns.
+RANKING_WEIGHTS = {"rating": 0.5, "stars": 0.2, "price": 0.3}
+PRICE_CEILING = 2000
+
+BEST_MATCH_SQL = (
+    f"({RANKING_WEIGHTS['rating']} * COALESCE(h.AverageRating, 0) / 5"
+    f" + {RANKING_WEIGHTS['stars']} * COALESCE(h.StarRating, 0) / 5"
+    f" + {RANKING_WEIGHTS['price']} * (1 - LEAST({{price}}, {PRICE_CEILING}) / {PRICE_CEILING}))"
+)
+
+# Results page sort options: (sort key, descending). {price} is replaced by
+# the stay-aware price expression when the query is built.
+SORT_OPTIONS = {
+    "Highest Rated": ("COALESCE(h.AverageRating, 0)", True),
+    "Best Match": (BEST_MATCH_SQL, True),
+    "Lowest Price": ("{price}", False),
+    "Highest Price": ("{price}", True),
+    "Most Rooms": ("COALESCE(h.TotalRooms, 0)", True),
+}
+DEFAULT_SORT = "Highest Rated"
+
+
+def build_hotel_search_query(location=None, budget_filter=None, min_rating=None,
+                             start_date=None, end_date=None, sort_by=DEFAULT_SORT,
+                             after=None, limit=100, amenities_all=(), amenities_any=(),
+                             rooms_needed=1):
+    """
+    Build the Search / Results page query
+
+    `location` is a LocationMatch from LocationIndex.resolve() (None for
+    all locations). Returns (sql, params). One output row per hotel; when
+    start_date and end_date are given the stay-availability CTE replaces
+    the RoomStatus room count and base-price average. `amenities_all` /
+    `amenities_any` are AmenityIDs the hotel must have all / one of. For a
+    stay, `rooms_needed` is the room block size: the hotel must have that
+    many rooms free on every night (hotel_stay.min_free_rooms).
+
+    Results are ordered by (sort key, HotelID) and paged with a keyset
+    cursor: pass the (sort_key, HotelID) of the last row of the previous
+    page as `after`. Every page costs the same as the first, unlike OFFSET.
+    """
+    if sort_by not in SORT_OPTIONS:
+        raise ValueError(f"Unknown sort option: {sort_by}")
+
+    params = []
+    stay_query = bool(start_date and end_date and end_date > start_date)
+    if stay_query:
+        query, params = stay_availability_cte(start_date, end_date)
+        price_expr = "COALESCE(av.nightly_price, rs.avg_price, 300)"
+        rooms_expr = "COALESCE(av.rooms_available, 0)"
+        stay_columns = ",\n        av.min_free_rooms"
+    else:
+        query = ""
+        price_expr = "COALESCE(rs.avg_price, 300)"
+        rooms_expr = "COALESCE(rs.room_count, 0)"
+        stay_columns = ""
+
+    sort_expr, descending = SORT_OPTIONS[sort_by]
+    sort_expr = sort_expr.format(price=price_expr)
+
+    query += f"""
+    SELECT
+        h.HotelID,
+        h.HotelName as name,
+        h.City,
+        h.State,
+        CONCAT(h.City, ', ', h.State) as location,
+        h.AverageRating as rating,
+        h.ReviewCount,
+        h.VerifiedAverageRating,
+        h.PhoneNumber as phone,
+        h.Email as email,
+        h.Website as website,
+        h.StreetAddress as address,
+        h.Description,
+        {price_expr} as price_per_night,
+        {rooms_expr} as rooms,
+        am.amenities,
+        h.StarRating,
+        h.TotalRooms,
+        {sort_expr} as sort_key{stay_columns}
+    FROM HOTEL h
+    LEFT JOIN LATERAL ({ROOM_STATS_SQL}) rs ON TRUE
+    LEFT JOIN LATERAL ({AMENITY_LIST_SQL}) am ON TRUE
+    """
+
+    if stay_query:
+        query += """
+    JOIN hotel_stay av ON av.HotelID = h.HotelID AND av.rooms_available > 0
+    """
+
+    query += " WHERE 1=1"
+
+    if location is not None:
+        predicate, location_params = location_predicate(location)
+        query += f" AND {predicate}"
+        params.extend(location_params)
+
+    if budget_filter:
+        query += f" AND {price_expr} <= %s"
+        params.append(budget_filter)
+
+    if min_rating:
+        query += " AND h.AverageRating >= %s"
+        params.append(min_rating)
+
+    if stay_query and rooms_needed and rooms_needed > 1:
+        query += " AND av.min_free_rooms >= %s"
+        params.append(rooms_needed)
+
+    if amenities_all or amenities_any:
+        predicate, amenity_params = amenity_predicate(amenities_all, amenities_any)
+        query += f" AND {predicate}"
+        params.extend(amenity_params)
+
+    return _keyset_page(query, params, sort_expr, descending, after, limit)
+
+
+def _keyset_page(query, params, sort_expr, descending, after, limit):
+    """Append the keyset cursor, ORDER BY (sort_key, HotelID) and LIMIT"""
+    if after is not None:
+        after_key, after_id = after
+        op = "<" if descending else ">"
+        query += f" AND ({sort_expr} {op} %s OR ({sort_expr} = %s AND h.HotelID {op} %s))"
+        params.extend([after_key, after_key, after_id])
+
+    direction = "DESC" if descending else "ASC"
+    query += f" ORDER BY sort_key {direction}, h.HotelID {direction} LIMIT %s"
+    params.append(limit)
+
+    return query, params
+
+
+# ============================================================
+# SUMMARY SEARCH QUERY
+# ============================================================
+#
+# Date-less searches can read HOTEL_SEARCH_SUMMARY instead: one
+# pre-aggregated row per hotel kept by search_summary.py, so a search is a
+# single-table scan (idx_state_city for a location) with no ROOM /
+# HOTELAMENITIES aggregation per request. Rows trail the source tables by
+# at most one refresher interval.
+
+def build_summary_search_query(location=None, budget_filter=None, min_rating=None,
+                               sort_by=DEFAULT_SORT, after=None, limit=100,
+                               amenities_all=(), amenities_any=()):
+    """
+    Build a date-less Search / Results query over HOTEL_SEARCH_SUMMARY
+
+    Same arguments (minus the stay dates), output columns and keyset
+    paging as build_hotel_search_query(). Amenity filters test the
+    summary's AmenityMask when every AmenityID fits in it.
+    """
+    if sort_by not in SORT_OPTIONS:
+        raise ValueError(f"Unknown sort option: {sort_by}")
+
+    price_expr = "h.AvgPrice"
+    sort_expr, descending = SORT_OPTIONS[sort_by]
+    sort_expr = sort_expr.format(price=price_expr)
+
+    query = f"""
+    SELECT
+        h.HotelID,
+        h.HotelName as name,
+        h.City,
+        h.State,
+        CONCAT(h.City, ', ', h.State) as location,
+        h.AverageRating as rating,
+        h.ReviewCount,
+        h.VerifiedAvgRating as VerifiedAverageRating,
+        h.PhoneNumber as phone,
+        h.Email as email,
+        h.Website as website,
+        h.StreetAddress as address,
+        h.Description,
+        {price_expr} as price_per_night,
+        h.RoomCount as rooms,
+        h.Amenities as amenities,
+        h.StarRating,
+        h.TotalRooms,
+        {sort_expr} as sort_key
+    FROM HOTEL_SEARCH_SUMMARY h
+    WHERE 1=1"""
+    params = []
+
+    if location is not None:
+        predicate, location_params = location_predicate(location)
+        query += f" AND {predicate}"
+        params.extend(location_params)
+
+    if budget_filter:
+        query += f" AND {price_expr} <= %s"
+        params.append(budget_filter)
+
+    if min_rating:
+        query += " AND h.AverageRating >= %s"
+        params.append(min_rating)
+
+    if amenities_all or amenities_any:
+        mask_filter = amenity_mask_predicate(amenities_all, amenities_any)
+        predicate, amenity_params = mask_filter or amenity_predicate(amenities_all, amenities_any)
+        query += f" AND {predicate}"
+        params.extend(amenity_params)
+
+    return _keyset_page(query, params, sort_expr, descending, after, limit)
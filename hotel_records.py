@@ -0,0 +1,146 @@
+"""
+Wedding Destination Hotel Finder - Hotel Records
+Compact, typed hotel records for the result pages and a process-wide
+store for them, so each Streamlit session keeps only hotel IDs
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_RATING = 4.5
+DEFAULT_PRICE = 300
+DEFAULT_DESCRIPTION = "Beautiful venue for your special day"
+DEFAULT_AMENITIES = "Amenities available"
+DEFAULT_MAX_RECORDS = 50_000  # Hotel records kept across every session's searches
+
+
+class Hotel(namedtuple("Hotel", [
+    "hotel_id", "name", "location", "city", "state", "rating", "review_count", "verified_rating",
+    "price_per_night", "rooms", "total_rooms", "min_free_rooms", "room_plan", "stay_quote",
+    "amenities", "star_rating", "phone", "email", "website", "address", "description", "sort_key",
+])):
+    """
+    One search result: catalog fields plus the offer for the current stay
+
+    A tuple with no per-instance __dict__, built straight from a search
+    row. Records are immutable; use `_replace()` for a changed copy.
+    """
+    __slots__ = ()
+
+    @property
+    def category(self):
+        return f"{self.star_rating}-Star Hotel" if self.star_rating else "Luxury Hotel"
+
+    @classmethod
+    def from_row(cls, row):
+        """Record from a dict row (HotelCatalog.search or a dictionary cursor)"""
+        return _convert([row.get(column, default) for column, default in ROW_COLUMNS])
+
+
+# Search row column feeding each Hotel field, with its default when absent
+ROW_COLUMNS = (
+    ("HotelID", None), ("name", ""), ("location", ""), ("City", ""), ("State", ""),
+    ("rating", None), ("ReviewCount", None), ("VerifiedAverageRating", None),
+    ("price_per_night", None), ("rooms", None), ("TotalRooms", None), ("min_free_rooms", None),
+    ("room_plan", None), ("stay_quote", None), ("amenities", DEFAULT_AMENITIES), ("StarRating", 4),
+    ("phone", ""), ("email", ""), ("website", ""), ("address", ""),
+    ("Description", DEFAULT_DESCRIPTION), ("sort_key", None),
+)
+
+
+def _convert(values):
+    """Hotel from raw ROW_COLUMNS values (DECIMAL -> float, NULL counts -> 0)"""
+    (hotel_id, name, location, city, state, rating, review_count, verified, price, rooms,
+     total_rooms, min_free, *rest) = values
+    return Hotel(
+        hotel_id, name, location, city, state,
+        float(rating) if rating else DEFAULT_RATING,
+        int(review_count or 0),
+        float(verified) if verified is not None else None,
+        float(price) if price else DEFAULT_PRICE,
+        int(rooms or 0),
+        int(total_rooms or 0),
+        int(min_free) if min_free is not None else None,
+        *rest,
+    )
+
+
+def row_mapper(column_names):
+    """
+    fn(row) -> Hotel for tuple rows with these column names
+
+    Column positions are resolved once, so each row is read by index with
+    no intermediate dict: `map(row_mapper(cursor.column_names), rows)`.
+    """
+    index = {name: i for i, name in enumerate(column_names)}
+    positions = [(index.get(column), default) for column, default in ROW_COLUMNS]
+
+    def to_hotel(row):
+        return _convert([default if i is None else row[i] for i, default in positions])
+    return to_hotel
+
+
+def hotels_from_cursor(cursor):
+    """Hotel records for the rest of an executed (non-dictionary) cursor's result set"""
+    return list(map(row_mapper(cursor.column_names), cursor.fetchall()))
+
+
+# ============================================================
+# SHARED STORE
+# ============================================================
+
+class HotelRecords:
+    """
+    Hotel records shared by every session, keyed by (offer key, HotelID)
+
+    The offer key is whatever shapes the per-stay fields of a record
+    (dates, guest count, room block), so sessions searching the same stay
+    share one copy of each hotel. Session state holds only the HotelIDs
+    of its results and selection and reads records back from here. Least
+    recently used records are evicted past `max_entries`; a caller that
+    misses re-runs its search.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_RECORDS):
+        self.max_entries = max_entries
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"stored": 0, "hits": 0, "misses": 0}
+
+    def put(self, offer_key, hotels):
+        """Store records; returns their HotelIDs in order (what the session keeps)"""
+        with self._lock:
+            for hotel in hotels:
+                key = (offer_key, hotel.hotel_id)
+                self._records[key] = hotel
+                self._records.move_to_end(key)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+            self._counters["stored"] += len(hotels)
+        return [hotel.hotel_id for hotel in hotels]
+
+    def get(self, offer_key, hotel_id):
+        """The stored record, or None if it was never stored or has been evicted"""
+        return self.get_many(offer_key, [hotel_id])[0] if hotel_id is not None else None
+
+    def get_many(self, offer_key, hotel_ids):
+        """Records (None where missing) for HotelIDs, in order"""
+        with self._lock:
+            hotels = []
+            for hotel_id in hotel_ids:
+                hotel = self._records.get((offer_key, hotel_id))
+                if hotel is not None:
+                    self._records.move_to_end((offer_key, hotel_id))
+                hotels.append(hotel)
+            misses = hotels.count(None)
+            self._counters["hits"] += len(hotels) - misses
+            self._counters["misses"] += misses
+        return hotels
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, records=len(self._records))
@@ -0,0 +1,185 @@
+"""
+Wedding Destination Hotel Finder - Location Resolution
+Maps free-text destinations ("Hawaii", "maui", "CA") to canonical
+City/State keys so the search query can use indexed equality predicates
+"""
+
+import re
+from collections import namedtuple
+
+# ============================================================
+# REFERENCE DATA
+# ============================================================
+
+US_STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC",
+    "florida": "FL", "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+    "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY", "louisiana": "LA",
+    "maine": "ME", "maryland": "MD", "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+    "mississippi": "MS", "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
+    "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC", "south dakota": "SD",
+    "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA",
+    "washington": "WA", "washington dc": "DC", "west virginia": "WV", "wisconsin": "WI",
+    "wyoming": "WY",
+}
+
+MIN_PREFIX_LENGTH = 2
+MAX_COMPLETIONS = 50
+
+
+class LocationMatch(namedtuple("LocationMatch", ["states", "cities"])):
+    """Resolved location: state codes and (City, State) pairs"""
+
+    __slots__ = ()
+
+    def is_empty(self):
+        return not self.states and not self.cities
+
+
+def normalize(text):
+    """Lower-case, drop punctuation and collapse whitespace"""
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", text.lower())).strip()
+
+
+# ============================================================
+# PREFIX TRIE
+# ============================================================
+
+class _Trie:
+    """Character trie mapping normalized keys to sets of location keys"""
+
+    __slots__ = ("root",)
+
+    _TERMINAL = "\0"
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, key, value):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(self._TERMINAL, set()).add(value)
+
+    def _node(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    def exact(self, key):
+        node = self._node(key)
+        return set(node.get(self._TERMINAL, ())) if node else set()
+
+    def complete(self, prefix, limit=MAX_COMPLETIONS):
+        """Values for every key starting with `prefix` (at most `limit`)"""
+        node = self._node(prefix)
+        found = set()
+        stack = [node] if node else []
+        while stack and len(found) < limit:
+            node = stack.pop()
+            for char, child in node.items():
+                if char == self._TERMINAL:
+                    found.update(child)
+                else:
+                    stack.append(child)
+        return found
+
+
+# ============================================================
+# LOCATION INDEX
+# ============================================================
+
+class LocationIndex:
+    """
+    In-process index of the (City, State) pairs present in HOTEL
+
+    State codes, full state names and city names all resolve to either a
+    state code or a (City, State) pair. Exact matches win over prefixes,
+    so "CA" means California rather than every city starting with "ca".
+    """
+
+    def __init__(self, locations):
+        self._trie = _Trie()
+        self.states = set()
+        self.cities = set()
+        code_to_names = {}
+        for name, code in US_STATES.items():
+            code_to_names.setdefault(code, []).append(name)
+
+        for city, state in locations:
+            if not city or not state:
+                continue
+            state = state.strip().upper()
+            city = city.strip()
+            self.cities.add((city, state))
+            self.states.add(state)
+            self._trie.insert(normalize(city), ("city", (city, state)))
+
+        for state in self.states:
+            self._trie.insert(state.lower(), ("state", state))
+            for name in code_to_names.get(state, []):
+                self._trie.insert(name, ("state", state))
+
+    @classmethod
+    def from_connection(cls, connection):
+        """Build from the distinct City/State pairs (covered by idx_state_city)"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT DISTINCT City, State FROM HOTEL")
+            return cls(cursor.fetchall())
+        finally:
+            cursor.close()
+
+    def resolve(self, text):
+        """Resolve free text such as "Maui", "hawaii", "CA" or "Miami, FL" """
+        if not text or not text.strip():
+            return LocationMatch((), ())
+
+        # "City, ST" narrows the city match to that state
+        parts = [normalize(part) for part in text.split(",")]
+        if len(parts) == 2 and parts[0] and parts[1]:
+            state_match = self._lookup(parts[1], kinds=("state",))
+            city_match = self._lookup(parts[0], kinds=("city",))
+            if state_match.states and city_match.cities:
+                cities = tuple(c for c in city_match.cities if c[1] in state_match.states)
+                if cities:
+                    return LocationMatch((), cities)
+
+        return self._lookup(normalize(text))
+
+    def _lookup(self, key, kinds=("state", "city")):
+        hits = {hit for hit in self._trie.exact(key) if hit[0] in kinds}
+        if not hits and len(key) >= MIN_PREFIX_LENGTH:
+            hits = {hit for hit in self._trie.complete(key) if hit[0] in kinds}
+
+        states = sorted(value for kind, value in hits if kind == "state")
+        # A city already covered by a matched state adds nothing to the predicate
+        cities = sorted(value for kind, value in hits if kind == "city" and value[1] not in states)
+        return LocationMatch(tuple(states), tuple(cities))
+
+
+def location_predicate(match, alias="h"):
+    """
+    SQL predicate + params for a resolved location
+
+    Uses plain equality/IN on State and City so MySQL can range-scan
+    idx_state_city instead of scanning HOTEL with LOWER()/LIKE '%x%'.
+    """
+    if match.is_empty():
+        return "1=0", []
+
+    clauses = []
+    params = []
+    if match.states:
+        clauses.append(f"{alias}.State IN ({', '.join(['%s'] * len(match.states))})")
+        params.extend(match.states)
+    for city, state in match.cities:
+        clauses.append(f"({alias}.State = %s AND {alias}.City = %s)")
+        params.extend([state, city])
+    return "(" + " OR ".join(clauses) + ")", params
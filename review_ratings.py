@@ -0,0 +1,126 @@
+"""
+Wedding Destination Hotel Finder - Review Ratings
+Running per-hotel review aggregates (12_migration_review_ratings.sql):
+the Bayesian-smoothed AverageRating formula and a drift check that
+compares the trigger-maintained columns with a full GROUP BY over REVIEW
+
+    MYSQL_HOST=localhost MYSQL_USER=root MYSQL_PASSWORD=... \
+        python -m review_ratings [--fix]
+"""
+
+import argparse
+import os
+
+from mysql.connector import Error
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Weight of the editorial BaseRating, in reviews. Must match the REVIEW
+# triggers in 12_migration_review_ratings.sql.
+PRIOR_WEIGHT = 5
+
+
+def bayesian_rating_sql(alias=None):
+    """AverageRating expression over the aggregate columns of the same HOTEL row"""
+    h = f"{alias}." if alias else ""
+    return (
+        f"ROUND(CASE WHEN {h}BaseRating IS NOT NULL"
+        f" THEN ({h}BaseRating * {PRIOR_WEIGHT} + {h}RatingSum) / ({PRIOR_WEIGHT} + {h}ReviewCount)"
+        f" WHEN {h}ReviewCount > 0 THEN {h}RatingSum / {h}ReviewCount END, 2)"
+    )
+
+
+REVIEW_TOTALS_SQL = """
+    SELECT HotelID,
+           COUNT(*) AS review_count,
+           SUM(NumericRating) AS rating_sum,
+           SUM(IsVerifiedPurchase <> 0) AS verified_count,
+           SUM(IF(IsVerifiedPurchase, NumericRating, 0)) AS verified_sum
+    FROM REVIEW
+    GROUP BY HotelID
+"""
+
+
+# ============================================================
+# DRIFT CHECK
+# ============================================================
+
+def find_drift(connection):
+    """
+    HotelIDs whose aggregate columns disagree with REVIEW
+
+    Triggers keep the columns exact; drift means rows were changed with
+    the triggers dropped (bulk loads) or by hand. One full GROUP BY over
+    REVIEW - run it nightly, not per request.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT h.HotelID
+            FROM HOTEL h
+            LEFT JOIN ({REVIEW_TOTALS_SQL}) r ON r.HotelID = h.HotelID
+            WHERE h.ReviewCount <> COALESCE(r.review_count, 0)
+               OR h.RatingSum <> COALESCE(r.rating_sum, 0)
+               OR h.VerifiedReviewCount <> COALESCE(r.verified_count, 0)
+               OR h.VerifiedRatingSum <> COALESCE(r.verified_sum, 0)
+               OR NOT (h.AverageRating <=> {bayesian_rating_sql("h")})
+        """)
+        return [hotel_id for (hotel_id,) in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def repair(connection, hotel_ids):
+    """Recompute the aggregates and AverageRating of `hotel_ids` from REVIEW"""
+    if not hotel_ids:
+        return 0
+    placeholders = ", ".join(["%s"] * len(hotel_ids))
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+            UPDATE HOTEL h
+            LEFT JOIN ({REVIEW_TOTALS_SQL}) r ON r.HotelID = h.HotelID
+            SET h.ReviewCount = COALESCE(r.review_count, 0),
+                h.RatingSum = COALESCE(r.rating_sum, 0),
+                h.VerifiedReviewCount = COALESCE(r.verified_count, 0),
+                h.VerifiedRatingSum = COALESCE(r.verified_sum, 0)
+            WHERE h.HotelID IN ({placeholders})
+        """, hotel_ids)
+        # Separate single-table UPDATE: multi-table SET order is unspecified
+        cursor.execute(
+            f"UPDATE HOTEL SET AverageRating = {bayesian_rating_sql()} WHERE HotelID IN ({placeholders})",
+            hotel_ids
+        )
+        connection.commit()
+        return len(hotel_ids)
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    import mysql.connector
+    from db_pool import connection_settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fix", action="store_true", help="recompute drifted hotels from REVIEW")
+    args = parser.parse_args()
+
+    settings = connection_settings({k.lower(): v for k, v in os.environ.items() if k.startswith("MYSQL_")})
+    settings["port"] = int(settings["port"])
+    connection = mysql.connector.connect(**settings)
+    try:
+        drifted = find_drift(connection)
+        print(f"{len(drifted)} hotels with drifted rating aggregates: {drifted[:20]}")
+        if args.fix and drifted:
+            print(f"repaired {repair(connection, drifted)} hotels")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
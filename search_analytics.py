@@ -0,0 +1,207 @@
+"""
+Wedding Destination Hotel Finder - Search Analytics
+Non-blocking logger for search, click and booking events, written to
+SEARCHQUERIES (13_migration_search_queries.sql) by a background thread in
+batched multi-row INSERTs
+"""
+
+import queue
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+from mysql.connector import Error
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+#
+# The request path only does a put_nowait() on a bounded queue: when the
+# writer falls behind (or MySQL is down) the queue fills and new events
+# are dropped and counted, never waited on. Worst-case loss on a crash is
+# one flush interval plus whatever is queued.
+
+DEFAULT_QUEUE_SIZE = 10_000     # events buffered before new ones are dropped
+DEFAULT_BATCH_SIZE = 500        # rows per INSERT statement
+DEFAULT_FLUSH_INTERVAL = 2.0    # seconds a partial batch waits before it is written
+
+EVENT_COLUMNS = (
+    "SearchKey", "SearchLocation", "CheckInDate", "CheckOutDate", "GuestCount", "RoomsNeeded",
+    "MaxBudget", "MinRating", "AmenitiesFilter", "ResultsCount", "LatencyMs",
+    "ClickedHotelID", "LeadToBooking", "CreatedAt",
+)
+
+# A click or booking arrives as a row with only SearchKey and its own
+# columns set; on the duplicate key it updates the search's row instead.
+INSERT_SQL = (
+    f"INSERT INTO SEARCHQUERIES ({', '.join(EVENT_COLUMNS)}) VALUES {{rows}} "
+    "ON DUPLICATE KEY UPDATE "
+    "ClickedHotelID = COALESCE(VALUES(ClickedHotelID), ClickedHotelID), "
+    "LeadToBooking = LeadToBooking OR VALUES(LeadToBooking)"
+)
+ROW_PLACEHOLDERS = "(" + ", ".join(["%s"] * len(EVENT_COLUMNS)) + ")"
+
+
+class SearchEvent(namedtuple("SearchEvent", [
+    "search_key", "location", "check_in", "check_out", "guest_count", "rooms_needed",
+    "max_budget", "min_rating", "amenities", "results_count", "latency_ms",
+    "clicked_hotel_id", "lead_to_booking", "created_at",
+])):
+    """One SEARCHQUERIES row, in EVENT_COLUMNS order"""
+    __slots__ = ()
+
+
+# ============================================================
+# LOGGER
+# ============================================================
+
+class SearchEventLogger:
+    """
+    Fire-and-forget search analytics
+
+    `log_search()` returns a search key the page keeps; `log_click()` and
+    `log_booking()` with that key mark the same SEARCHQUERIES row. All
+    three only enqueue. A daemon thread drains the queue and writes up to
+    `batch_size` events per INSERT, as soon as a batch is full or
+    `flush_interval` seconds after its first event. A failed INSERT drops
+    its batch (counted as `failed`) so a database outage cannot back up
+    the queue for longer than it takes to fill.
+    """
+
+    def __init__(self, pool, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self._pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._counters = {"enqueued": 0, "dropped": 0, "written": 0, "failed": 0,
+                          "batches": 0, "last_flush_ms": 0.0}
+
+    # --------------------------------------------------------
+    # Request path
+    # --------------------------------------------------------
+
+    def log_search(self, location=None, check_in=None, check_out=None, guest_count=None, rooms_needed=None,
+                   max_budget=None, min_rating=None, amenities=(), results_count=None, latency_ms=None):
+        """Enqueue a search; returns its search key"""
+        search_key = uuid.uuid4().hex
+        self._enqueue(SearchEvent(
+            search_key, location or None, check_in, check_out, guest_count, rooms_needed,
+            max_budget, min_rating, ", ".join(amenities) or None, results_count,
+            round(latency_ms, 1) if latency_ms is not None else None,
+            None, False, datetime.now(),
+        ))
+        return search_key
+
+    def log_click(self, search_key, hotel_id):
+        """Enqueue a click on a result of the search"""
+        if search_key:
+            self._enqueue(self._follow_up(search_key, hotel_id, False))
+
+    def log_booking(self, search_key, hotel_id):
+        """Enqueue a booking made from the search"""
+        if search_key:
+            self._enqueue(self._follow_up(search_key, hotel_id, True))
+
+    @staticmethod
+    def _follow_up(search_key, hotel_id, booked):
+        return SearchEvent(search_key, *([None] * 10), hotel_id, booked, datetime.now())
+
+    def _enqueue(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count("dropped")
+            return
+        self._count("enqueued")
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    # --------------------------------------------------------
+    # Writer
+    # --------------------------------------------------------
+
+    def flush(self, events):
+        """Write events in multi-row INSERTs of up to `batch_size` rows"""
+        for i in range(0, len(events), self.batch_size):
+            batch = events[i:i + self.batch_size]
+            started = time.perf_counter()
+            try:
+                with self._pool.connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute(INSERT_SQL.format(rows=", ".join([ROW_PLACEHOLDERS] * len(batch))),
+                                       [value for event in batch for value in event])
+                        connection.commit()
+                    finally:
+                        cursor.close()
+            except Error:
+                self._count("failed", len(batch))
+                continue
+            with self._lock:
+                self._counters["written"] += len(batch)
+                self._counters["batches"] += 1
+                self._counters["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    def _next_batch(self):
+        """Block for the first event, then collect until the batch is full or its deadline passes"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if batch:
+                self.flush(batch)
+        # Write what is left on shutdown
+        self.flush(self._drain())
+
+    # --------------------------------------------------------
+    # Background thread
+    # --------------------------------------------------------
+
+    def start(self):
+        """Start the writer on a daemon thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="search-analytics-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Flush queued events and stop the writer"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, queued=self._queue.qsize())
@@ -0,0 +1,163 @@
+"""
+Wedding Destination Hotel Finder - Columnar Search Engine
+Hotel catalog held as NumPy columns; filters, ranking and keyset paging
+run as batched array operations instead of loops over dicts
+"""
+
+import numpy as np
+
+from hotel_queries import PRICE_CEILING, RANKING_WEIGHTS, SORT_OPTIONS
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Column backing each Results sort option ("score" is the Best Match blend)
+SORT_COLUMNS = {
+    "Highest Rated": "rating",
+    "Best Match": "score",
+    "Lowest Price": "price",
+    "Highest Price": "price",
+    "Most Rooms": "total_rooms",
+}
+
+WORD_BITS = 64
+
+
+def to_words(mask, words):
+    """Split a Python int bitset into `words` little-endian uint64 words"""
+    return [(mask >> (WORD_BITS * w)) & 0xFFFFFFFFFFFFFFFF for w in range(words)]
+
+
+# ============================================================
+# COLUMNAR INDEX
+# ============================================================
+
+class ColumnarHotelIndex:
+    """
+    Struct-of-arrays snapshot of the hotel catalog
+
+    Built from records with keys hotel_id, city, state, price, rating,
+    star_rating, total_rooms, capacity and amenity_ids. Amenities are a
+    (hotels x words) uint64 bitset laid out by `amenity_bits` (AmenityID ->
+    bit, e.g. AmenityIndex.bit; default: dense over the IDs seen). The
+    snapshot is immutable; rebuild it when the catalog changes.
+    """
+
+    def __init__(self, records, amenity_bits=None):
+        records = list(records)
+        self.size = len(records)
+
+        if amenity_bits is None:
+            seen = sorted({a for r in records for a in r["amenity_ids"]})
+            amenity_bits = {amenity_id: i for i, amenity_id in enumerate(seen)}
+        self.amenity_bits = dict(amenity_bits)
+        self.words = max(1, -(-(max(self.amenity_bits.values(), default=0) + 1) // WORD_BITS))
+
+        self._state_codes = {}
+        self._city_codes = {}
+        state_code = [self._state_codes.setdefault(r["state"], len(self._state_codes)) for r in records]
+        city_code = [self._city_codes.setdefault((r["city"], r["state"]), len(self._city_codes)) for r in records]
+
+        self.hotel_id = np.array([r["hotel_id"] for r in records], dtype=np.int64)
+        self.state = np.array(state_code, dtype=np.int32)
+        self.city = np.array(city_code, dtype=np.int32)
+        self.price = np.array([float(r["price"]) for r in records], dtype=np.float64)
+        self.rating = np.array([float(r["rating"] or 0) for r in records], dtype=np.float64)
+        self.star_rating = np.array([r["star_rating"] or 0 for r in records], dtype=np.int8)
+        self.total_rooms = np.array([r["total_rooms"] or 0 for r in records], dtype=np.int32)
+        self.capacity = np.array([r["capacity"] or 0 for r in records], dtype=np.int32)
+        self.amenities = np.array(
+            [to_words(self._encode(r["amenity_ids"]), self.words) for r in records], dtype=np.uint64
+        ).reshape(self.size, self.words)
+        self.score = self._score()
+
+        self._position = {hotel_id: i for i, hotel_id in enumerate(self.hotel_id.tolist())}
+
+    def _score(self):
+        """Best Match score; same formula as hotel_queries.BEST_MATCH_SQL"""
+        return (
+            RANKING_WEIGHTS["rating"] * self.rating / 5
+            + RANKING_WEIGHTS["stars"] * self.star_rating / 5
+            + RANKING_WEIGHTS["price"] * (1 - np.minimum(self.price, PRICE_CEILING) / PRICE_CEILING)
+        )
+
+    def _encode(self, amenity_ids):
+        mask = 0
+        for amenity_id in amenity_ids:
+            bit = self.amenity_bits.get(amenity_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def _amenity_words(self, amenity_ids):
+        return np.array(to_words(self._encode(amenity_ids), self.words), dtype=np.uint64)
+
+    def position(self, hotel_id):
+        """Row position of a hotel in the columns (None if absent)"""
+        return self._position.get(hotel_id)
+
+    def filter_mask(self, location=None, max_price=None, min_rating=None,
+                    min_capacity=None, amenities_all=(), amenities_any=()):
+        """Boolean mask of hotels passing every filter (amenities as AmenityIDs)"""
+        mask = np.ones(self.size, dtype=bool)
+        if location is not None:
+            states = [self._state_codes[s] for s in location.states if s in self._state_codes]
+            cities = [self._city_codes[c] for c in location.cities if c in self._city_codes]
+            mask &= np.isin(self.state, states) | np.isin(self.city, cities)
+        if max_price:
+            mask &= self.price <= max_price
+        if min_rating:
+            mask &= self.rating >= min_rating
+        if min_capacity:
+            mask &= self.capacity >= min_capacity
+        if amenities_all:
+            if any(a not in self.amenity_bits for a in amenities_all):
+                mask[:] = False
+            required = self._amenity_words(amenities_all)
+            mask &= ((self.amenities & required) == required).all(axis=1)
+        if amenities_any:
+            wanted = self._amenity_words(amenities_any)
+            mask &= ((self.amenities & wanted) != 0).any(axis=1)
+        return mask
+
+    def facet_counts(self, mask=None):
+        """{AmenityID: number of hotels in `mask` offering it}"""
+        selected = self.amenities if mask is None else self.amenities[mask]
+        bits = np.unpackbits(selected.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+        counts = bits.sum(axis=0)
+        return {amenity_id: int(counts[bit]) for amenity_id, bit in self.amenity_bits.items()}
+
+    def search(self, sort_by, mask=None, after=None, limit=100):
+        """
+        Ordered page of positions for the hotels in `mask`
+
+        Orders by (sort column, hotel_id) in the option's direction and
+        seeks past `after` = (sort_key, hotel_id). Only the candidates that
+        can reach the page are fully sorted. Returns (positions, sort_keys).
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort option: {sort_by}")
+        key = getattr(self, SORT_COLUMNS[sort_by]).astype(np.float64)
+        descending = SORT_OPTIONS[sort_by][1]
+        mask = np.ones(self.size, dtype=bool) if mask is None else mask.copy()
+
+        if after is not None:
+            after_key, after_id = float(after[0]), after[1]
+            if descending:
+                mask &= (key < after_key) | ((key == after_key) & (self.hotel_id < after_id))
+            else:
+                mask &= (key > after_key) | ((key == after_key) & (self.hotel_id > after_id))
+
+        candidates = np.flatnonzero(mask)
+        # Sort ascending on a signed key so both directions share one path
+        signed = -key[candidates] if descending else key[candidates]
+        if len(candidates) > limit:
+            threshold = np.partition(signed, limit - 1)[limit - 1]
+            keep = signed <= threshold
+            candidates, signed = candidates[keep], signed[keep]
+
+        ids = self.hotel_id[candidates]
+        order = np.lexsort((-ids if descending else ids, signed))[:limit]
+        positions = candidates[order]
+        return positions, key[positions]
@@ -0,0 +1,387 @@
+"""
+Wedding Destination Hotel Finder - Search Summary Refresher
+Keeps the materialized HOTEL_SEARCH_SUMMARY and STATE_STATS tables
+(11_migration_search_summary.sql) in step with HOTEL, ROOM, amenities,
+reviews and AVAILABILITY
+
+Run from cron or a process manager:
+
+    MYSQL_HOST=localhost MYSQL_USER=root MYSQL_PASSWORD=... \
+        python -m search_summary [--once] [--full] [--interval 30]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+from mysql.connector import Error
+
+from amenity_index import SQL_MASK_BITS
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+#
+# Staleness bound: a change becomes visible in the summary within
+# refresh_interval + one refresh run (typically well under a second for a
+# few hundred queued hotels). FreeRoomNights30 covers [today, today + 30);
+# the window moves with the first refresh of each day, which rebuilds
+# every row.
+
+DEFAULT_REFRESH_INTERVAL = 30.0       # seconds between refresh runs
+DEFAULT_FULL_REBUILD_INTERVAL = 86400.0
+DEFAULT_BATCH_SIZE = 500              # hotels recomputed per transaction
+AVAILABILITY_OVERLAP_SECONDS = 60     # re-read window for late-committing bookings
+FREE_NIGHTS_WINDOW = 30
+DEFAULT_PRICE = 300
+LOCK_NAME = "wbnb_search_summary"     # GET_LOCK name: one refresher at a time
+
+SUMMARY_COLUMNS = (
+    "HotelID", "HotelName", "StreetAddress", "City", "State", "PhoneNumber", "Email",
+    "Website", "Description", "AverageRating", "StarRating", "TotalRooms", "MinPrice",
+    "AvgPrice", "RoomCount", "FreeRoomNights30", "AmenityMask", "Amenities",
+    "ReviewCount", "ReviewRatingSum", "ReviewAvgRating", "VerifiedAvgRating", "RefreshedAt",
+)
+
+# One row per hotel in {ids}; every derived table is restricted to the same
+# HotelIDs so each probes its HotelID index instead of aggregating the table.
+SUMMARY_SELECT_SQL = f"""
+    SELECT
+        h.HotelID, h.HotelName, h.StreetAddress, h.City, h.State, h.PhoneNumber,
+        h.Email, h.Website, h.Description, h.AverageRating, h.StarRating, h.TotalRooms,
+        rs.min_price,
+        COALESCE(rs.avg_price, {DEFAULT_PRICE}),
+        COALESCE(rs.room_count, 0),
+        {FREE_NIGHTS_WINDOW} * COALESCE(rs.room_count, 0) + COALESCE(fr.free_delta, 0),
+        COALESCE(am.mask, 0),
+        am.amenities,
+        h.ReviewCount,
+        h.RatingSum,
+        IF(h.ReviewCount > 0, h.RatingSum / h.ReviewCount, NULL),
+        h.VerifiedAverageRating,
+        NOW(6)
+    FROM HOTEL h
+    LEFT JOIN (
+        SELECT HotelID, MIN(BasePrice) AS min_price, AVG(BasePrice) AS avg_price,
+               COUNT(*) AS room_count
+        FROM ROOM
+        WHERE RoomStatus = 'Available' AND HotelID IN ({{ids}})
+        GROUP BY HotelID
+    ) rs ON rs.HotelID = h.HotelID
+    LEFT JOIN (
+        SELECT r.HotelID,
+               SUM(CASE WHEN av.IsBooked THEN 0 ELSE av.AvailableRoomsCount END - 1) AS free_delta
+        FROM ROOM r
+        JOIN AVAILABILITY av
+          ON av.RoomID = r.RoomID
+         AND av.AvailableDate >= CURDATE()
+         AND av.AvailableDate < CURDATE() + INTERVAL {FREE_NIGHTS_WINDOW} DAY
+        WHERE r.RoomStatus = 'Available' AND r.HotelID IN ({{ids}})
+        GROUP BY r.HotelID
+    ) fr ON fr.HotelID = h.HotelID
+    LEFT JOIN (
+        SELECT ha.HotelID,
+               BIT_OR(CASE WHEN ha.AmenityID BETWEEN 1 AND {SQL_MASK_BITS}
+                           THEN 1 << (ha.AmenityID - 1) ELSE 0 END) AS mask,
+               GROUP_CONCAT(a.AmenityName ORDER BY a.AmenityName SEPARATOR ', ') AS amenities
+        FROM HOTELAMENITIES ha
+        JOIN AMENITIES a ON a.AmenityID = ha.AmenityID
+        WHERE ha.HotelID IN ({{ids}})
+        GROUP BY ha.HotelID
+    ) am ON am.HotelID = h.HotelID
+    WHERE h.HotelID IN ({{ids}})
+"""
+
+STATE_STATS_SQL = """
+    INSERT INTO STATE_STATS (State, HotelCount, RoomCount, AvgRating, MinRating, MaxRating,
+                             AvgPrice, RefreshedAt)
+    SELECT State, COUNT(*), SUM(RoomCount), AVG(AverageRating), MIN(AverageRating), MAX(AverageRating),
+           AVG(AvgPrice), NOW(6)
+    FROM HOTEL_SEARCH_SUMMARY
+    WHERE State IN ({states})
+    GROUP BY State
+"""
+
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+
+# ============================================================
+# REFRESHER
+# ============================================================
+
+class SearchSummaryRefresher:
+    """
+    Incremental maintainer of HOTEL_SEARCH_SUMMARY and STATE_STATS
+
+    Triggers on HOTEL, ROOM, HOTELAMENITIES and REVIEW queue changed hotels
+    in HOTEL_SUMMARY_DIRTY; AVAILABILITY changes are found through its
+    UpdatedAt watermark so the booking transaction carries no trigger.
+    Each refresh recomputes the queued hotels in batches and dequeues an
+    entry only if it was not re-queued while the batch ran.
+
+    Safe to run from several processes: GET_LOCK lets one refresh at a
+    time and the others skip the run.
+    """
+
+    def __init__(self, pool, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 full_rebuild_interval=DEFAULT_FULL_REBUILD_INTERVAL,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self._pool = pool
+        self.refresh_interval = refresh_interval
+        self.full_rebuild_interval = full_rebuild_interval
+        self.batch_size = batch_size
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._counters = {"runs": 0, "skipped": 0, "full_rebuilds": 0,
+                          "hotels_refreshed": 0, "errors": 0, "last_run_ms": 0.0}
+
+    # --------------------------------------------------------
+    # Refresh
+    # --------------------------------------------------------
+
+    def refresh(self, full=False):
+        """Run one refresh; returns the number of hotels recomputed (None if another process holds the lock)"""
+        started = time.perf_counter()
+        with self._pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+                (locked,) = cursor.fetchone()
+                if locked != 1:
+                    self._counters["skipped"] += 1
+                    return None
+                try:
+                    if full or self._full_rebuild_due(connection, cursor):
+                        self._queue_all(connection, cursor)
+                    else:
+                        self._queue_availability_changes(connection, cursor)
+                    refreshed = self._drain(connection, cursor)
+                finally:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                    cursor.fetchone()
+            finally:
+                cursor.close()
+
+        self._counters["runs"] += 1
+        self._counters["hotels_refreshed"] += refreshed
+        self._counters["last_run_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return refreshed
+
+    def _full_rebuild_due(self, connection, cursor):
+        """No full rebuild yet, none today (FreeRoomNights30 window moved), or older than the interval"""
+        cursor.execute(
+            "SELECT RefreshedAt < CURDATE() OR RefreshedAt < NOW(6) - INTERVAL %s SECOND "
+            "FROM SUMMARY_REFRESH_STATE WHERE Source = 'FULL'",
+            (int(self.full_rebuild_interval),)
+        )
+        row = cursor.fetchone()
+        connection.commit()
+        return row is None or bool(row[0])
+
+    def _queue_all(self, connection, cursor):
+        """Queue every hotel and drop summary rows of deleted hotels"""
+        connection.start_transaction(isolation_level="READ COMMITTED")
+        try:
+            cursor.execute(
+                "INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) SELECT HotelID FROM HOTEL "
+                "ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6)"
+            )
+            cursor.execute(
+                "DELETE s FROM HOTEL_SEARCH_SUMMARY s "
+                "LEFT JOIN HOTEL h ON h.HotelID = s.HotelID WHERE h.HotelID IS NULL"
+            )
+            cursor.execute("DELETE FROM STATE_STATS WHERE State NOT IN (SELECT DISTINCT State FROM HOTEL)")
+            cursor.execute("SELECT MAX(UpdatedAt) FROM AVAILABILITY")
+            (watermark,) = cursor.fetchone()
+            self._set_state(cursor, "AVAILABILITY", watermark)
+            self._set_state(cursor, "FULL", None)
+            connection.commit()
+        except Error:
+            connection.rollback()
+            raise
+        self._counters["full_rebuilds"] += 1
+
+    def _queue_availability_changes(self, connection, cursor):
+        """Queue hotels whose AVAILABILITY rows changed since the watermark"""
+        connection.start_transaction(isolation_level="READ COMMITTED")
+        try:
+            cursor.execute("SELECT Watermark FROM SUMMARY_REFRESH_STATE WHERE Source = 'AVAILABILITY'")
+            row = cursor.fetchone()
+            since = row[0] if row else None
+            if since is None:
+                # No watermark yet: everything is covered by the full rebuild
+                since = "1970-01-01"
+            cursor.execute("SELECT MAX(UpdatedAt) FROM AVAILABILITY WHERE UpdatedAt > %s", (since,))
+            (watermark,) = cursor.fetchone()
+            if watermark is not None:
+                # Rows stamped just before the old watermark may have committed
+                # after the last run; re-reading a short overlap catches them.
+                cursor.execute(
+                    "INSERT INTO HOTEL_SUMMARY_DIRTY (HotelID) "
+                    "SELECT DISTINCT r.HotelID FROM AVAILABILITY av JOIN ROOM r ON r.RoomID = av.RoomID "
+                    "WHERE av.UpdatedAt > %s - INTERVAL %s SECOND "
+                    "ON DUPLICATE KEY UPDATE MarkedAt = CURRENT_TIMESTAMP(6)",
+                    (since, AVAILABILITY_OVERLAP_SECONDS)
+                )
+                self._set_state(cursor, "AVAILABILITY", watermark)
+            connection.commit()
+        except Error:
+            connection.rollback()
+            raise
+
+    def _drain(self, connection, cursor):
+        """Recompute queued hotels, oldest first, `batch_size` per transaction"""
+        refreshed = 0
+        while True:
+            cursor.execute(
+                "SELECT HotelID, MarkedAt FROM HOTEL_SUMMARY_DIRTY ORDER BY MarkedAt LIMIT %s",
+                (self.batch_size,)
+            )
+            queued = cursor.fetchall()
+            connection.commit()
+            if not queued:
+                break
+            self._refresh_batch(connection, cursor, queued)
+            refreshed += len(queued)
+            if len(queued) < self.batch_size:
+                break
+
+        cursor.execute(
+            "INSERT INTO SUMMARY_REFRESH_STATE (Source, Watermark, RefreshedAt) "
+            "VALUES ('DIRTY', NULL, NOW(6)) ON DUPLICATE KEY UPDATE RefreshedAt = NOW(6)"
+        )
+        connection.commit()
+        return refreshed
+
+    def _refresh_batch(self, connection, cursor, queued):
+        hotel_ids = [hotel_id for hotel_id, _ in queued]
+        ids = _placeholders(hotel_ids)
+        # READ COMMITTED: the source reads below are plain consistent reads,
+        # so bookings updating AVAILABILITY never wait on the refresher.
+        connection.start_transaction(isolation_level="READ COMMITTED")
+        try:
+            cursor.execute(f"SELECT DISTINCT State FROM HOTEL_SEARCH_SUMMARY WHERE HotelID IN ({ids})", hotel_ids)
+            states = {state for (state,) in cursor.fetchall()}
+
+            cursor.execute(SUMMARY_SELECT_SQL.format(ids=ids), hotel_ids * 4)
+            rows = cursor.fetchall()
+            states.update(row[4] for row in rows)
+
+            cursor.execute(f"DELETE FROM HOTEL_SEARCH_SUMMARY WHERE HotelID IN ({ids})", hotel_ids)
+            if rows:
+                cursor.executemany(
+                    f"INSERT INTO HOTEL_SEARCH_SUMMARY ({', '.join(SUMMARY_COLUMNS)}) "
+                    f"VALUES ({_placeholders(SUMMARY_COLUMNS)})",
+                    rows
+                )
+
+            states.discard(None)
+            if states:
+                states = sorted(states)
+                cursor.execute(f"DELETE FROM STATE_STATS WHERE State IN ({_placeholders(states)})", states)
+                cursor.execute(STATE_STATS_SQL.format(states=_placeholders(states)), states)
+
+            cursor.executemany(
+                "DELETE FROM HOTEL_SUMMARY_DIRTY WHERE HotelID = %s AND MarkedAt = %s",
+                queued
+            )
+            connection.commit()
+        except Error:
+            connection.rollback()
+            raise
+
+    @staticmethod
+    def _set_state(cursor, source, watermark):
+        cursor.execute(
+            "INSERT INTO SUMMARY_REFRESH_STATE (Source, Watermark, RefreshedAt) VALUES (%s, %s, NOW(6)) "
+            "ON DUPLICATE KEY UPDATE Watermark = VALUES(Watermark), RefreshedAt = VALUES(RefreshedAt)",
+            (source, watermark)
+        )
+
+    # --------------------------------------------------------
+    # Background thread
+    # --------------------------------------------------------
+
+    def start(self):
+        """Refresh every `refresh_interval` seconds on a daemon thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="search-summary-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Error:
+                self._counters["errors"] += 1
+            self._stop.wait(self.refresh_interval)
+
+    # --------------------------------------------------------
+    # Monitoring
+    # --------------------------------------------------------
+
+    def staleness(self):
+        """
+        Seconds the summary is behind: age of the oldest queued hotel
+        (0.0 when the queue is empty). AVAILABILITY changes not yet picked
+        up by the watermark add at most one refresh interval.
+        """
+        with self._pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    "SELECT TIMESTAMPDIFF(MICROSECOND, MIN(MarkedAt), NOW(6)) FROM HOTEL_SUMMARY_DIRTY"
+                )
+                (lag,) = cursor.fetchone()
+                connection.commit()
+            finally:
+                cursor.close()
+        return lag / 1e6 if lag is not None else 0.0
+
+    def stats(self):
+        return dict(self._counters)
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def main():
+    from db_pool import ConnectionPool, connection_settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--once", action="store_true", help="run one refresh and exit")
+    parser.add_argument("--full", action="store_true", help="recompute every hotel")
+    parser.add_argument("--interval", type=float, default=DEFAULT_REFRESH_INTERVAL)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    settings = connection_settings({k.lower(): v for k, v in os.environ.items() if k.startswith("MYSQL_")})
+    settings["port"] = int(settings["port"])
+    pool = ConnectionPool(settings, size=1)
+    refresher = SearchSummaryRefresher(pool, refresh_interval=args.interval, batch_size=args.batch_size)
+    try:
+        refreshed = refresher.refresh(full=args.full)
+        print(f"refreshed {refreshed} hotels in {refresher.stats()['last_run_ms']} ms")
+        while not args.once:
+            time.sleep(args.interval)
+            refreshed = refresher.refresh()
+            if refreshed:
+                print(f"refreshed {refreshed} hotels in {refresher.stats()['last_run_ms']} ms")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
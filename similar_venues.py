@@ -0,0 +1,292 @@
+"""
+Wedding Destination Hotel Finder - Similar Venue Index
+Nearest neighbours over hotel feature vectors (price, stars, rating, size,
+amenities, location) for "Compare with Similar Venues": a precomputed
+top-k table patched incrementally as the catalog changes
+"""
+
+import bisect
+
+import numpy as np
+
+from hotel_queries import PRICE_CEILING
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+#
+# Every feature is scaled to [0, 1] against fixed bounds, so a hotel's
+# vector does not depend on the rest of the catalog and a change only
+# touches the neighbour lists it can reach. Location is a penalty on the
+# squared distance: another city costs CITY_PENALTY, another state more
+# than any feature difference can, so same-state venues always rank first
+# and the search only needs the hotel's own state unless it is too small.
+
+DEFAULT_NEIGHBORS = 10   # neighbours precomputed per hotel; larger k is searched live
+PRICE_FLOOR = 50         # nightly prices are compared on a log scale within [floor, PRICE_CEILING]
+ROOMS_CEILING = 1000     # TotalRooms, log scale within [1, ceiling]
+BUILD_BLOCK = 512        # hotels per block of the pairwise table build
+REBUILD_FRACTION = 0.05  # above this share of changed hotels, updated() rebuilds
+
+FEATURE_WEIGHTS = {
+    "price": 1.0,
+    "star_rating": 0.6,
+    "rating": 0.6,
+    "total_rooms": 0.4,
+    "amenities": 0.8,    # spread over the amenity bits: all of them differing costs 0.8 ** 2
+}
+CITY_PENALTY = 0.25
+STATE_PENALTY = sum(w * w for w in FEATURE_WEIGHTS.values()) + CITY_PENALTY + 1.0
+
+_TIE_EPSILON = 1e-9      # slack on the block build's candidate threshold
+
+
+def _log_scale(values, low, high):
+    values = np.clip(values, low, high)
+    return (np.log(values) - np.log(low)) / (np.log(high) - np.log(low))
+
+
+def feature_matrix(columns, price=None):
+    """(hotels x features) float64 vectors for a ColumnarHotelIndex"""
+    weights = FEATURE_WEIGHTS
+    price = columns.price if price is None else price
+    bits = np.unpackbits(columns.amenities.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+    bits = bits[:, :max(len(columns.amenity_bits), 1)].astype(np.float64)
+    return np.column_stack([
+        weights["price"] * _log_scale(price, PRICE_FLOOR, PRICE_CEILING),
+        weights["star_rating"] * columns.star_rating / 5,
+        weights["rating"] * columns.rating / 5,
+        weights["total_rooms"] * _log_scale(np.maximum(columns.total_rooms, 1), 1, ROOMS_CEILING),
+        weights["amenities"] / np.sqrt(bits.shape[1]) * bits,
+    ])
+
+
+# ============================================================
+# SIMILAR VENUE INDEX
+# ============================================================
+
+class SimilarVenueIndex:
+    """
+    Exact top-k similar venues per hotel, precomputed
+
+    Built from a ColumnarHotelIndex snapshot. `neighbors()` reads the
+    precomputed table (k up to `neighbors`); a price override or a larger
+    k runs a live search over the hotel's state. `exact_neighbors()` is a
+    brute-force scan of the whole catalog that returns the same answer,
+    for validation. Distances tie-break on HotelID. The index is
+    immutable: `updated()` returns a copy patched for a newer snapshot.
+    """
+
+    def __init__(self, columns, neighbors=DEFAULT_NEIGHBORS):
+        self.neighbors_per_hotel = neighbors
+        self._load(columns)
+        self.width = min(neighbors, max(self.size - 1, 0))
+        self.table_ids = np.full((self.size, self.width), -1, dtype=np.int64)
+        self.table_dist = np.full((self.size, self.width), np.inf)
+        self._build_table()
+
+    def _load(self, columns):
+        self.columns = columns
+        self.size = columns.size
+        self.hotel_id = columns.hotel_id
+        self.features = feature_matrix(columns)
+        # Codes are per snapshot; the names carry location across snapshots
+        state_names = {code: state for state, code in columns._state_codes.items()}
+        city_names = {code: f"{city}, {state}" for (city, state), code in columns._city_codes.items()}
+        self.state = np.array([state_names[c] for c in columns.state.tolist()], dtype=object)
+        self.city = np.array([city_names[c] for c in columns.city.tolist()], dtype=object)
+        self._state_code = columns.state
+        self._city_code = columns.city
+        self._position = {hotel_id: i for i, hotel_id in enumerate(self.hotel_id.tolist())}
+        order = np.argsort(self._state_code, kind="stable")
+        bounds = np.flatnonzero(np.diff(self._state_code[order])) + 1
+        self._by_state = {int(self._state_code[group[0]]): group
+                          for group in np.split(order, bounds) if len(group)}
+        # Contiguous per-state copies, so a live search reads its state without a gather
+        self._state_features = {state: self.features[group] for state, group in self._by_state.items()}
+        self._state_cities = {state: self._city_code[group] for state, group in self._by_state.items()}
+
+    # --------------------------------------------------------
+    # Distances
+    # --------------------------------------------------------
+
+    def _distances(self, vector, state_code, city_code, candidates):
+        """Squared distances from one vector to the hotels at `candidates`"""
+        diff = self.features[candidates] - vector
+        distance = (diff * diff).sum(axis=1)
+        distance += CITY_PENALTY * (self._city_code[candidates] != city_code)
+        distance += STATE_PENALTY * (self._state_code[candidates] != state_code)
+        return distance
+
+    def _top(self, candidates, distance, k):
+        """(positions, distances) of the k smallest, ties by hotel_id"""
+        if len(candidates) > k:
+            threshold = np.partition(distance, k - 1)[k - 1]
+            keep = distance <= threshold
+            candidates, distance = candidates[keep], distance[keep]
+        order = np.lexsort((self.hotel_id[candidates], distance))[:k]
+        return candidates[order], distance[order]
+
+    def _search(self, position, k, vector=None):
+        """Nearest k to the hotel at `position` (optionally with another vector)"""
+        vector = self.features[position] if vector is None else vector
+        state = int(self._state_code[position])
+        group = self._by_state[state]
+        if len(group) - 1 < k:
+            candidates = np.flatnonzero(np.arange(self.size) != position)
+            distance = self._distances(vector, state, self._city_code[position], candidates)
+            return self._top(candidates, distance, k)
+        diff = self._state_features[state] - vector
+        distance = (diff * diff).sum(axis=1)
+        distance += CITY_PENALTY * (self._state_cities[state] != self._city_code[position])
+        distance[np.searchsorted(group, position)] = np.inf
+        return self._top(group, distance, k)
+
+    def _build_table(self, positions=None):
+        """Top-`width` for the hotels at `positions` (default all), a block of them against their state at a time"""
+        if not self.width:
+            return
+        for group in self._by_state.values():
+            rows = group if positions is None else group[np.isin(group, positions)]
+            if not len(rows):
+                continue
+            if len(group) - 1 < self.width:
+                for position in rows:
+                    self._store(position, *self._search(position, self.width))
+                continue
+            features = self._state_features[int(self._state_code[group[0]])]
+            norms = np.einsum("ij,ij->i", features, features)
+            cities = self._city_code[group]
+            local = np.searchsorted(group, rows)
+            taken = min(2 * self.width, len(group) - 1)
+            for start in range(0, len(rows), BUILD_BLOCK):
+                block = local[start:start + BUILD_BLOCK]
+                # Expanded form picks candidates; exact distances order them
+                approx = norms[block, None] + norms[None, :] - 2 * features[block] @ features.T
+                approx += CITY_PENALTY * (cities[block, None] != cities[None, :])
+                approx[np.arange(len(block)), block] = np.inf
+                nearest = np.argpartition(approx, taken - 1, axis=1)[:, :taken]
+                kth = np.partition(np.take_along_axis(approx, nearest, axis=1), self.width - 1, axis=1)
+                # Rows with more near-ties than candidates taken are searched one by one
+                crowded = (approx <= kth[:, self.width - 1, None] + _TIE_EPSILON).sum(axis=1) > taken
+
+                block_rows = group[block]
+                candidates = group[nearest]
+                diff = self.features[candidates] - self.features[block_rows][:, None, :]
+                distance = (diff * diff).sum(axis=2)
+                distance += CITY_PENALTY * (self._city_code[candidates] != self._city_code[block_rows][:, None])
+                order = np.lexsort((self.hotel_id[candidates], distance), axis=1)[:, :self.width]
+                self.table_ids[block_rows] = self.hotel_id[np.take_along_axis(candidates, order, axis=1)]
+                self.table_dist[block_rows] = np.take_along_axis(distance, order, axis=1)
+                for position in block_rows[crowded]:
+                    self._store(position, *self._search(position, self.width))
+
+    def _store(self, position, positions, distances):
+        self.table_ids[position] = self.hotel_id[positions]
+        self.table_dist[position] = distances
+
+    # --------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------
+
+    def neighbors(self, hotel_id, k=5, price=None):
+        """
+        [(HotelID, squared distance)] of the k venues most similar to a hotel
+
+        `price` compares the hotel at another nightly price (e.g. its stay
+        rate). Empty if the hotel is not indexed.
+        """
+        position = self._position.get(hotel_id)
+        if position is None or k <= 0:
+            return []
+        if price is not None and abs(float(price) - self.columns.price[position]) >= 0.005:
+            vector = self.features[position].copy()
+            vector[0] = FEATURE_WEIGHTS["price"] * _log_scale(float(price), PRICE_FLOOR, PRICE_CEILING)
+            positions, distances = self._search(position, k, vector)
+            return list(zip(self.hotel_id[positions].tolist(), distances.tolist()))
+        if k > self.width:
+            positions, distances = self._search(position, k)
+            return list(zip(self.hotel_id[positions].tolist(), distances.tolist()))
+        return list(zip(self.table_ids[position, :k].tolist(), self.table_dist[position, :k].tolist()))
+
+    def exact_neighbors(self, hotel_id, k=5):
+        """Brute-force neighbors(): every other hotel scored, no table, no state pruning"""
+        position = self._position.get(hotel_id)
+        if position is None or k <= 0:
+            return []
+        diff = self.features - self.features[position]
+        distance = (diff * diff).sum(axis=1)
+        distance += CITY_PENALTY * (self.city != self.city[position])
+        distance += STATE_PENALTY * (self.state != self.state[position])
+        distance[position] = np.inf
+        order = np.lexsort((self.hotel_id, distance))[:min(k, self.size - 1)]
+        return list(zip(self.hotel_id[order].tolist(), distance[order].tolist()))
+
+    # --------------------------------------------------------
+    # Incremental refresh
+    # --------------------------------------------------------
+
+    def updated(self, columns):
+        """
+        Index for a newer snapshot, patching only what changed
+
+        Hotels whose features, city or state changed (or that are new) get
+        fresh lists; lists that held a changed or removed hotel are
+        recomputed; every other list takes a changed hotel in if it now
+        ranks inside it. Rebuilds when more than REBUILD_FRACTION changed.
+        """
+        index = object.__new__(SimilarVenueIndex)
+        index.neighbors_per_hotel = self.neighbors_per_hotel
+        index._load(columns)
+        index.width = min(self.neighbors_per_hotel, max(index.size - 1, 0))
+
+        old = np.array([self._position.get(h, -1) for h in index.hotel_id.tolist()], dtype=np.int64)
+        known = old >= 0
+        same = known.copy()
+        same[known] = ((self.features[old[known]] == index.features[known]).all(axis=1)
+                       if self.features.shape[1] == index.features.shape[1] else False)
+        same[known] &= (self.state[old[known]] == index.state[known]) & (self.city[old[known]] == index.city[known])
+        changed = np.flatnonzero(~same)
+        removed = np.setdiff1d(self.hotel_id, index.hotel_id)
+
+        if (index.width != self.width or len(changed) + len(removed) > REBUILD_FRACTION * max(index.size, 1)):
+            index.table_ids = np.full((index.size, index.width), -1, dtype=np.int64)
+            index.table_dist = np.full((index.size, index.width), np.inf)
+            index._build_table()
+            return index
+
+        index.table_ids = np.full((index.size, index.width), -1, dtype=np.int64)
+        index.table_dist = np.full((index.size, index.width), np.inf)
+        index.table_ids[same] = self.table_ids[old[same]]
+        index.table_dist[same] = self.table_dist[old[same]]
+        if not len(changed) and not len(removed):
+            return index
+
+        stale = np.isin(index.table_ids, np.concatenate([index.hotel_id[changed], removed])).any(axis=1)
+        stale[changed] = True
+        index._build_table(np.flatnonzero(stale))
+
+        # Only its own state's lists, and those of states too small to fill
+        # a list, can take in a hotel from that state
+        small = [group for group in index._by_state.values() if len(group) - 1 < index.width]
+        for position in changed:
+            rows = np.concatenate([index._by_state[int(index._state_code[position])]] + small)
+            rows = rows[~stale[rows]]
+            distance = index._distances(index.features[position], index._state_code[position],
+                                        index._city_code[position], rows)
+            last, last_id = index.table_dist[rows, -1], index.table_ids[rows, -1]
+            reach = (distance < last) | ((distance == last) & (index.hotel_id[position] < last_id))
+            for row, row_distance in zip(rows[reach].tolist(), distance[reach].tolist()):
+                index._insert(row, index.hotel_id[position], row_distance)
+        return index
+
+    def _insert(self, row, hotel_id, distance):
+        entries = list(zip(self.table_dist[row].tolist(), self.table_ids[row].tolist()))
+        bisect.insort(entries, (float(distance), int(hotel_id)))
+        entries = entries[:self.width]
+        self.table_dist[row] = [d for d, _ in entries]
+        self.table_ids[row] = [h for _, h in entries]
+
+    def stats(self):
+        return {"hotels": self.size, "neighbors": self.width, "features": self.features.shape[1],
+                "states": len(self._by_state)}
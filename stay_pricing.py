@@ -0,0 +1,200 @@
+"""
+Wedding Destination Hotel Finder - Stay Pricing
+Exact stay totals from nightly rates, AVAILABILITY.PriceOverride, group
+discount tiers, the service fee and tax. Money is held as integer cents,
+so every booking line of a Results page is priced with int arithmetic
+and every rounding step is exact (half-up, like Decimal)
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SERVICE_FEE_RATE = Decimal("0.05")
+TAX_RATE = Decimal("0.10")
+CENTS = Decimal("0.01")
+
+# (minimum rooms in the booking, BOOKING.GroupBookingDiscount percent), largest first
+GROUP_DISCOUNT_TIERS = (
+    (20, Decimal("15.00")),
+    (10, Decimal("10.00")),
+    (5, Decimal("5.00")),
+)
+NO_DISCOUNT = Decimal("0.00")
+
+BASIS_POINTS = 10_000
+SERVICE_FEE_BP = int(SERVICE_FEE_RATE * BASIS_POINTS)
+TAX_BP = int(TAX_RATE * BASIS_POINTS)
+
+
+class StayQuote(namedtuple("StayQuote", [
+    "hotel_id", "nights", "num_rooms", "lines", "subtotal", "discount_rate",
+    "discount", "service_fee", "tax", "total",
+])):
+    """
+    Priced stay for `num_rooms` rooms of one hotel (all amounts Decimal)
+
+    `lines` is ((RoomID, units, subtotal), ...): the rooms BookingService
+    would book, cheapest BasePrice first. Fee and tax are rounded per
+    line, exactly as the BOOKING rows are charged.
+    """
+    __slots__ = ()
+
+    @property
+    def average_nightly_rate(self):
+        """Room rate per room-night before discount, fee and tax"""
+        return (self.subtotal / (self.nights * self.num_rooms)).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def to_cents(value):
+    return int((Decimal(value) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def _round_div(numerator, denominator):
+    """Half-up integer division for non-negative ints"""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def group_discount_rate(num_rooms):
+    """GroupBookingDiscount percent for a booking of `num_rooms` rooms"""
+    for min_rooms, percent in GROUP_DISCOUNT_TIERS:
+        if num_rooms >= min_rooms:
+            return percent
+    return NO_DISCOUNT
+
+
+def basis_points(percent):
+    """Basis points for a percent such as GroupBookingDiscount (15.00 -> 1500)"""
+    return int(percent * 100)
+
+
+def line_totals(subtotal_cents, discount_bp):
+    """
+    (discount, service_fee, tax, total) in cents for booking line subtotals
+
+    `discount_bp` is the group discount in basis points (percent x 100). The discount comes off the room
+    subtotal; the fee is charged on the discounted subtotal and tax on
+    subtotal plus fee.
+    """
+    discount = _round_div(subtotal_cents * discount_bp, BASIS_POINTS)
+    net = subtotal_cents - discount
+    fee = _round_div(net * SERVICE_FEE_BP, BASIS_POINTS)
+    tax = _round_div((net + fee) * TAX_BP, BASIS_POINTS)
+    return discount, fee, tax, net + fee + tax
+
+
+# ============================================================
+# BATCH PRICING
+# ============================================================
+
+def price_stays(rooms, check_in, check_out, calendar, num_rooms):
+    """
+    {HotelID: StayQuote, or None when fewer rooms are free} for one stay
+
+    `rooms` are (HotelID, RoomID, BasePrice) of Available rooms and
+    `calendar` maps (RoomID, date) -> (count, is_booked, price_override),
+    the shape HotelCatalog.availability and BookingService use (a missing
+    entry is 1 room free at BasePrice). `num_rooms` is one count for every
+    hotel or {HotelID: count}.
+    """
+    if check_out <= check_in:
+        raise ValueError("Check-out date must be after check-in date")
+    nights = [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+    no_entry = (1, False, None)
+
+    # Allocate cheapest room first, as BookingService books, and stop
+    # reading the calendar once a hotel's block is covered or a room hits
+    # a booked night. A PriceOverride (even 0.00) replaces BasePrice; a
+    # room's nightly rates are summed in Decimal and rounded once, like the
+    # booking.
+    rooms_by_hotel = {}
+    for room in sorted(rooms, key=lambda room: (room[0], room[2], room[1])):
+        rooms_by_hotel.setdefault(room[0], []).append(room)
+    hotels, wanted, lines = [], [], []
+    for hotel_id, hotel_rooms in rooms_by_hotel.items():
+        hotels.append(hotel_id)
+        wanted.append(num_rooms.get(hotel_id, 0) if isinstance(num_rooms, dict) else num_rooms)
+        lines.append([])
+        needed = wanted[-1]
+        for _, room_id, base_price in hotel_rooms:
+            if needed <= 0:
+                break
+            take, rate = needed, Decimal(0)
+            for night in nights:
+                count, is_booked, override = calendar.get((room_id, night), no_entry)
+                if is_booked or count <= 0:
+                    take = 0
+                    break
+                take = min(take, count)
+                rate += base_price if override is None else override
+            if take <= 0:
+                continue
+            needed -= take
+            lines[-1].append((room_id, take, take * to_cents(rate)))
+
+    # Fee and tax per line in integer cents, summed per hotel
+    quotes = {}
+    for hotel_id, num, hotel_lines in zip(hotels, wanted, lines):
+        if num < 1 or sum(units for _, units, _ in hotel_lines) < num:
+            quotes[hotel_id] = None
+            continue
+        rate = group_discount_rate(num)
+        discount_bp = basis_points(rate)
+        subtotal = discount = fee = tax = total = 0
+        for _, _, cents in hotel_lines:
+            line_discount, line_fee, line_tax, line_total = line_totals(cents, discount_bp)
+            subtotal += cents
+            discount += line_discount
+            fee += line_fee
+            tax += line_tax
+            total += line_total
+        quotes[hotel_id] = StayQuote(
+            hotel_id=hotel_id,
+            nights=len(nights),
+            num_rooms=num,
+            lines=tuple((room_id, units, from_cents(cents)) for room_id, units, cents in hotel_lines),
+            subtotal=from_cents(subtotal),
+            discount_rate=rate,
+            discount=from_cents(discount),
+            service_fee=from_cents(fee),
+            tax=from_cents(tax),
+            total=from_cents(total),
+        )
+    return quotes
+
+
+def fetch_stay_quotes(connection, hotel_ids, check_in, check_out, num_rooms):
+    """price_stays() over rooms and calendar rows read from MySQL"""
+    if not hotel_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(hotel_ids))
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"SELECT HotelID, RoomID, BasePrice FROM ROOM "
+            f"WHERE HotelID IN ({placeholders}) AND RoomStatus = 'Available'",
+            list(hotel_ids)
+        )
+        rooms = cursor.fetchall()
+        cursor.execute(
+            f"SELECT av.RoomID, av.AvailableDate, av.AvailableRoomsCount, av.IsBooked, av.PriceOverride "
+            f"FROM AVAILABILITY av JOIN ROOM r ON r.RoomID = av.RoomID "
+            f"WHERE r.HotelID IN ({placeholders}) AND av.AvailableDate >= %s AND av.AvailableDate < %s",
+            list(hotel_ids) + [check_in, check_out]
+        )
+        calendar = {
+            (room_id, night): (count, bool(is_booked), override)
+            for room_id, night, count, is_booked, override in cursor.fetchall()
+        }
+    finally:
+        cursor.close()
+    quotes = price_stays(rooms, check_in, check_out, calendar, num_rooms)
+    return {hotel_id: quotes.get(hotel_id) for hotel_id in hotel_ids}
@@ -0,0 +1,401 @@
+"""
+Wedding Destination Hotel Finder - Telemetry
+Span timings and counters for the hot paths (hotel search, location stats,
+page runs, chart construction), exported as Prometheus text or OTLP/JSON
+traces to a local file or an HTTP endpoint by a background thread
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextvars import ContextVar
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+#
+# A disabled tracer hands out one shared no-op span and ignores counts, so
+# instrumented code costs a method call and an attribute check per span.
+
+METRIC_PREFIX = "wbnb"
+SERVICE_NAME = "wedding-hotel-finder"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+DEFAULT_MAX_SPANS = 10_000      # finished spans buffered for OTLP export before the oldest are dropped
+DEFAULT_EXPORT_INTERVAL = 15.0  # seconds between exports
+EXPORT_TIMEOUT = 5.0            # seconds for an HTTP export
+
+PROMETHEUS = "prometheus"
+OTLP = "otlp"
+
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+_current_span = ContextVar("wbnb_current_span", default=None)
+
+
+def export_format(target):
+    """OTLP for JSON files and /v1/traces endpoints, Prometheus text otherwise"""
+    if target.endswith((".json", ".jsonl", "/v1/traces")):
+        return OTLP
+    return PROMETHEUS
+
+
+# ============================================================
+# SPANS
+# ============================================================
+
+class Span:
+    """
+    One timed operation
+
+    Use as a context manager (`with tracer.span(...)`), or call `end()`
+    on a span from `tracer.start_span()`. `set()` adds attributes; a
+    `rows` attribute is also added to the span's row counter.
+    """
+
+    __slots__ = ("_tracer", "name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start_ns", "duration_ns", "status", "_started", "_token")
+
+    def __init__(self, tracer, name, parent, attributes):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else random.getrandbits(128)
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self.status = STATUS_UNSET
+        self.duration_ns = None
+        self._token = None
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+        return self
+
+    def get(self, key, default=None):
+        return self.attributes.get(key, default)
+
+    def activate(self):
+        """Make this the parent of spans started in the current context until `end()`"""
+        self._token = _current_span.set(self)
+        return self
+
+    def end(self, **attributes):
+        """Finish and record the span (later calls do nothing)"""
+        if self.duration_ns is not None:
+            return
+        self.duration_ns = time.perf_counter_ns() - self._started
+        self.attributes.update(attributes)
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Ended from another context (e.g. by the next script run)
+                pass
+            self._token = None
+        self._tracer._record(self)
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, exc_type, exc, tb):
+        # Only real errors; Streamlit's rerun/stop signals are BaseExceptions
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self.status = STATUS_ERROR
+            self.attributes["exception.type"] = exc_type.__name__
+        self.end()
+        return False
+
+
+class _NoopSpan:
+    """The span a disabled tracer returns: no timing, no attributes"""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        return self
+
+    def get(self, key, default=None):
+        return default
+
+    def activate(self):
+        return self
+
+    def end(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+# ============================================================
+# TRACER
+# ============================================================
+
+class Tracer:
+    """
+    Process-wide span and counter registry
+
+    Every finished span adds to a per-name duration histogram (and row
+    counter, if it set `rows`) and is buffered for OTLP export. `count()`
+    keeps labelled counters such as cache hits/misses and script runs.
+    All of it is shared by every session and guarded by one lock, held
+    only to update a few numbers.
+    """
+
+    def __init__(self, enabled=True, max_spans=DEFAULT_MAX_SPANS, service_name=SERVICE_NAME):
+        self.enabled = enabled
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=max_spans)
+        self._histograms = {}   # span name -> [bucket counts..., +Inf count, sum seconds]
+        self._counters = {}     # (metric, sorted label items) -> value
+        self._dropped = 0
+
+    # --------------------------------------------------------
+    # Instrumentation
+    # --------------------------------------------------------
+
+    def span(self, name, **attributes):
+        """Context manager timing the block, child of the current span"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, _current_span.get(), attributes)
+
+    def start_span(self, name, root=False, **attributes):
+        """Started span for work that does not fit a `with` block; call `end()` on it"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, None if root else _current_span.get(), attributes)
+
+    def current_span(self):
+        """The innermost active span (no-op span if none)"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return _current_span.get() or NOOP_SPAN
+
+    def count(self, metric, n=1, **labels):
+        """Add n to a labelled counter"""
+        if not self.enabled:
+            return
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def _record(self, span):
+        seconds = span.duration_ns / 1e9
+        rows = span.attributes.get("rows")
+        with self._lock:
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = [0] * (len(DURATION_BUCKETS) + 2)
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[-2] += 1
+            histogram[-1] += seconds
+            if rows is not None:
+                key = ("span_rows", (("span", span.name),))
+                self._counters[key] = self._counters.get(key, 0) + rows
+            if len(self._spans) == self._spans.maxlen:
+                self._dropped += 1
+            self._spans.append(span)
+
+    # --------------------------------------------------------
+    # Export
+    # --------------------------------------------------------
+
+    def prometheus_text(self):
+        """Current histograms and counters in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = {name: list(values) for name, values in self._histograms.items()}
+            counters = dict(self._counters)
+            dropped = self._dropped
+
+        lines = []
+        if histograms:
+            metric = f"{METRIC_PREFIX}_span_duration_seconds"
+            lines += [f"# HELP {metric} Duration of instrumented operations",
+                      f"# TYPE {metric} histogram"]
+            for name in sorted(histograms):
+                values = histograms[name]
+                label = f'span="{_escape(name)}"'
+                cumulative = 0
+                for bound, n in zip(DURATION_BUCKETS, values):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+                cumulative += values[-2]
+                lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{label}}} {values[-1]:.6f}")
+                lines.append(f"{metric}_count{{{label}}} {cumulative}")
+
+        counters[("spans_dropped", ())] = dropped
+        for metric in sorted({metric for metric, _ in counters}):
+            name = f"{METRIC_PREFIX}_{metric}_total"
+            lines.append(f"# TYPE {name} counter")
+            for (other, labels), value in sorted(counters.items()):
+                if other == metric:
+                    rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                    lines.append(f"{name}{{{rendered}}} {value}" if rendered else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def drain_otlp(self):
+        """Finished spans since the last drain as an OTLP/JSON ExportTraceServiceRequest (None if none)"""
+        with self._lock:
+            spans = list(self._spans)
+            self._spans.clear()
+        if not spans:
+            return None
+        return {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [_otlp_span(span) for span in spans],
+            }],
+        }]}
+
+    def stats(self):
+        with self._lock:
+            return {"enabled": self.enabled, "buffered_spans": len(self._spans),
+                    "span_names": len(self._histograms), "counters": len(self._counters),
+                    "dropped_spans": self._dropped}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_span(span):
+    record = {
+        "traceId": f"{span.trace_id:032x}",
+        "spanId": f"{span.span_id:016x}",
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.start_ns + span.duration_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": span.status},
+    }
+    if span.parent_id is not None:
+        record["parentSpanId"] = f"{span.parent_id:016x}"
+    return record
+
+
+# ============================================================
+# EXPORTER
+# ============================================================
+
+class TelemetryExporter:
+    """
+    Periodic export of a tracer to a file or HTTP endpoint
+
+    Prometheus text replaces the file on each export (for a node
+    exporter textfile collector) or is POSTed to a Pushgateway URL.
+    OTLP/JSON appends one ExportTraceServiceRequest per line to the file
+    or POSTs it to a collector's /v1/traces. A failed export is counted
+    and its spans are not retried.
+    """
+
+    def __init__(self, tracer, target, format=None, interval=DEFAULT_EXPORT_INTERVAL):
+        self.tracer = tracer
+        self.target = target
+        self.format = format or export_format(target)
+        self.interval = interval
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._counters = {"exports": 0, "failures": 0, "last_export_ms": 0.0}
+
+    def export(self):
+        """Export once; False if writing or sending failed"""
+        started = time.perf_counter()
+        try:
+            if self.format == OTLP:
+                payload = self.tracer.drain_otlp()
+                if payload is not None:
+                    self._write(json.dumps(payload, separators=(",", ":")), "application/json", append=True)
+            else:
+                self._write(self.tracer.prometheus_text(), "text/plain; version=0.0.4", append=False)
+        except OSError:
+            self._count("failures")
+            return False
+        with self._lock:
+            self._counters["exports"] += 1
+            self._counters["last_export_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return True
+
+    def _write(self, body, content_type, append):
+        if self.target.startswith(("http://", "https://")):
+            request = urllib.request.Request(self.target, data=body.encode(), method="POST",
+                                             headers={"Content-Type": content_type})
+            with urllib.request.urlopen(request, timeout=EXPORT_TIMEOUT):
+                return
+        if append:
+            with open(self.target, "a", encoding="utf-8") as f:
+                f.write(body + "\n")
+            return
+        # Write-then-rename so scrapers never read a half-written file
+        partial = f"{self.target}.tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(partial, self.target)
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+        # Export what is left on shutdown
+        self.export()
+
+    # --------------------------------------------------------
+    # Background thread
+    # --------------------------------------------------------
+
+    def start(self):
+        """Start exporting on a daemon thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Export once more and stop"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, format=self.format, target=self.target)
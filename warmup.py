@@ -0,0 +1,167 @@
+"""
+Wedding Destination Hotel Finder - Startup Warm-Up
+Loads the process-wide caches (connection pool, hotel catalog, location
+stats) on a background thread and serves a readiness check that turns
+ready once they are all loaded
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+#
+# A step that fails (e.g. MySQL not up yet) is retried every
+# retry_interval seconds until it succeeds; the readiness check stays 503
+# meanwhile. Liveness (LIVE_PATH) is 200 as soon as the server runs.
+
+DEFAULT_RETRY_INTERVAL = 5.0
+DEFAULT_HEALTH_HOST = "0.0.0.0"
+LIVE_PATH = "/healthz"
+READY_PATH = "/readyz"
+
+PENDING, RUNNING, READY, FAILED = "pending", "running", "ready", "failed"
+
+
+# ============================================================
+# WARM-UP
+# ============================================================
+
+class WarmUp:
+    """
+    Named warm-up steps run once, in order, on a daemon thread
+
+    `steps` is a list of (name, fn) with fn taking no arguments. Steps run
+    in order; a failed step is retried after `retry_interval` seconds
+    before the next one starts. `ready()` is True once every step has
+    succeeded.
+    """
+
+    def __init__(self, steps, retry_interval=DEFAULT_RETRY_INTERVAL):
+        self.steps = list(steps)
+        self.retry_interval = retry_interval
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self._ready_after = None
+        self._status = {name: {"state": PENDING, "attempts": 0, "seconds": None, "error": None}
+                        for name, _ in self.steps}
+
+    def start(self):
+        """Run the steps on a daemon thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="warm-up", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait(self, timeout=None):
+        """Block until ready or `timeout` seconds pass; returns ready()"""
+        return self._ready.wait(timeout)
+
+    def ready(self):
+        return self._ready.is_set()
+
+    def _run(self):
+        for name, fn in self.steps:
+            while not self._stop.is_set():
+                if self._run_step(name, fn):
+                    break
+                self._stop.wait(self.retry_interval)
+            if self._stop.is_set():
+                return
+        self._ready_after = time.monotonic() - self._started_at
+        self._ready.set()
+
+    def _run_step(self, name, fn):
+        with self._lock:
+            status = self._status[name]
+            status.update(state=RUNNING, attempts=status["attempts"] + 1)
+        started = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            with self._lock:
+                status.update(state=FAILED, error=f"{type(e).__name__}: {e}",
+                              seconds=round(time.perf_counter() - started, 3))
+            return False
+        with self._lock:
+            status.update(state=READY, error=None, seconds=round(time.perf_counter() - started, 3))
+        return True
+
+    def status(self):
+        """Readiness and per-step state, attempts, seconds and last error"""
+        with self._lock:
+            return {
+                "ready": self.ready(),
+                "ready_after_seconds": round(self._ready_after, 3) if self._ready_after is not None else None,
+                "steps": {name: dict(status) for name, status in self._status.items()},
+            }
+
+
+# ============================================================
+# READINESS ENDPOINT
+# ============================================================
+
+class HealthServer:
+    """
+    Liveness and readiness over HTTP for a WarmUp
+
+    GET LIVE_PATH is always 200; GET READY_PATH is 200 once the warm-up
+    is ready and 503 before, both with WarmUp.status() as JSON. Runs on
+    its own port next to the Streamlit server.
+    """
+
+    def __init__(self, warmup, port, host=DEFAULT_HEALTH_HOST):
+        self.warmup = warmup
+        self.address = (host, int(port))
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Serve on a daemon thread (idempotent)"""
+        if self._server is not None:
+            return
+        warmup = self.warmup
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path not in (LIVE_PATH, READY_PATH):
+                    self.send_error(404)
+                    return
+                status = warmup.status()
+                code = 200 if path == LIVE_PATH or status["ready"] else 503
+                body = json.dumps(status).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(self.address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="health-server", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join(timeout)
+            self._server = None
@@ -5,12 +5,29 @@ Version 3.0 - Complete Redesign
 """
 
 import streamlit as st
+import hashlib
+import json
+import time
+import uuid
 from datetime import datetime, timedelta
-import pandas as pd
-import mysql.connector
+from functools import wraps
+from pathlib import Path
 from mysql.connector import Error
-import plotly.express as px
-import plotly.graph_objects as go
+
+from async_queries import QueryExecutor
+from booking_service import BookingError, BookingService, Guest, SoldOutError
+from db_pool import ConnectionPool, connection_settings
+from hotel_catalog import HotelCatalog
+from comparison_charts import ChartService, ComparisonSet
+from hotel_details import detail_calls, fetch_similar_hotels
+from hotel_records import Hotel, HotelRecords, hotels_from_cursor
+from hotel_queries import DEFAULT_SORT, SORT_OPTIONS, build_hotel_search_query
+from location_index import LocationIndex
+from search_analytics import SearchEventLogger
+from search_summary import SearchSummaryRefresher
+from stay_pricing import fetch_stay_quotes
+from telemetry import TelemetryExporter, Tracer
+from warmup import HealthServer, WarmUp
 
 # ============================================================
 # PAGE CONFIGURATION
@@ -27,357 +44,378 @@ st.set_page_config(
 # CUSTOM CSS FOR BEAUTIFUL STYLING
 # ============================================================
 
-st.markdown("""
-<style>
-    /* Main theme colors */
-    :root {
-        --primary-color: #D4AF37;
-        --secondary-color: #8B7355;
-        --accent-color: #FFE4E1;
-        --text-dark: #2C3E50;
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-    /* Main container styling */
-    .main {
-        background: linear-gradient(135deg, #FFF5F5 0%, #FFE4E1 100%);
-    }
-    
-    /* Custom header styling */
-    .custom-header {
-        background: linear-gradient(135deg, #D4AF37 0%, #B8860B 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-        text-align: center;
-        margin-bottom: 2rem;
-        color: white;
-    }
-    
-    .custom-header h1 {
-        font-size: 3rem;
-        font-weight: 700;
-        margin: 0;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-    }
-    
-    .custom-header p {
-        font-size: 1.2rem;
-        margin-top: 0.5rem;
-        opacity: 0.95;
-    }
-    
-    /* Hotel card styling */
-    .hotel-card {
-        background: white;
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.08);
-        border-left: 5px solid #D4AF37;
-        transition: all 0.3s ease;
-        cursor: pointer;
-    }
-    
-    .hotel-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 30px rgba(212,175,55,0.3);
-    }
-    
-    .hotel-name {
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: #2C3E50;
-        margin-bottom: 0.5rem;
-    }
-    
-    .hotel-location {
-        color: #7F8C8D;
-        font-size: 1rem;
-        margin-bottom: 0.5rem;
-    }
-    
-    .hotel-price {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #D4AF37;
-        margin: 0.5rem 0;
-    }
-    
-    .hotel-rating {
-        display: inline-block;
-        background: linear-gradient(135deg, #FFD700 0%, #FFA500 100%);
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 20px;
-        font-weight: 600;
-        font-size: 0.9rem;
-    }
-    
-    /* Info box styling */
-    .info-box {
-        background: white;
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 2px 15px rgba(0,0,0,0.06);
-        border-top: 4px solid #D4AF37;
-    }
-    
-    .info-box h3 {
-        color: #2C3E50;
-        margin-top: 0;
-        font-size: 1.3rem;
-    }
-    
-    /* Stats card */
-    .stats-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    
-    .stats-number {
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin: 0;
-    }
-    
-    .stats-label {
-        font-size: 1rem;
-        opacity: 0.9;
-        margin-top: 0.5rem;
-    }
-    
-    /* Button styling */
-    .stButton>button {
-        background: linear-gradient(135deg, #D4AF37 0%, #B8860B 100%);
-        color: white;
-        border: none;
-        border-radius: 25px;
-        padding: 0.6rem 2rem;
-        font-weight: 600;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(212,175,55,0.3);
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(212,175,55,0.4);
-    }
-    
-    /* Progress step indicator */
-    .step-indicator {
-        display: flex;
-        justify-content: space-between;
-        margin: 2rem 0;
-        padding: 0;
-    }
-    
-    .step {
-        flex: 1;
-        text-align: center;
-        padding: 1rem;
-        background: white;
-        margin: 0 0.5rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-    }
-    
-    .step.active {
-        background: linear-gradient(135deg, #D4AF37 0%, #B8860B 100%);
-        color: white;
-        font-weight: 700;
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #2C3E50 0%, #34495E 100%);
-    }
-    
-    /* Animation */
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    .fade-in {
-        animation: fadeIn 0.6s ease-out;
-    }
-    
-    /* Badge styling */
-    .badge {
-        display: inline-block;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-size: 0.85rem;
-        font-weight: 600;
-        margin: 0.2rem;
-    }
-    
-    .badge-luxury {
-        background: linear-gradient(135deg, #8B7355 0%, #6B5745 100%);
-        color: white;
-    }
-    
-    .badge-popular {
-        background: linear-gradient(135deg, #FF6B6B 0%, #EE5A6F 100%);
-        color: white;
-    }
-    
-    .badge-featured {
-        background: linear-gradient(135deg, #4ECDC4 0%, #44A08D 100%);
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css():
+    """The app stylesheet (assets/styles.css), read once per process"""
+    css = (Path(__file__).parent / "assets" / "styles.css").read_text(encoding="utf-8")
+    return f"<style>\n{css}</style>"
+
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # ============================================================
 # DATABASE CONNECTION
 # ============================================================
 
 @st.cache_resource
-def get_db_connection():
-    """Establish and cache MySQL database connection"""
-    try:
-        connection = mysql.connector.connect(
-            host=st.secrets.get("mysql_host", "localhost"),
-            user=st.secrets.get("mysql_user", "root"),
-            password=st.secrets.get("mysql_password", ""),
-            database=st.secrets.get("mysql_database", "5033_ali"),
-            port=st.secrets.get("mysql_port", 3306)
-        )
-        return connection
-    except Error as e:
-        st.error(f"❌ Database connection error: {e}")
-        return None
-
-@st.cache_data(ttl=3600)
-def fetch_hotels_from_db(location_filter=None, budget_filter=None, min_rating=None):
-    """Fetch hotels from MySQL database with enhanced filtering"""
-    connection = get_db_connection()
-    if connection is None:
-        return []
+def get_db_pool():
+    """Create the process-wide MySQL connection pool shared by all sessions"""
+    return ConnectionPool(
+        connection_settings(st.secrets),
+        size=st.secrets.get("mysql_pool_size", 8),
+        checkout_timeout=st.secrets.get("mysql_pool_timeout", 5.0)
+    )
+
+@st.cache_resource
+def get_hotel_catalog():
+    """Create the process-wide in-memory hotel catalog (refreshed from UpdatedAt)"""
+    catalog = HotelCatalog(
+        get_db_pool(),
+        refresh_interval=st.secrets.get("catalog_refresh_seconds", 30)
+    )
+    catalog.on_change(get_location_index.clear)
+    return catalog
+
+@st.cache_resource
+def get_booking_service():
+    """Create the process-wide transactional booking service"""
+    return BookingService(get_db_pool())
+
+@st.cache_resource
+def get_hotel_records():
+    """Create the process-wide Hotel record store (sessions keep only HotelIDs)"""
+    return HotelRecords(max_entries=st.secrets.get("hotel_records_max", 50_000))
+
+@st.cache_resource
+def get_query_executor():
+    """Create the process-wide thread pool that runs independent page queries concurrently"""
+    return QueryExecutor(
+        get_db_pool(),
+        max_workers=st.secrets.get("query_workers", 4),
+        default_timeout=st.secrets.get("query_timeout_seconds", 3.0)
+    )
+
+@st.cache_resource
+def get_search_summary_refresher():
+    """Start the process-wide HOTEL_SEARCH_SUMMARY / STATE_STATS refresher thread"""
+    refresher = SearchSummaryRefresher(
+        get_db_pool(),
+        refresh_interval=st.secrets.get("summary_refresh_seconds", 30)
+    )
+    refresher.start()
+    return refresher
+
+@st.cache_resource
+def get_search_logger():
+    """Start the process-wide background writer for SEARCHQUERIES analytics"""
+    logger = SearchEventLogger(
+        get_db_pool(),
+        queue_size=st.secrets.get("analytics_queue_size", 10_000),
+        flush_interval=st.secrets.get("analytics_flush_seconds", 2.0)
+    )
+    logger.start()
+    return logger
+
+@st.cache_resource
+def get_tracer():
+    """Process-wide tracer; enabled and exported when `telemetry_export` (file path or URL) is set"""
+    target = st.secrets.get("telemetry_export")
+    tracer = Tracer(enabled=bool(target))
+    if target:
+        TelemetryExporter(
+            tracer,
+            target,
+            format=st.secrets.get("telemetry_format"),
+            interval=st.secrets.get("telemetry_export_seconds", 15.0)
+        ).start()
+    return tracer
+
+@st.cache_resource
+def get_chart_service():
+    """Create the process-wide cache of comparison chart figures"""
+    return ChartService(max_entries=st.secrets.get("chart_cache_size", 5_000))
+
+@st.cache_resource
+def get_location_index():
+    """Build the in-process City/State prefix index from the hotel catalog"""
+    return LocationIndex(get_hotel_catalog().location_pairs())
+
+def get_amenity_index():
+    """Amenity bitset index from the hotel catalog (rebuilt by the catalog after changes)"""
+    catalog = get_hotel_catalog()
+    catalog.ensure_fresh()
+    return catalog.amenity_index()
+
+def query_hotels_sql(**search):
+    """Run the hotel search in MySQL (stays outside the catalog's calendar window); Hotel records"""
+    with get_db_pool().connection() as connection:
+        cursor = connection.cursor()
+        try:
+            query, params = build_hotel_search_query(**search)
+            cursor.execute(query, params)
+            return hotels_from_cursor(cursor)
+        finally:
+            cursor.close()
+
+def fetch_hotels_from_db(location_filter=None, budget_filter=None, min_rating=None,
+                         start_date=None, end_date=None, sort_by=DEFAULT_SORT,
+                         after=None, limit=100, amenities_all=(), amenities_any=(), rooms_needed=1,
+                         guest_count=None):
+    """
+    Fetch hotels with enhanced filtering, as Hotel records
     
-    try:
-        cursor = connection.cursor(dictionary=True)
-        
-        query = """
-        SELECT 
-            h.HotelID,
-            h.HotelName as name,
-            h.City,
-            h.State,
-            CONCAT(h.City, ', ', h.State) as location,
-            h.AverageRating as rating,
-            h.PhoneNumber as phone,
-            h.Email as email,
-            h.Website as website,
-            h.StreetAddress as address,
-            h.Description,
-            COALESCE(AVG(r.BasePrice), 300) as price_per_night,
-            COALESCE(COUNT(DISTINCT r.RoomID), 0) as rooms,
-            GROUP_CONCAT(DISTINCT a.AmenityName SEPARATOR ', ') as amenities,
-            h.StarRating,
-            h.TotalRooms
-        FROM HOTEL h
-        LEFT JOIN ROOM r ON h.HotelID = r.HotelID AND r.RoomStatus = 'Available'
-        LEFT JOIN HOTELAMENITIES ha ON h.HotelID = ha.HotelID
-        LEFT JOIN AMENITIES a ON ha.AmenityID = a.AmenityID
-        WHERE 1=1
-        """
-        
-        params = []
-        
-        if location_filter and location_filter.strip():
-            location_filter_lower = location_filter.lower().strip()
-            query += " AND (LOWER(h.City) LIKE %s OR LOWER(h.State) = %s)"
-            params.extend([f"%{location_filter_lower}%", location_filter_lower])
-        
-        query += """ GROUP BY h.HotelID, h.HotelName, h.City, h.State, 
-                     h.PhoneNumber, h.Email, h.Website, h.StreetAddress, 
-                     h.AverageRating, h.StarRating, h.Description, h.TotalRooms"""
-        
-        if budget_filter:
-            query += " HAVING COALESCE(AVG(r.BasePrice), 300) <= %s"
-            params.append(budget_filter)
-        
-        if min_rating:
-            query += " AND h.AverageRating >= %s" if not budget_filter else " AND h.AverageRating >= %s"
-            params.append(min_rating)
-        
-        query += " ORDER BY h.AverageRating DESC, h.StarRating DESC LIMIT 100"
-        
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        
-        hotels = []
-        for row in results:
-            hotels.append({
-                "hotel_id": row.get("HotelID"),
-                "name": row.get("name", ""),
-                "location": row.get("location", ""),
-                "city": row.get("City", ""),
-                "state": row.get("State", ""),
-                "rating": float(row.get("rating", 4.5)) if row.get("rating") else 4.5,
-                "price_per_night": float(row.get("price_per_night", 300)) if row.get("price_per_night") else 300,
-                "rooms": int(row.get("rooms", 0)) if row.get("rooms") else 0,
-                "total_rooms": int(row.get("TotalRooms", 0)) if row.get("TotalRooms") else 0,
-                "amenities": row.get("amenities", "Amenities available"),
-                "category": f"{row.get('StarRating', 4)}-Star Hotel" if row.get("StarRating") else "Luxury Hotel",
-                "star_rating": row.get('StarRating', 4),
-                "phone": row.get("phone", ""),
-                "email": row.get("email", ""),
-                "website": row.get("website", ""),
-                "address": row.get("address", ""),
-                "description": row.get("Description", "Beautiful venue for your special day")
-            })
-        
-        cursor.close()
-        return hotels
+    Searches run against the shared in-memory catalog, which refreshes
+    incrementally from MySQL; stays beyond its calendar window go to SQL.
+    When start_date/end_date are given, only hotels with rooms free on every
+    night of the stay are returned, priced from AVAILABILITY.PriceOverride,
+    and `rooms_needed` (the room block) must be free on each of those nights.
+    With `guest_count`, catalog searches keep only hotels that can seat
+    everyone and attach the cheapest room mix as `room_plan` (the SQL
+    fallback returns no plan).
+    `after` is the (sort_key, hotel_id) of the last hotel on the previous page.
+    `amenities_all` / `amenities_any` are AmenityIDs (see get_amenity_index).
+    """
+    tracer = get_tracer()
+    with tracer.span("fetch_hotels", sort_by=sort_by, dated=bool(start_date and end_date)) as span:
+        try:
+            location = None
+            if location_filter and location_filter.strip():
+                location = get_location_index().resolve(location_filter)
+                if location.is_empty():
+                    span.set(source="location", rows=0)
+                    return []
+            
+            search = dict(
+                location=location,
+                budget_filter=budget_filter,
+                min_rating=min_rating,
+                start_date=start_date,
+                end_date=end_date,
+                sort_by=sort_by,
+                after=after,
+                limit=limit,
+                amenities_all=amenities_all,
+                amenities_any=amenities_any,
+                rooms_needed=rooms_needed
+            )
+            rows = get_hotel_catalog().search(guest_count=guest_count, **search)
+            tracer.count("cache_requests", cache="hotel_catalog", result="miss" if rows is None else "hit")
+            if rows is None:
+                hotels = query_hotels_sql(**search)
+                span.set(source="sql", rows=len(hotels))
+                return hotels
+        except Error as e:
+            span.set(source="error")
+            st.error(f"❌ Error fetching hotels: {e}")
+            return []
         
-    except Error as e:
-        st.error(f"❌ Error fetching hotels: {e}")
-        return []
-    finally:
-        if connection and connection.is_connected():
-            connection.close()
-
-@st.cache_data(ttl=3600)
+        span.set(source="catalog", rows=len(rows))
+        return [Hotel.from_row(row) for row in rows]
+
 def get_location_stats():
-    """Get statistics about available locations"""
-    connection = get_db_connection()
-    if connection is None:
+    """Get statistics about available locations (STATE_STATS, kept by the summary refresher); {} if unavailable"""
+    tracer = get_tracer()
+    with tracer.span("location_stats") as span:
+        try:
+            stats = load_location_stats()
+            result = span.get("cache", "hit")
+        except Error:
+            stats, result = {}, "error"
+        span.set(cache=result, rows=len(stats))
+    tracer.count("cache_requests", cache="location_stats", result=result)
+    return stats
+
+@st.cache_data(ttl=300)
+def load_location_stats():
+    """STATE_STATS rows by State, cached for five minutes; raises Error (and caches nothing) if MySQL fails"""
+    get_tracer().current_span().set(cache="miss")
+    get_search_summary_refresher()
+    with get_db_pool().connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT 
+                    State,
+                    HotelCount as hotel_count,
+                    RoomCount as room_count,
+                    AvgRating as avg_rating,
+                    MinRating as min_rating,
+                    MaxRating as max_rating
+                FROM STATE_STATS
+                ORDER BY hotel_count DESC
+            """)
+            return {row['State']: row for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+def load_hotel_details(hotel):
+    """
+    Hotel row, reviews and room types for the Details page
+
+    The three queries run concurrently (page latency ~ the slowest one);
+    a section whose query failed or timed out comes back as None.
+    """
+    calls = detail_calls(hotel, st.session_state.search_start_date, st.session_state.search_end_date)
+    results = get_query_executor().gather(calls, return_exceptions=True)
+    return {name: None if isinstance(value, Exception) else value for name, value in results.items()}
+
+def comparison_peers(hotel, limit=5):
+    """
+    (hotel_id, name, price_per_night, rating) of the venues to compare a hotel with
+
+    The most similar venues from the catalog's similar-venue index, at
+    the hotel's own nightly rate; HOTEL_SEARCH_SUMMARY if the catalog is
+    unavailable, else the loaded results.
+    """
+    try:
+        return get_hotel_catalog().comparison_peers(hotel.hotel_id, hotel.price_per_night, limit)
+    except Error:
+        pass
+    try:
+        with get_db_pool().connection() as connection:
+            rows = fetch_similar_hotels(connection, hotel.hotel_id, hotel.state, hotel.price_per_night, limit)
+        return [(row["HotelID"], row["name"], float(row["price_per_night"]), row["rating"]) for row in rows]
+    except Error:
+        others = get_hotel_records().get_many(offer_key(), st.session_state.result_ids[:limit + 1])
+        return [(h.hotel_id, h.name, h.price_per_night, h.rating)
+                for h in others if h and h.hotel_id != hotel.hotel_id][:limit]
+
+def amenity_filters():
+    """(amenities_all, amenities_any) AmenityIDs for the amenities picked on the Search page"""
+    if not st.session_state.search_amenities:
+        return (), ()
+    try:
+        amenity_ids = get_amenity_index().resolve(st.session_state.search_amenities)
+    except Error:
+        return (), ()
+    if st.session_state.search_amenity_mode == "Any":
+        return (), amenity_ids
+    return amenity_ids, ()
+
+def fetch_results_page(sort_by, page_size, after=None):
+    """Fetch one Results page for the current search criteria; returns (hotels, has_more)"""
+    amenities_all, amenities_any = amenity_filters()
+    hotels = fetch_hotels_from_db(
+        location_filter=st.session_state.search_location or None,
+        budget_filter=st.session_state.search_budget,
+        min_rating=st.session_state.min_rating,
+        start_date=st.session_state.search_start_date,
+        end_date=st.session_state.search_end_date,
+        sort_by=sort_by,
+        after=after,
+        limit=page_size + 1,
+        amenities_all=amenities_all,
+        amenities_any=amenities_any,
+        rooms_needed=st.session_state.rooms_needed,
+        guest_count=st.session_state.guest_count
+    )
+    has_more = len(hotels) > page_size
+    hotels = hotels[:page_size]
+    if st.session_state.search_start_date and st.session_state.search_end_date:
+        # Rooms the party needs at each hotel: the room block, or more if the guest plan calls for it.
+        # Priced as the cheapest free rooms, the way the booking allocates them, not the plan's room mix
+        num_rooms = {
+            hotel.hotel_id: max(st.session_state.rooms_needed, hotel.room_plan.room_count if hotel.room_plan else 1)
+            for hotel in hotels
+        }
+        quotes = quote_stays(list(num_rooms), st.session_state.search_start_date,
+                             st.session_state.search_end_date, num_rooms)
+        hotels = [hotel._replace(stay_quote=quotes.get(hotel.hotel_id)) for hotel in hotels]
+    return hotels, has_more
+
+def offer_key():
+    """Search fields that shape a Hotel record's offer (its HotelRecords key)"""
+    return (st.session_state.search_start_date, st.session_state.search_end_date,
+            st.session_state.guest_count, st.session_state.rooms_needed)
+
+def selected_hotel():
+    """Hotel record of the selected HotelID (None if nothing is selected or it was evicted)"""
+    return get_hotel_records().get(offer_key(), st.session_state.selected_hotel_id)
+
+def quote_stays(hotel_ids, check_in, check_out, num_rooms):
+    """
+    {hotel_id: StayQuote or None} for a stay, all hotels priced in one batch
+
+    Priced from the in-memory catalog (SQL beyond its calendar window) with
+    the same rates, group discount, fee and tax the booking is charged.
+    `num_rooms` is one count or {hotel_id: count}. Empty on a database error.
+    """
+    if not hotel_ids or not (check_in and check_out) or check_out <= check_in:
         return {}
-    
     try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT 
-                State,
-                COUNT(*) as hotel_count,
-                AVG(AverageRating) as avg_rating,
-                MIN(AverageRating) as min_rating,
-                MAX(AverageRating) as max_rating
-            FROM HOTEL
-            GROUP BY State
-            ORDER BY hotel_count DESC
-        """)
-        results = cursor.fetchall()
-        cursor.close()
-        return {row['State']: row for row in results}
-    except Error as e:
+        quotes = get_hotel_catalog().quote_stays(hotel_ids, check_in, check_out, num_rooms)
+        if quotes is None:
+            with get_db_pool().connection() as connection:
+                quotes = fetch_stay_quotes(connection, hotel_ids, check_in, check_out, num_rooms)
+    except Error:
+        return {}
+    return quotes
+
+def fetch_amenity_facets():
+    """{amenity name: hotel count} across every page of the current search"""
+    amenities_all, amenities_any = amenity_filters()
+    try:
+        location = None
+        if st.session_state.search_location and st.session_state.search_location.strip():
+            location = get_location_index().resolve(st.session_state.search_location)
+        filters = dict(
+            location=location,
+            budget_filter=st.session_state.search_budget,
+            min_rating=st.session_state.min_rating,
+            start_date=st.session_state.search_start_date,
+            end_date=st.session_state.search_end_date,
+            amenities_all=amenities_all,
+            amenities_any=amenities_any,
+            rooms_needed=st.session_state.rooms_needed
+        )
+        catalog = get_hotel_catalog()
+        amenity_index = get_amenity_index()
+        counts = catalog.amenity_facets(guest_count=st.session_state.guest_count, **filters)
+        if counts is None:
+            rows = query_hotels_sql(limit=len(catalog.hotels) or 1, **filters)
+            counts = amenity_index.facet_counts(hotel.hotel_id for hotel in rows)
+    except Error:
         return {}
-    finally:
-        if connection and connection.is_connected():
-            connection.close()
+    return {amenity_index.names[a]: n for a, n in counts.items() if n}
+
+# ============================================================
+# STARTUP WARM-UP
+# ============================================================
+#
+# The first script run in a process starts loading the pool, catalog and
+# location stats in the background, so the first search finds them warm.
+# With `health_port` set, GET /readyz on that port turns 200 once done.
+
+def warm_catalog():
+    """Load the hotel catalog and build its search, similar-venue, calendar and location indexes"""
+    catalog = get_hotel_catalog()
+    catalog.ensure_fresh()
+    catalog.columns()
+    catalog.similar_venues()
+    catalog.calendar()
+    get_location_index()
+
+@st.cache_resource
+def get_warmup():
+    """Start the process-wide warm-up and, with `health_port` set, its readiness endpoint"""
+    prefill = st.secrets.get("mysql_pool_prefill", 4)
+    warmup = WarmUp(
+        [
+            ("connection_pool", lambda: get_db_pool().prefill(prefill)),
+            ("hotel_catalog", warm_catalog),
+            ("location_stats", load_location_stats),
+        ],
+        retry_interval=st.secrets.get("warmup_retry_seconds", 5.0)
+    )
+    warmup.start()
+    port = st.secrets.get("health_port")
+    if port:
+        try:
+            HealthServer(warmup, port).start()
+        except OSError as e:
+            st.warning(f"⚠️ Readiness endpoint not started on port {port}: {e}")
+    return warmup
+
+get_warmup()
 
 # ============================================================
 # SESSION STATE INITIALIZATION
@@ -407,24 +445,465 @@ if "search_budget" not in st.session_state:
 if "min_rating" not in st.session_state:
     st.session_state.min_rating = 4.0
 
+if "search_amenities" not in st.session_state:
+    st.session_state.search_amenities = []
+
+if "search_amenity_mode" not in st.session_state:
+    st.session_state.search_amenity_mode = "All"
+
 if "search_start_date" not in st.session_state:
     st.session_state.search_start_date = datetime.now().date() + timedelta(days=180)
 
 if "search_end_date" not in st.session_state:
     st.session_state.search_end_date = datetime.now().date() + timedelta(days=183)
 
-if "search_results" not in st.session_state:
-    st.session_state.search_results = []
+if "result_ids" not in st.session_state:
+    st.session_state.result_ids = []
+
+if "results_cursor" not in st.session_state:
+    # Keyset cursor (sort_key, HotelID) of the last loaded result
+    st.session_state.results_cursor = None
 
-if "selected_hotel" not in st.session_state:
-    st.session_state.selected_hotel = None
+if "results_has_more" not in st.session_state:
+    st.session_state.results_has_more = False
+
+if "results_window" not in st.session_state:
+    st.session_state.results_window = 0
+
+if "results_picker_version" not in st.session_state:
+    st.session_state.results_picker_version = 0
+
+if "results_page_key" not in st.session_state:
+    st.session_state.results_page_key = None
+
+if "selected_hotel_id" not in st.session_state:
+    st.session_state.selected_hotel_id = None
 
 if "booking_confirmed" not in st.session_state:
     st.session_state.booking_confirmed = False
 
+if "booking_session_key" not in st.session_state:
+    # Seeds the booking idempotency key; open_booking() mints a new one per Booking page visit
+    st.session_state.booking_session_key = uuid.uuid4().hex
+
 if "guest_count" not in st.session_state:
     st.session_state.guest_count = 50
 
+if "rooms_needed" not in st.session_state:
+    st.session_state.rooms_needed = 1
+
+if "search_key" not in st.session_state:
+    # SEARCHQUERIES row of the last search; clicks and bookings are logged against it
+    st.session_state.search_key = None
+
+# ============================================================
+# PAGE TRACING
+# ============================================================
+#
+# One root span per script run, named for the page it started on; the
+# location stats, hotel fetches and charts it runs are its children. A run
+# cut short by st.rerun() or st.stop() never reaches the end of the
+# script, so the next run of the session closes its span as interrupted.
+
+def begin_page_trace():
+    """Count this script run and start its page span"""
+    tracer = get_tracer()
+    interrupted = st.session_state.get("page_span")
+    if interrupted is not None:
+        interrupted.end(interrupted=True)
+    tracer.count("script_runs", page=st.session_state.page)
+    span = tracer.start_span(f"page.{st.session_state.page}", root=True, page=st.session_state.page).activate()
+    st.session_state.page_span = span
+    return span
+
+def end_page_trace(span):
+    st.session_state.page_span = None
+    span.end(interrupted=False)
+
+def traced_fragment(name):
+    """
+    st.fragment that is also traced
+
+    A widget inside a fragment reruns only that function, not the script.
+    Run as part of the page it is a child span of the page; rerun on its
+    own it is a root `fragment.<name>` span and counts as a fragment run.
+    """
+    def decorate(fn):
+        @st.fragment
+        @wraps(fn)
+        def run(*args, **kwargs):
+            tracer = get_tracer()
+            if st.session_state.get("page_span") is None:
+                tracer.count("fragment_runs", fragment=name)
+                span = tracer.start_span(f"fragment.{name}", root=True, page=st.session_state.page)
+            else:
+                span = tracer.span(f"fragment.{name}")
+            with span:
+                return fn(*args, **kwargs)
+        return run
+    return decorate
+
+page_span = begin_page_trace()
+
+# ============================================================
+# PAGE FRAGMENTS
+# ============================================================
+
+RESULTS_BATCH_SIZES = [20, 50, 100]  # venues fetched per "load more" (keyset page size)
+GRID_WINDOW = 12                     # cards rendered at a time in Grid view
+
+def load_results(sort_by, batch_size, reset=False):
+    """
+    Fetch the next batch of results after the loaded ones (the first batch if reset)
+
+    Appends their HotelIDs to `result_ids` and moves the keyset cursor;
+    returns the batch as Hotel records.
+    """
+    hotels, has_more = fetch_results_page(
+        sort_by, batch_size, after=None if reset else st.session_state.results_cursor
+    )
+    hotel_ids = get_hotel_records().put(offer_key(), hotels)
+    if reset:
+        st.session_state.result_ids = hotel_ids
+        st.session_state.results_window = 0
+    else:
+        st.session_state.result_ids = st.session_state.result_ids + hotel_ids
+    if hotels:
+        st.session_state.results_cursor = (hotels[-1].sort_key, hotels[-1].hotel_id)
+    st.session_state.results_has_more = has_more
+    st.session_state.results_page_key = (sort_by, batch_size)
+    return hotels
+
+def open_hotel(hotel_id):
+    """Open a result's Details page; the one handler behind the Grid picker and the List table"""
+    st.session_state.selected_hotel_id = hotel_id
+    st.session_state.results_picker_version += 1  # fresh, unselected pickers on the way back
+    get_search_logger().log_click(st.session_state.search_key, hotel_id)
+    st.session_state.page = "Details"
+    st.rerun()
+
+def open_booking():
+    """Open the Booking page for the selected venue; every visit is a new booking"""
+    # Confirm clicks within one visit share the key and replay; a new visit books afresh
+    st.session_state.booking_session_key = uuid.uuid4().hex
+    st.session_state.booking_confirmed = False
+    st.session_state.page = "Booking"
+    st.rerun()
+
+def result_card_html(hotel):
+    """One Grid card (no indentation, so a run of cards stays one markdown HTML block)"""
+    extras = ""
+    if hotel.room_plan:
+        extras += (f'<div class="hotel-extra">👥 {st.session_state.guest_count} guests: {hotel.room_plan.describe()} '
+                   f'(${hotel.room_plan.nightly_cost:,.0f}/night)</div>')
+    if hotel.stay_quote:
+        quote = hotel.stay_quote
+        extras += (f'<div class="hotel-extra">💰 Stay total ${quote.total:,.2f} for the {quote.num_rooms} cheapest '
+                   f'free rooms × {quote.nights} nights (incl. fees &amp; tax)</div>')
+    return (
+        f'<div class="hotel-card">'
+        f'<div class="hotel-name">{hotel.name}</div>'
+        f'<div class="hotel-location">📍 {hotel.location}</div>'
+        f'<div style="margin: 0.5rem 0;"><span class="hotel-rating">⭐ {hotel.rating}/5.0</span> '
+        f'<span class="badge badge-luxury">{hotel.category}</span></div>'
+        f'<div class="hotel-price">${hotel.price_per_night:.0f}<span style="font-size: 1rem; color: #7F8C8D;">/night</span></div>'
+        f'<div style="color: #7F8C8D; margin-top: 0.5rem;">🏨 {hotel.total_rooms} rooms | 🛏️ {hotel.rooms} available</div>'
+        f'{extras}</div>'
+    )
+
+def results_grid(hotels, sort_by, batch_size):
+    """Grid view: only the current window of cards, as one element, plus one picker to open a venue"""
+    start = min(st.session_state.results_window, max(0, len(hotels) - 1)) // GRID_WINDOW * GRID_WINDOW
+    window = hotels[start:start + GRID_WINDOW]
+    st.caption(f"Venues {start + 1}–{start + len(window)} of {len(hotels)} loaded")
+    st.markdown('<div class="results-grid">' + "".join(map(result_card_html, window)) + '</div>',
+                unsafe_allow_html=True)
+    
+    names = {hotel.hotel_id: f"{hotel.name} — {hotel.location}" for hotel in window}
+    picked = st.selectbox(
+        "🔎 View details for",
+        [None] + list(names),
+        format_func=lambda hotel_id: "Choose a venue…" if hotel_id is None else names[hotel_id],
+        key=f"results_grid_pick_{st.session_state.results_picker_version}"
+    )
+    if picked is not None:
+        open_hotel(picked)
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if start > 0 and st.button("← Previous", use_container_width=True):
+            st.session_state.results_window = start - GRID_WINDOW
+            st.rerun(scope="fragment")
+    with col3:
+        end = start + GRID_WINDOW
+        if (end < len(hotels) or st.session_state.results_has_more) and st.button("Next →", use_container_width=True):
+            # Past the loaded venues: fetch from the keyset cursor until the next window is filled
+            while len(st.session_state.result_ids) < end + GRID_WINDOW and st.session_state.results_has_more:
+                if not load_results(sort_by, batch_size):
+                    break
+            st.session_state.results_window = end
+            st.rerun(scope="fragment")
+
+def results_table(hotels, sort_by, batch_size):
+    """List view: every loaded venue in one virtualized table; selecting a row opens it"""
+    # Plain columns: Streamlit loads its DataFrame stack on the first table drawn
+    table = {
+        "Venue": [hotel.name for hotel in hotels],
+        "Location": [hotel.location for hotel in hotels],
+        "Rating": [hotel.rating for hotel in hotels],
+        "Category": [hotel.category for hotel in hotels],
+        "Price/Night": [hotel.price_per_night for hotel in hotels],
+        "Stay Total": [float(hotel.stay_quote.total) if hotel.stay_quote else None for hotel in hotels],
+        "Available": [hotel.rooms for hotel in hotels],
+        "Room Plan": [hotel.room_plan.describe() if hotel.room_plan else "" for hotel in hotels],
+        "Amenities": [hotel.amenities for hotel in hotels],
+    }
+    event = st.dataframe(
+        table,
+        column_config={
+            "Rating": st.column_config.NumberColumn(format="%.1f ⭐"),
+            "Price/Night": st.column_config.NumberColumn(format="$%.0f"),
+            "Stay Total": st.column_config.NumberColumn(
+                format="$%.2f", help="Cheapest free rooms for the party, incl. fees & tax (not the Room Plan mix)"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        height=560,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"results_table_{st.session_state.results_picker_version}"
+    )
+    st.caption("Select a row to view the venue")
+    if event.selection.rows:
+        # Positions in `hotels`, whatever column the table is sorted by in the browser
+        open_hotel(hotels[event.selection.rows[0]].hotel_id)
+    
+    if st.session_state.results_has_more and st.button(f"Load {batch_size} more venues", use_container_width=True):
+        load_results(sort_by, batch_size)
+        st.rerun(scope="fragment")
+
+@traced_fragment("results")
+def results_list():
+    """Results page sort/view controls and the loaded venues; changing any of them reruns only this"""
+    # Results summary (filled in once the venues are loaded)
+    summary = st.empty()
+    
+    # Filter and sort options
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_by = st.selectbox("Sort by", list(SORT_OPTIONS))
+    with col2:
+        view_mode = st.radio("View", ["Grid", "List"], horizontal=True)
+    with col3:
+        batch_size = st.selectbox("Load", RESULTS_BATCH_SIZES, index=0, format_func=lambda n: f"{n} at a time")
+    
+    # Sorting and paging run in SQL; changing either reloads from the first venue
+    if st.session_state.results_page_key != (sort_by, batch_size):
+        load_results(sort_by, batch_size, reset=True)
+    hotels = get_hotel_records().get_many(offer_key(), st.session_state.result_ids)
+    if None in hotels:
+        # Evicted from the shared store since they were loaded
+        hotels = load_results(sort_by, batch_size, reset=True)
+    
+    if not hotels:
+        st.info("No venues match these filters any more. Try a new search.")
+        return
+    
+    more = " (more available)" if st.session_state.results_has_more else ""
+    summary.markdown(f"### 📊 {len(hotels)} Venues Loaded{more}")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    if view_mode == "Grid":
+        results_grid(hotels, sort_by, batch_size)
+    else:
+        results_table(hotels, sort_by, batch_size)
+
+def booking_rooms_key(hotel):
+    """Widget key of the Booking page room count, one per venue so max_value always fits"""
+    return f"booking_rooms_{hotel.hotel_id}"
+
+@traced_fragment("booking_price")
+def booking_price_panel(hotel):
+    """Booking page dates, room count and price breakdown; changing the room count reruns only this"""
+    # Booking dates and pricing
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        <div class="info-box">
+            <h3>📅 Event Dates</h3>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        check_in = st.session_state.search_start_date
+        check_out = st.session_state.search_end_date
+        nights = (check_out - check_in).days
+        
+        st.markdown(f"**Check-in:** {check_in.strftime('%A, %B %d, %Y')}")
+        st.markdown(f"**Check-out:** {check_out.strftime('%A, %B %d, %Y')}")
+        st.markdown(f"**Total Nights:** {nights}")
+        
+        # Room selection
+        st.markdown("<br>", unsafe_allow_html=True)
+        plan = hotel.room_plan
+        num_rooms = st.number_input(
+            "Number of Rooms",
+            min_value=1,
+            max_value=hotel.rooms,
+            value=min(plan.room_count if plan else 5, hotel.rooms),
+            help=f"{hotel.rooms} rooms available",
+            key=booking_rooms_key(hotel)
+        )
+        if plan:
+            st.caption(f"👥 Suggested for {st.session_state.guest_count} guests: {plan.describe()} "
+                       f"(${plan.nightly_cost:,.2f}/night)")
+    
+    with col2:
+        st.markdown("""
+        <div class="info-box" style="background: linear-gradient(135deg, #E8F5E9 0%, #C8E6C9 100%);">
+            <h3>💰 Pricing Breakdown</h3>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        quote = quote_stays([hotel.hotel_id], check_in, check_out, num_rooms).get(hotel.hotel_id)
+        if quote is None:
+            st.warning(f"⚠️ {num_rooms} rooms are not free on every night of your stay. Try fewer rooms or different dates.")
+        else:
+            st.markdown(f"**Room Rate:** ${quote.average_nightly_rate:,.2f} avg × {nights} nights × {num_rooms} rooms")
+            st.markdown(f"**Subtotal:** ${quote.subtotal:,.2f}")
+            if quote.discount:
+                st.markdown(f"**Group Discount ({quote.discount_rate:.0f}%):** −${quote.discount:,.2f}")
+            st.markdown(f"**Service Fee (5%):** ${quote.service_fee:,.2f}")
+            st.markdown(f"**Tax (10%):** ${quote.tax:,.2f}")
+            st.markdown("---")
+            st.markdown(f"### **Total Amount:** ${quote.total:,.2f}")
+
+@traced_fragment("booking_form")
+def booking_form(hotel):
+    """Booking page special requests, terms and confirmation, for the room count chosen above"""
+    check_in = st.session_state.search_start_date
+    check_out = st.session_state.search_end_date
+    num_rooms = st.session_state[booking_rooms_key(hotel)]
+    
+    # Special requests
+    st.markdown("""
+    <div class="info-box">
+        <h3>📝 Special Requests (Optional)</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    special_requests = st.text_area(
+        "Add any special requirements or requests",
+        placeholder="e.g., Dietary restrictions, accessibility needs, preferred ceremony location, etc.",
+        height=100
+    )
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Terms and conditions
+    agree_terms = st.checkbox("I agree to the terms and conditions and cancellation policy")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Confirmation buttons
+    col1, col2, col3 = st.columns([1, 1, 1])
+    
+    with col1:
+        if st.button("← Back to Details", use_container_width=True):
+            st.session_state.page = "Details"
+            st.rerun()
+    
+    with col2:
+        pass  # Empty column for spacing
+    
+    with col3:
+        if st.button("✓ Confirm Booking", use_container_width=True, type="primary", disabled=not agree_terms):
+            if agree_terms:
+                # Same page visit, venue, dates and room count -> same key, so
+                # a double click or rerun replays the first booking instead of
+                # reserving the rooms twice
+                idempotency_key = hashlib.sha256(
+                    f"{st.session_state.booking_session_key}|{hotel.hotel_id}|"
+                    f"{check_in}|{check_out}|{num_rooms}".encode()
+                ).hexdigest()
+                guest = Guest.from_full_name(
+                    st.session_state.user_name, st.session_state.user_email,
+                    st.session_state.user_phone, st.session_state.user_role
+                )
+                try:
+                    with st.spinner("Reserving your rooms..."):
+                        booking = get_booking_service().book(
+                            idempotency_key, hotel.hotel_id, check_in, check_out, num_rooms, guest,
+                            num_guests=st.session_state.guest_count,
+                            special_requests=special_requests
+                        )
+                except SoldOutError as e:
+                    st.error(f"❌ {e}. Try fewer rooms or different dates.")
+                    st.stop()
+                except (BookingError, ValueError) as e:
+                    st.error(f"❌ {e}")
+                    st.stop()
+                except Error as e:
+                    st.error(f"❌ Booking failed, nothing was charged or reserved: {e}")
+                    st.stop()
+                
+                confirmation_number = booking.confirmation_number
+                total = float(booking.total_price)
+                if booking.replayed:
+                    st.info(f"""
+                    ### ℹ️ Already Booked
+                    
+                    This booking was already confirmed as `{confirmation_number}`; nothing new was reserved
+                    and changes to your requests were not saved. To book again, open the venue's Booking page anew.
+                    """)
+                else:
+                    get_search_logger().log_booking(st.session_state.search_key, hotel.hotel_id)
+                    try:
+                        get_hotel_catalog().refresh_hotel(hotel.hotel_id)
+                    except Error:
+                        pass  # the catalog's incremental refresh picks the change up
+                    
+                    st.balloons()
+                    
+                    st.success(f"""
+                    ### 🎉 Booking Confirmed!
+                    
+                    **Confirmation Number:** `{confirmation_number}`
+                    
+                    Thank you for booking with us! A confirmation email has been sent to **{st.session_state.user_email}**
+                    
+                    The venue coordinator will contact you within 24 hours to discuss your special requirements.
+                    """)
+                
+                st.session_state.booking_confirmed = True
+                
+                # Summary box
+                st.markdown(f"""
+                <div class="info-box" style="background: linear-gradient(135deg, #D4AF37 0%, #B8860B 100%); color: white;">
+                    <h3>📋 Booking Summary</h3>
+                    <p><strong>Venue:</strong> {hotel.name}</p>
+                    <p><strong>Dates:</strong> {check_in.strftime('%b %d')} - {check_out.strftime('%b %d, %Y')}</p>
+                    <p><strong>Rooms:</strong> {num_rooms}</p>
+                    <p><strong>Total:</strong> ${total:,.2f}</p>
+                    <p><strong>Confirmation:</strong> {confirmation_number}</p>
+                </div>
+                """, unsafe_allow_html=True)
+                
+            else:
+                st.error("Please agree to the terms and conditions to proceed")
+    
+    # Outside the Confirm branch, so its click survives the rerun it triggers
+    if st.session_state.booking_confirmed:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("🏠 Return to Home", use_container_width=True):
+            # Reset for new search
+            st.session_state.booking_confirmed = False
+            st.session_state.selected_hotel_id = None
+            st.session_state.result_ids = []
+            st.session_state.page = "Home"
+            st.rerun()
+
 # ============================================================
 # SIDEBAR NAVIGATION
 # ============================================================
@@ -438,13 +917,10 @@ with st.sidebar:
     current_page_idx = pages.index(st.session_state.page) if st.session_state.page in pages else 0
     
     st.markdown("#### 📍 Your Journey")
-    for idx, page in enumerate(pages):
-        if idx < current_page_idx:
-            st.markdown(f"✅ {page}")
-        elif idx == current_page_idx:
-            st.markdown(f"**➡️ {page}**")
-        else:
-            st.markdown(f"⚪ {page}")
+    st.markdown("  \n".join(
+        f"✅ {page}" if idx < current_page_idx else f"**➡️ {page}**" if idx == current_page_idx else f"⚪ {page}"
+        for idx, page in enumerate(pages)
+    ))
     
     st.markdown("---")
     
@@ -457,17 +933,16 @@ with st.sidebar:
         st.session_state.page = "Search"
         st.rerun()
     
-    if st.session_state.search_results and st.button("📋 View Results", use_container_width=True):
+    if st.session_state.result_ids and st.button("📋 View Results", use_container_width=True):
         st.session_state.page = "Results"
         st.rerun()
     
-    if st.session_state.selected_hotel and st.button("🏨 Hotel Details", use_container_width=True):
+    if st.session_state.selected_hotel_id and st.button("🏨 Hotel Details", use_container_width=True):
         st.session_state.page = "Details"
         st.rerun()
     
-    if st.session_state.selected_hotel and st.button("✓ Book Now", use_container_width=True):
-        st.session_state.page = "Booking"
-        st.rerun()
+    if st.session_state.selected_hotel_id and st.button("✓ Book Now", use_container_width=True):
+        open_booking()
     
     st.markdown("---")
     st.markdown("#### 👤 User Info")
@@ -476,6 +951,29 @@ with st.sidebar:
         st.caption(f"📧 {st.session_state.user_email}")
     else:
         st.info("Not logged in")
+    
+    if st.session_state.user_role == "Hotel Admin":
+        st.markdown("---")
+        st.markdown("#### 🛠️ Hotel Catalog")
+        if st.button("🔄 Refresh Catalog", use_container_width=True):
+            get_hotel_catalog().force_refresh()
+            st.success("✓ Catalog reloaded from database")
+        catalog_stats = get_hotel_catalog().stats()
+        st.caption(
+            f"{catalog_stats['hotels']} hotels | {catalog_stats['hits']} hits / "
+            f"{catalog_stats['misses']} misses | {catalog_stats['refreshes']} refreshes"
+        )
+        warmup_status = get_warmup().status()
+        if warmup_status["ready"]:
+            st.caption(f"Warm-up done in {warmup_status['ready_after_seconds']:.1f}s")
+        else:
+            pending = [name for name, step in warmup_status["steps"].items() if step["state"] != "ready"]
+            st.caption(f"Warming up: {', '.join(pending)}")
+        try:
+            summary_lag = get_search_summary_refresher().staleness()
+            st.caption(f"Search summary {summary_lag:.0f}s behind")
+        except Error:
+            st.caption("Search summary unavailable")
 
 # ============================================================
 # PAGE 1: HOME / LANDING
@@ -502,13 +1000,24 @@ if st.session_state.page == "Home":
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Stats section
+    # Stats section (live from STATE_STATS once the summary refresher has run)
+    location_stats = get_location_stats()
+    hotel_total = sum(row["hotel_count"] for row in location_stats.values())
+    hotels_label, rooms_label, rating_label = "46+", "136+", "4.8★"
+    if hotel_total:
+        rated = [(float(row["avg_rating"]), row["hotel_count"])
+                 for row in location_stats.values() if row["avg_rating"] is not None]
+        hotels_label = f"{hotel_total:,}"
+        rooms_label = f"{sum(int(row['room_count']) for row in location_stats.values()):,}"
+        if rated:
+            rating_label = f"{sum(r * n for r, n in rated) / sum(n for _, n in rated):.1f}★"
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         <div class="stats-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">
-            <div class="stats-number">46+</div>
+            <div class="stats-number">{hotels_label}</div>
             <div class="stats-label">Premium Hotels</div>
         </div>
         """, unsafe_allow_html=True)
@@ -522,17 +1031,17 @@ if st.session_state.page == "Home":
         """, unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
+        st.markdown(f"""
         <div class="stats-card" style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);">
-            <div class="stats-number">136+</div>
+            <div class="stats-number">{rooms_label}</div>
             <div class="stats-label">Luxury Rooms</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col4:
-        st.markdown("""
+        st.markdown(f"""
         <div class="stats-card" style="background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);">
-            <div class="stats-number">4.8★</div>
+            <div class="stats-number">{rating_label}</div>
             <div class="stats-label">Avg Rating</div>
         </div>
         """, unsafe_allow_html=True)
@@ -650,6 +1159,26 @@ elif st.session_state.page == "Search":
                     step=0.5,
                     format="%.1f ⭐"
                 )
+            
+            try:
+                amenity_options = get_amenity_index().options()
+            except Error:
+                amenity_options = []
+            col_a, col_b = st.columns([3, 1])
+            with col_a:
+                amenities = st.multiselect(
+                    "Must-have Amenities",
+                    amenity_options,
+                    default=[a for a in st.session_state.search_amenities if a in amenity_options],
+                    placeholder="e.g., Ballroom, Beach Access, Spa"
+                )
+            with col_b:
+                amenity_mode = st.radio(
+                    "Match",
+                    ["All", "Any"],
+                    index=["All", "Any"].index(st.session_state.search_amenity_mode),
+                    help="All: venue has every selected amenity. Any: at least one."
+                )
         
         with col2:
             st.markdown("""
@@ -677,6 +1206,14 @@ elif st.session_state.page == "Search":
                 value=st.session_state.guest_count,
                 step=10
             )
+            
+            rooms_needed = st.number_input(
+                "Room Block",
+                min_value=1,
+                max_value=200,
+                value=st.session_state.rooms_needed,
+                help="Only show venues with this many rooms free on every night of your stay"
+            )
         
         st.markdown("<br>", unsafe_allow_html=True)
         
@@ -688,20 +1225,26 @@ elif st.session_state.page == "Search":
                     st.session_state.search_location = location
                     st.session_state.search_budget = budget
                     st.session_state.min_rating = min_rating
+                    st.session_state.search_amenities = amenities
+                    st.session_state.search_amenity_mode = amenity_mode
                     st.session_state.search_start_date = start_date
                     st.session_state.search_end_date = end_date
                     st.session_state.guest_count = guest_count
+                    st.session_state.rooms_needed = rooms_needed
                     
-                    # Fetch from database
-                    results = fetch_hotels_from_db(
-                        location_filter=location if location else None,
-                        budget_filter=budget,
-                        min_rating=min_rating
+                    # Fetch the first batch of results from the database
+                    started = time.perf_counter()
+                    results = load_results(DEFAULT_SORT, RESULTS_BATCH_SIZES[0], reset=True)
+                    st.session_state.search_key = get_search_logger().log_search(
+                        location=location, check_in=start_date, check_out=end_date,
+                        guest_count=guest_count, rooms_needed=rooms_needed, max_budget=budget,
+                        min_rating=min_rating, amenities=amenities,
+                        results_count=len(results),  # first batch of results
+                        latency_ms=(time.perf_counter() - started) * 1000
                     )
                     
                     if results:
-                        st.session_state.search_results = results
-                        st.success(f"✓ Found {len(results)} amazing venues!")
+                        st.success("✓ Found amazing venues!")
                         st.session_state.page = "Results"
                         st.rerun()
                     else:
@@ -719,120 +1262,54 @@ elif st.session_state.page == "Results":
     </div>
     """, unsafe_allow_html=True)
     
-    if not st.session_state.search_results:
+    if not st.session_state.result_ids:
         st.warning("⚠️ No search results found. Please perform a search first.")
         if st.button("← Back to Search"):
             st.session_state.page = "Search"
             st.rerun()
     else:
-        # Results summary
-        st.markdown(f"### 📊 Found {len(st.session_state.search_results)} Venues")
         st.markdown(f"**Location:** {st.session_state.search_location or 'All Locations'} | **Budget:** ${st.session_state.search_budget}/night | **Rating:** {st.session_state.min_rating}+ ⭐")
-        st.markdown("---")
+        if st.session_state.rooms_needed > 1:
+            st.markdown(f"**Room Block:** {st.session_state.rooms_needed} rooms every night")
+        if st.session_state.search_amenities:
+            joiner = " + " if st.session_state.search_amenity_mode == "All" else " or "
+            st.markdown(f"**Amenities:** {joiner.join(st.session_state.search_amenities)}")
         
-        # Filter and sort options
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            sort_by = st.selectbox("Sort by", ["Highest Rated", "Lowest Price", "Highest Price", "Most Rooms"])
-        with col2:
-            view_mode = st.radio("View", ["Grid", "List"], horizontal=True)
-        with col3:
-            results_per_page = st.selectbox("Show", [10, 20, 50], index=0)
-        
-        # Sort results
-        results = st.session_state.search_results.copy()
-        if sort_by == "Highest Rated":
-            results.sort(key=lambda x: x['rating'], reverse=True)
-        elif sort_by == "Lowest Price":
-            results.sort(key=lambda x: x['price_per_night'])
-        elif sort_by == "Highest Price":
-            results.sort(key=lambda x: x['price_per_night'], reverse=True)
-        elif sort_by == "Most Rooms":
-            results.sort(key=lambda x: x['total_rooms'], reverse=True)
-        
-        results = results[:results_per_page]
-        
-        st.markdown("<br>", unsafe_allow_html=True)
+        # Amenity facet counts over the whole result set
+        facets = fetch_amenity_facets()
+        if facets:
+            top = sorted(facets.items(), key=lambda item: (-item[1], item[0]))[:8]
+            st.caption("✨ " + " · ".join(f"{name} ({count})" for name, count in top))
+        st.markdown("---")
         
-        # Display results
-        if view_mode == "Grid":
-            # Grid view - 2 columns
-            for i in range(0, len(results), 2):
-                cols = st.columns(2)
-                for j, col in enumerate(cols):
-                    if i + j < len(results):
-                        hotel = results[i + j]
-                        with col:
-                            # Create hotel card
-                            st.markdown(f"""
-                            <div class="hotel-card">
-                                <div class="hotel-name">{hotel['name']}</div>
-                                <div class="hotel-location">📍 {hotel['location']}</div>
-                                <div style="margin: 0.5rem 0;">
-                                    <span class="hotel-rating">⭐ {hotel['rating']}/5.0</span>
-                                    <span class="badge badge-luxury">{hotel['category']}</span>
-                                </div>
-                                <div class="hotel-price">${hotel['price_per_night']:.0f}<span style="font-size: 1rem; color: #7F8C8D;">/night</span></div>
-                                <div style="color: #7F8C8D; margin-top: 0.5rem;">
-                                    🏨 {hotel['total_rooms']} rooms | 🛏️ {hotel['rooms']} available
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            if st.button(f"View Details →", key=f"view_{hotel['hotel_id']}", use_container_width=True):
-                                st.session_state.selected_hotel = hotel
-                                st.session_state.page = "Details"
-                                st.rerun()
-        else:
-            # List view
-            for idx, hotel in enumerate(results, 1):
-                col1, col2, col3 = st.columns([3, 1, 1])
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="hotel-card">
-                        <div class="hotel-name">{idx}. {hotel['name']}</div>
-                        <div class="hotel-location">📍 {hotel['location']}</div>
-                        <div style="margin: 0.5rem 0;">
-                            <span class="hotel-rating">⭐ {hotel['rating']}/5.0</span>
-                            <span class="badge badge-luxury">{hotel['category']}</span>
-                        </div>
-                        <div style="color: #7F8C8D; font-size: 0.9rem; margin-top: 0.5rem;">
-                            ✨ {hotel['amenities'][:150]}...
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    st.metric("Price/Night", f"${hotel['price_per_night']:.0f}")
-                    st.caption(f"🏨 {hotel['total_rooms']} total rooms")
-                
-                with col3:
-                    st.markdown("<br><br>", unsafe_allow_html=True)
-                    if st.button("View Details", key=f"list_view_{hotel['hotel_id']}", use_container_width=True):
-                        st.session_state.selected_hotel = hotel
-                        st.session_state.page = "Details"
-                        st.rerun()
+        results_list()
 
 # ============================================================
 # PAGE 4: HOTEL DETAILS
 # ============================================================
 
 elif st.session_state.page == "Details":
-    if not st.session_state.selected_hotel:
+    hotel = selected_hotel()
+    if not hotel:
         st.warning("⚠️ Please select a hotel first")
         if st.button("← Back to Results"):
             st.session_state.page = "Results"
             st.rerun()
     else:
-        hotel = st.session_state.selected_hotel
+        details = load_hotel_details(hotel)
+        if details["hotel"]:
+            live = details["hotel"]
+            hotel = hotel._replace(
+                rating=float(live["AverageRating"]) if live["AverageRating"] is not None else hotel.rating,
+                review_count=int(live["ReviewCount"] or 0),
+                verified_rating=float(live["VerifiedAverageRating"]) if live["VerifiedAverageRating"] is not None else None
+            )
         
         # Hotel header
         st.markdown(f"""
         <div class="custom-header">
-            <h1>{hotel['name']}</h1>
-            <p>📍 {hotel['location']} | ⭐ {hotel['rating']}/5.0 Rating</p>
+            <h1>{hotel.name}</h1>
+            <p>📍 {hotel.location} | ⭐ {hotel.rating}/5.0 Rating</p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -866,7 +1343,7 @@ elif st.session_state.page == "Details":
             </div>
             """, unsafe_allow_html=True)
             
-            st.markdown(hotel.get('description', 'A stunning venue perfect for your wedding celebration. Our experienced team will ensure every detail of your special day is perfect.'))
+            st.markdown(hotel.description or 'A stunning venue perfect for your wedding celebration. Our experienced team will ensure every detail of your special day is perfect.')
             
             st.markdown("<br>", unsafe_allow_html=True)
             
@@ -877,13 +1354,52 @@ elif st.session_state.page == "Details":
             </div>
             """, unsafe_allow_html=True)
             
-            amenities_list = hotel['amenities'].split(', ')
+            try:
+                amenities_list = list(get_amenity_index().amenities(hotel.hotel_id))
+            except Error:
+                amenities_list = []
+            if not amenities_list and hotel.amenities:
+                amenities_list = hotel.amenities.split(', ')
             # Display in columns
             for i in range(0, len(amenities_list), 3):
                 cols = st.columns(3)
                 for j, col in enumerate(cols):
                     if i + j < len(amenities_list):
                         col.markdown(f"✓ {amenities_list[i + j]}")
+            
+            if details["room_types"]:
+                st.markdown("<br>", unsafe_allow_html=True)
+                st.markdown("""
+                <div class="info-box">
+                    <h3>🛏️ Rooms for Your Dates</h3>
+                </div>
+                """, unsafe_allow_html=True)
+                st.dataframe(
+                    [
+                        {
+                            "Room Type": room["RoomType"],
+                            "Available": int(room["rooms_available"] or 0),
+                            "From / Night": f"${float(room['min_price']):,.2f}" if room["min_price"] is not None else "-",
+                            "Sleeps": room["max_capacity"],
+                        }
+                        for room in details["room_types"]
+                    ],
+                    hide_index=True,
+                    use_container_width=True
+                )
+            
+            if details["reviews"]:
+                st.markdown("<br>", unsafe_allow_html=True)
+                st.markdown("""
+                <div class="info-box">
+                    <h3>💬 Guest Reviews</h3>
+                </div>
+                """, unsafe_allow_html=True)
+                for review in details["reviews"]:
+                    verified = " · ✓ Verified stay" if review["IsVerifiedPurchase"] else ""
+                    st.markdown(f"**{'⭐' * int(review['NumericRating'])} {review['Title'] or ''}**")
+                    st.caption(f"{review['FirstName']}{verified}")
+                    st.markdown(review["ReviewText"] or "")
         
         with col2:
             # Quick info card
@@ -893,10 +1409,17 @@ elif st.session_state.page == "Details":
             </div>
             """, unsafe_allow_html=True)
             
-            st.metric("Price per Night", f"${hotel['price_per_night']:.2f}", delta=None)
-            st.metric("Available Rooms", hotel['rooms'])
-            st.metric("Total Capacity", hotel['total_rooms'])
-            st.metric("Star Rating", f"{hotel['star_rating']} ⭐")
+            st.metric("Price per Night", f"${hotel.price_per_night:.2f}", delta=None)
+            st.metric("Available Rooms", hotel.rooms)
+            st.metric("Total Capacity", hotel.total_rooms)
+            st.metric("Star Rating", f"{hotel.star_rating} ⭐")
+            if hotel.review_count:
+                verified = hotel.verified_rating
+                st.metric(
+                    "Guest Reviews",
+                    hotel.review_count,
+                    help=f"Verified stays average {verified:.1f}/5" if verified is not None else "No verified stays yet"
+                )
             
             st.markdown("<br>", unsafe_allow_html=True)
             
@@ -907,78 +1430,53 @@ elif st.session_state.page == "Details":
             </div>
             """, unsafe_allow_html=True)
             
-            if hotel.get('phone'):
-                st.markdown(f"**Phone:** {hotel['phone']}")
-            if hotel.get('email'):
-                st.markdown(f"**Email:** {hotel['email']}")
-            if hotel.get('website'):
-                st.markdown(f"**Website:** [{hotel['website']}]({hotel['website']})")
-            if hotel.get('address'):
-                st.markdown(f"**Address:** {hotel['address']}")
+            if hotel.phone:
+                st.markdown(f"**Phone:** {hotel.phone}")
+            if hotel.email:
+                st.markdown(f"**Email:** {hotel.email}")
+            if hotel.website:
+                st.markdown(f"**Website:** [{hotel.website}]({hotel.website})")
+            if hotel.address:
+                st.markdown(f"**Address:** {hotel.address}")
             
             st.markdown("<br>", unsafe_allow_html=True)
             
             # Book button
             if st.button("✓ Book This Venue", use_container_width=True, type="primary"):
-                st.session_state.page = "Booking"
-                st.rerun()
+                open_booking()
         
         st.markdown("---")
         
         # Price comparison chart
         st.markdown("### 📊 Compare with Similar Venues")
         
-        # Get comparison data
-        comparison_hotels = [h for h in st.session_state.search_results if h['hotel_id'] != hotel['hotel_id']][:5]
-        comparison_hotels.insert(0, hotel)
-        
-        chart_data = pd.DataFrame({
-            'Hotel': [h['name'][:25] for h in comparison_hotels],
-            'Price': [h['price_per_night'] for h in comparison_hotels],
-            'Rating': [h['rating'] for h in comparison_hotels],
-            'Selected': ['This Hotel' if h['hotel_id'] == hotel['hotel_id'] else 'Other' for h in comparison_hotels]
-        })
+        # This venue first, then its peers; figures come from the shared chart cache
+        comparison = ComparisonSet.from_rows(
+            [(hotel.hotel_id, hotel.name, hotel.price_per_night, hotel.rating)] + comparison_peers(hotel)
+        )
+        with get_tracer().span("comparison_charts", rows=len(comparison.hotel_ids)):
+            figures = get_chart_service().figures(comparison, hotel.hotel_id)
         
         col1, col2 = st.columns(2)
         
         with col1:
-            # Price comparison
-            fig_price = px.bar(
-                chart_data,
-                x='Hotel',
-                y='Price',
-                color='Selected',
-                title='Price Comparison',
-                color_discrete_map={'This Hotel': '#D4AF37', 'Other': '#B8B8B8'}
-            )
-            fig_price.update_layout(showlegend=False, height=300)
-            st.plotly_chart(fig_price, use_container_width=True)
+            st.plotly_chart(json.loads(figures["price"]), use_container_width=True)
         
         with col2:
-            # Rating comparison
-            fig_rating = px.bar(
-                chart_data,
-                x='Hotel',
-                y='Rating',
-                color='Selected',
-                title='Rating Comparison',
-                color_discrete_map={'This Hotel': '#FFD700', 'Other': '#B8B8B8'}
-            )
-            fig_rating.update_layout(showlegend=False, height=300, yaxis_range=[0, 5])
-            st.plotly_chart(fig_rating, use_container_width=True)
+            st.plotly_chart(json.loads(figures["rating"]), use_container_width=True)
 
 # ============================================================
 # PAGE 5: BOOKING CONFIRMATION
 # ============================================================
 
 elif st.session_state.page == "Booking":
-    if not st.session_state.selected_hotel:
+    hotel = selected_hotel()
+    if not hotel:
         st.warning("⚠️ Please select a hotel first")
         if st.button("← Back to Results"):
             st.session_state.page = "Results"
             st.rerun()
     else:
-        hotel = st.session_state.selected_hotel
         
         st.markdown("""
         <div class="custom-header">
@@ -1010,137 +1508,19 @@ elif st.session_state.page == "Booking":
             </div>
             """, unsafe_allow_html=True)
             
-            st.markdown(f"**Venue:** {hotel['name']}")
-            st.markdown(f"**Location:** {hotel['location']}")
-            st.markdown(f"**Category:** {hotel['category']}")
-            st.markdown(f"**Rating:** {hotel['rating']} ⭐")
-            st.markdown(f"**Contact:** {hotel.get('phone', 'N/A')}")
+            st.markdown(f"**Venue:** {hotel.name}")
+            st.markdown(f"**Location:** {hotel.location}")
+            st.markdown(f"**Category:** {hotel.category}")
+            st.markdown(f"**Rating:** {hotel.rating} ⭐")
+            st.markdown(f"**Contact:** {hotel.phone or 'N/A'}")
         
         st.markdown("---")
         
-        # Booking dates and pricing
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            <div class="info-box">
-                <h3>📅 Event Dates</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            check_in = st.session_state.search_start_date
-            check_out = st.session_state.search_end_date
-            nights = (check_out - check_in).days
-            
-            st.markdown(f"**Check-in:** {check_in.strftime('%A, %B %d, %Y')}")
-            st.markdown(f"**Check-out:** {check_out.strftime('%A, %B %d, %Y')}")
-            st.markdown(f"**Total Nights:** {nights}")
-            
-            # Room selection
-            st.markdown("<br>", unsafe_allow_html=True)
-            num_rooms = st.number_input(
-                "Number of Rooms",
-                min_value=1,
-                max_value=hotel['rooms'],
-                value=min(5, hotel['rooms']),
-                help=f"{hotel['rooms']} rooms available"
-            )
-        
-        with col2:
-            st.markdown("""
-            <div class="info-box" style="background: linear-gradient(135deg, #E8F5E9 0%, #C8E6C9 100%);">
-                <h3>💰 Pricing Breakdown</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            price_per_night = hotel["price_per_night"]
-            subtotal = price_per_night * nights * num_rooms
-            service_fee = subtotal * 0.05
-            tax = (subtotal + service_fee) * 0.10
-            total = subtotal + service_fee + tax
-            
-            st.markdown(f"**Room Rate:** ${price_per_night:.2f} × {nights} nights × {num_rooms} rooms")
-            st.markdown(f"**Subtotal:** ${subtotal:,.2f}")
-            st.markdown(f"**Service Fee (5%):** ${service_fee:,.2f}")
-            st.markdown(f"**Tax (10%):** ${tax:,.2f}")
-            st.markdown("---")
-            st.markdown(f"### **Total Amount:** ${total:,.2f}")
+        booking_price_panel(hotel)
         
         st.markdown("---")
         
-        # Special requests
-        st.markdown("""
-        <div class="info-box">
-            <h3>📝 Special Requests (Optional)</h3>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        special_requests = st.text_area(
-            "Add any special requirements or requests",
-            placeholder="e.g., Dietary restrictions, accessibility needs, preferred ceremony location, etc.",
-            height=100
-        )
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Terms and conditions
-        agree_terms = st.checkbox("I agree to the terms and conditions and cancellation policy")
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Confirmation buttons
-        col1, col2, col3 = st.columns([1, 1, 1])
-        
-        with col1:
-            if st.button("← Back to Details", use_container_width=True):
-                st.session_state.page = "Details"
-                st.rerun()
-        
-        with col2:
-            pass  # Empty column for spacing
-        
-        with col3:
-            if st.button("✓ Confirm Booking", use_container_width=True, type="primary", disabled=not agree_terms):
-                if agree_terms:
-                    # Generate confirmation number
-                    confirmation_number = f"WED-{st.session_state.user_name[:3].upper()}-{hash(hotel['name']) % 10000:04d}"
-                    
-                    st.balloons()
-                    
-                    st.success(f"""
-                    ### 🎉 Booking Confirmed!
-                    
-                    **Confirmation Number:** `{confirmation_number}`
-                    
-                    Thank you for booking with us! A confirmation email has been sent to **{st.session_state.user_email}**
-                    
-                    The venue coordinator will contact you within 24 hours to discuss your special requirements.
-                    """)
-                    
-                    st.session_state.booking_confirmed = True
-                    
-                    # Summary box
-                    st.markdown(f"""
-                    <div class="info-box" style="background: linear-gradient(135deg, #D4AF37 0%, #B8860B 100%); color: white;">
-                        <h3>📋 Booking Summary</h3>
-                        <p><strong>Venue:</strong> {hotel['name']}</p>
-                        <p><strong>Dates:</strong> {check_in.strftime('%b %d')} - {check_out.strftime('%b %d, %Y')}</p>
-                        <p><strong>Rooms:</strong> {num_rooms}</p>
-                        <p><strong>Total:</strong> ${total:,.2f}</p>
-                        <p><strong>Confirmation:</strong> {confirmation_number}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    
-                    if st.button("🏠 Return to Home", use_container_width=True):
-                        # Reset for new search
-                        st.session_state.selected_hotel = None
-                        st.session_state.search_results = []
-                        st.session_state.page = "Home"
-                        st.rerun()
-                else:
-                    st.error("Please agree to the terms and conditions to proceed")
+        booking_form(hotel)
 
 # ============================================================
 # FOOTER
@@ -1154,3 +1534,5 @@ st.markdown("""
     <p style="font-size: 0.9rem;">Questions? Contact us at support@weddingvenues.com | © 2025 All Rights Reserved</p>
 </div>
 """, unsafe_allow_html=True)
+
+end_page_trace(page_span)